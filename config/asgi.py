@@ -19,6 +19,12 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 django_asgi_app = get_asgi_application()
 
+# 시간표 생성 워커 프로세스 풀을 요청 처리 전에 미리 fork (ortools가 로드된 상태로 대기)
+from home.views.timetable_config import SolverParameters
+if SolverParameters.USE_SOLVE_JOB_POOL:
+    from home.services.solve_jobs import SolveJobManager
+    SolveJobManager().start()
+
 # Mount Django at root and Socket.IO under /ws/socket.io/
 # socketio server also handles the engine.io transport endpoints automatically
 from asgiref.compatibility import guarantee_single_callable
@@ -2,6 +2,7 @@ import json
 import csv
 import re
 from pathlib import Path
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
@@ -11,6 +12,7 @@ from data_manager.models import (
     Semester, Category, Courses, CourseSchedule, RuleSet, Rule,
     CourseReviewSummary, UserReview, UserProfile, CourseSumm
 )
+from data_manager.services.category_closure_service import CategoryClosureService
 
 DATA_DIR = Path(__file__).parent / 'setup_data'
 
@@ -65,6 +67,9 @@ class Command(BaseCommand):
         self.setup_course_review_summaries(DATA_DIR / "course_review_summaries.csv")
         # self.setup_course_summs(DATA_DIR / "course_summ.csv")
 
+        # 시간표 생성용 학기별 충돌 골격은 커밋 후 새 카탈로그로 재생성
+        transaction.on_commit(lambda: call_command('build_conflict_skeleton'))
+
         self.stdout.write(self.style.SUCCESS("🎉 모든 데이터 셋업이 성공적으로 완료되었습니다!"))
 
     def _clear_database(self):
@@ -135,6 +140,10 @@ class Command(BaseCommand):
         version_year = data['version_year']
         for category_data in data['categories']:
             self._create_category_recursive(category_data, version_year)
+
+        # 하위/최상위 카테고리 조회용 클로저 테이블 재생성
+        closure_count = CategoryClosureService().rebuild()
+        self.stdout.write(f"    - 카테고리 클로저 {closure_count}개 생성")
         self.stdout.write(self.style.SUCCESS("  ✓ 완료"))
 
     def _create_category_recursive(self, category_data, year, parent=None):
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-18 06:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_category_closure(apps, schema_editor):
+    """기존 카테고리 트리로 클로저 테이블 채우기"""
+    Category = apps.get_model('data_manager', 'Category')
+    CategoryClosure = apps.get_model('data_manager', 'CategoryClosure')
+
+    parents = dict(Category.objects.values_list('category_id', 'parent_category_id'))
+    rows = []
+    for category_id in parents:
+        ancestor, depth, visited = category_id, 0, set()
+        while ancestor is not None and ancestor in parents and ancestor not in visited:
+            visited.add(ancestor)
+            rows.append(CategoryClosure(ancestor_id=ancestor, descendant_id=category_id, depth=depth))
+            ancestor = parents[ancestor]
+            depth += 1
+    CategoryClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_manager', '0004_remove_userreview_categories_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryClosure',
+            fields=[
+                ('closure_id', models.AutoField(primary_key=True, serialize=False)),
+                ('depth', models.IntegerField(help_text='조상에서 자손까지의 단계 수 (자기 자신은 0)')),
+                ('ancestor', models.ForeignKey(db_column='ancestor_id', on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='data_manager.category')),
+                ('descendant', models.ForeignKey(db_column='descendant_id', on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='data_manager.category')),
+            ],
+            options={
+                'db_table': 'category_closure',
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='category_cl_descend_d00dc6_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(build_category_closure, migrations.RunPython.noop),
+    ]
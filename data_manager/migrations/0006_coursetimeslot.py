@@ -0,0 +1,46 @@
+# Generated by Django 5.1.6 on 2026-10-18 07:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_course_time_slots(apps, schema_editor):
+    """기존 강의 시간표로 교시별 정규화 테이블 채우기"""
+    CourseSchedule = apps.get_model('data_manager', 'CourseSchedule')
+    CourseTimeSlot = apps.get_model('data_manager', 'CourseTimeSlot')
+
+    slots = []
+    for schedule in CourseSchedule.objects.only('schedule_id', 'course_id', 'day', 'times'):
+        raw = (schedule.times or '').split('@', 1)[0]
+        periods = sorted({int(t) for t in (part.strip() for part in raw.split(',')) if t.isdigit()})
+        for period in periods:
+            slots.append(CourseTimeSlot(
+                schedule_id=schedule.schedule_id, course_id=schedule.course_id,
+                day=schedule.day, period=period
+            ))
+    CourseTimeSlot.objects.bulk_create(slots, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_manager', '0005_categoryclosure'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseTimeSlot',
+            fields=[
+                ('slot_id', models.AutoField(primary_key=True, serialize=False)),
+                ('day', models.CharField(max_length=10)),
+                ('period', models.IntegerField(help_text="교시 번호 (예: '03' → 3)")),
+                ('course', models.ForeignKey(db_column='course_id', on_delete=django.db.models.deletion.CASCADE, related_name='time_slots', to='data_manager.courses')),
+                ('schedule', models.ForeignKey(db_column='schedule_id', on_delete=django.db.models.deletion.CASCADE, related_name='time_slots', to='data_manager.courseschedule')),
+            ],
+            options={
+                'db_table': 'course_time_slots',
+                'indexes': [models.Index(fields=['day', 'period'], name='course_time_day_557e0a_idx')],
+            },
+        ),
+        migrations.RunPython(build_course_time_slots, migrations.RunPython.noop),
+    ]
@@ -91,6 +91,39 @@ class Category(models.Model):
         return self.category_name
 
 
+# CategoryClosure - 카테고리 트리의 조상/자손 관계 (자기 자신 포함)
+class CategoryClosure(models.Model):
+    """
+    Category 트리의 모든 (조상, 자손, 깊이) 쌍을 저장하는 클로저 테이블
+    하위 카테고리 조회와 최상위 카테고리 조회를 재귀 쿼리 없이 한 번의 조인으로 처리
+    setup_data 임포트 시 CategoryClosureService.rebuild()로 재생성
+    """
+    closure_id = models.AutoField(primary_key=True)
+    ancestor = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='descendant_links',
+        db_column='ancestor_id'
+    )
+    descendant = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        related_name='ancestor_links',
+        db_column='descendant_id'
+    )
+    depth = models.IntegerField(help_text="조상에서 자손까지의 단계 수 (자기 자신은 0)")
+
+    class Meta:
+        db_table = 'category_closure'
+        unique_together = (('ancestor', 'descendant'),)
+        indexes = [
+            models.Index(fields=['descendant', 'depth']),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} → {self.descendant_id} ({self.depth})"
+
+
 # Semester
 class Semester(models.Model):
     semester_id = models.AutoField(primary_key=True)
@@ -175,6 +208,55 @@ class CourseSchedule(models.Model):
     def __str__(self):
         return f"[{self.schedule_id}] {self.course} - {self.day} at {self.location}"
 
+    @staticmethod
+    def parse_periods(times):
+        """times 문자열("02,03,04" 또는 "02,03@S4-1-101")의 교시 번호 리스트 (숫자가 아닌 항목은 무시)"""
+        raw = (times or '').split('@', 1)[0]
+        return sorted({int(t) for t in (part.strip() for part in raw.split(',')) if t.isdigit()})
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+        # 교시별 정규화 테이블 동기화
+        self.time_slots.all().delete()
+        CourseTimeSlot.objects.bulk_create([
+            CourseTimeSlot(schedule=self, course_id=self.course_id, day=self.day, period=period)
+            for period in self.parse_periods(self.times)
+        ])
+
+
+# CourseTimeSlot - 강의 시간표를 요일·교시 단위로 정규화한 테이블
+class CourseTimeSlot(models.Model):
+    """
+    CourseSchedule.times를 교시마다 한 행으로 펼친 테이블
+    요일·교시로 강의를 찾는 조회(시간 제외 검색 등)를 문자열 검색 대신 인덱스 조회로 처리
+    CourseSchedule 저장 시 자동 동기화 (기존 데이터는 마이그레이션 0006에서 일괄 생성)
+    """
+    slot_id = models.AutoField(primary_key=True)
+    schedule = models.ForeignKey(
+        CourseSchedule,
+        on_delete=models.CASCADE,
+        related_name='time_slots',
+        db_column='schedule_id'
+    )
+    course = models.ForeignKey(
+        Courses,
+        on_delete=models.CASCADE,
+        related_name='time_slots',
+        db_column='course_id'
+    )
+    day = models.CharField(max_length=10)
+    period = models.IntegerField(help_text="교시 번호 (예: '03' → 3)")
+
+    class Meta:
+        db_table = 'course_time_slots'
+        indexes = [
+            models.Index(fields=['day', 'period']),
+        ]
+
+    def __str__(self):
+        return f"{self.course_id} - {self.day} {self.period:02d}교시"
+
 
 # GraduationRequirement
 class GraduationRequirement(models.Model):
@@ -0,0 +1,61 @@
+# data_manager/services/category_closure_service.py
+
+from typing import Dict, List, Optional, Tuple
+from django.db import transaction
+from data_manager.models import Category, CategoryClosure
+
+
+class CategoryClosureService:
+    """
+    카테고리 클로저 테이블(CategoryClosure) 관리 및 조회
+    - rebuild: Category 트리 전체로부터 (조상, 자손, 깊이) 쌍을 다시 계산하여 저장
+    - descendant_ids / root_map: 재귀 조회 없이 한 번의 쿼리로 하위/최상위 카테고리 조회
+    """
+
+    @staticmethod
+    def closure_rows(parents: Dict[int, Optional[int]]) -> List[Tuple[int, int, int]]:
+        """
+        {category_id: parent_category_id} 맵으로부터 (조상, 자손, 깊이) 목록을 계산
+        부모가 맵에 없거나 순환이 있으면 그 지점에서 멈춤
+        """
+        rows = []
+        for category_id in parents:
+            ancestor, depth, visited = category_id, 0, set()
+            while ancestor is not None and ancestor in parents and ancestor not in visited:
+                visited.add(ancestor)
+                rows.append((ancestor, category_id, depth))
+                ancestor = parents[ancestor]
+                depth += 1
+        return rows
+
+    @transaction.atomic
+    def rebuild(self) -> int:
+        """클로저 테이블 전체 재생성 (카테고리 임포트 후 호출). 생성한 행 수 반환"""
+        parents = dict(Category.objects.values_list('category_id', 'parent_category_id'))
+        CategoryClosure.objects.all().delete()
+        CategoryClosure.objects.bulk_create(
+            [
+                CategoryClosure(ancestor_id=ancestor, descendant_id=descendant, depth=depth)
+                for ancestor, descendant, depth in self.closure_rows(parents)
+            ],
+            batch_size=1000
+        )
+        return CategoryClosure.objects.count()
+
+    def descendant_ids(self, category_ids: List[int]) -> Dict[int, List[int]]:
+        """
+        각 카테고리의 자신 포함 모든 하위 카테고리 ID
+        클로저 테이블에 없는 카테고리(재생성 전 추가된 카테고리)는 결과에 포함되지 않음
+        """
+        result: Dict[int, List[int]] = {}
+        rows = CategoryClosure.objects.filter(ancestor_id__in=category_ids).values_list('ancestor_id', 'descendant_id')
+        for ancestor, descendant in rows:
+            result.setdefault(ancestor, []).append(descendant)
+        return result
+
+    def root_map(self, version_year: Optional[int] = None) -> Dict[int, int]:
+        """{카테고리 ID: 최상위 카테고리 ID} (version_year가 있으면 해당 연도 카테고리만)"""
+        rows = CategoryClosure.objects.filter(ancestor__parent_category__isnull=True)
+        if version_year is not None:
+            rows = rows.filter(descendant__version_year=version_year)
+        return dict(rows.values_list('descendant_id', 'ancestor_id'))
@@ -1,9 +1,11 @@
 # data_manager/course/course_filter_service.py
 
-from django.db.models import Q
+from django.db.models import Q, Count
 from data_manager.models import (
-    Courses, Department, Category, CourseSchedule, Semester, College
+    Courses, Department, Category, CategoryClosure, Semester, College
 )
+from data_manager.services.category_closure_service import CategoryClosureService
+from data_manager.services.course_slot_service import CourseSlotService
 
 class CourseFilterService:
 
@@ -13,6 +15,10 @@ class CourseFilterService:
     - 종합적으로 필터링하여 결과를 반환하는 get_final_results를 함께 제공
     """
 
+    def __init__(self):
+        self.closure_service = CategoryClosureService()
+        self.slot_service = CourseSlotService()
+
     def get_all_courses(self):
         """
         기본적으로 전체 Course를 반환
@@ -68,14 +74,71 @@ class CourseFilterService:
         모든 하위 Category의 ID를 찾아서 필터링
 
         개선: 실제 강의가 있는 카테고리를 우선 선택
+        하위 카테고리는 클로저 테이블(CategoryClosure)로 한 번에 조회
         """
         # 1) 루트 카테고리 가져오기 - 여러 개가 있을 수 있으므로 filter 사용
-        root_categories = Category.objects.filter(category_name=category_name)
+        root_categories = list(Category.objects.filter(category_name=category_name))
+
+        if not root_categories:
+            return queryset.none()
 
-        if not root_categories.exists():
+        root_ids = [cat.category_id for cat in root_categories]
+        if set(root_ids) - set(self.closure_service.descendant_ids(root_ids)):
+            # 클로저 테이블 재생성 전에 추가된 카테고리 → 기존 재귀 조회
+            print(f"WARNING: '{category_name}' 카테고리 클로저 없음 - 하위 카테고리 재귀 조회 (setup_data 재실행 필요)")
+            return self._filter_by_category_recursive(queryset, root_categories)
+
+        # 2) 가장 많은 강의가 있는 카테고리 선택 (루트별 강의 수를 한 번에 집계)
+        root_category = root_categories[0]
+        if len(root_categories) > 1:
+            course_counts = dict(
+                CategoryClosure.objects.filter(ancestor_id__in=root_ids)
+                .values('ancestor_id')
+                .annotate(course_count=Count('descendant__courses'))
+                .values_list('ancestor_id', 'course_count')
+            )
+            root_category = None
+            max_course_count = 0
+            for cat in root_categories:
+                if course_counts.get(cat.category_id, 0) > max_course_count:
+                    max_course_count = course_counts[cat.category_id]
+                    root_category = cat
+
+            # 강의가 있는 카테고리를 찾지 못한 경우, 최신 version_year 선택 (fallback)
+            if not root_category:
+                root_category = max(root_categories, key=lambda cat: cat.version_year)
+
+        # 3) 해당 카테고리와 모든 하위 카테고리의 Course들만 필터링 (클로저 서브쿼리)
+        return self._filter_by_descendants(queryset, root_category.category_id)
+
+    def filter_by_category_id(self, queryset, category_id):
+        """
+        category_name(예: '확대교양')에 해당하는 Category 및
+        모든 하위 Category의 ID를 찾아서 필터링
+        """
+        # 1) 루트 카테고리 가져오기
+        try:
+            root_category = Category.objects.get(category_id=category_id)
+        except Category.DoesNotExist:
             return queryset.none()
 
-        # 2) 가장 많은 강의가 있는 카테고리 선택
+        if not self.closure_service.descendant_ids([root_category.category_id]):
+            print(f"WARNING: 카테고리 {category_id} 클로저 없음 - 하위 카테고리 재귀 조회 (setup_data 재실행 필요)")
+            category_ids = self._get_all_subcategory_ids(root_category)
+            category_ids.append(root_category.category_id)
+            return queryset.filter(category_id__in=category_ids)
+
+        # 2) 해당 카테고리와 모든 하위 카테고리의 Course들만 필터링 (클로저 서브쿼리)
+        return self._filter_by_descendants(queryset, root_category.category_id)
+
+    def _filter_by_descendants(self, queryset, category_id):
+        """category_id 자신과 모든 하위 카테고리에 속한 Course만 남기기"""
+        return queryset.filter(
+            category_id__in=CategoryClosure.objects.filter(ancestor_id=category_id).values('descendant_id')
+        )
+
+    def _filter_by_category_recursive(self, queryset, root_categories):
+        """클로저 테이블이 없을 때의 기존 방식: 루트마다 재귀 조회로 강의 수를 세어 선택"""
         root_category = None
         max_course_count = 0
 
@@ -94,38 +157,16 @@ class CourseFilterService:
 
         # 강의가 있는 카테고리를 찾지 못한 경우, 최신 version_year 선택 (fallback)
         if not root_category:
-            root_category = root_categories.order_by('-version_year').first()
+            root_category = max(root_categories, key=lambda cat: cat.version_year)
 
-        # 3) 해당 카테고리의 모든 하위 카테고리 ID를 재귀적으로 구하기
         category_ids = self._get_all_subcategory_ids(root_category)
-        # 루트 카테고리 자기 자신도 포함
         category_ids.append(root_category.category_id)
-
-        # 4) 해당 ID들을 가진 Course들만 필터링
-        return queryset.filter(category_id__in=category_ids)
-
-    def filter_by_category_id(self, queryset, category_id):
-        """
-        category_name(예: '확대교양')에 해당하는 Category 및
-        모든 하위 Category의 ID를 찾아서 필터링
-        """
-        # 1) 루트 카테고리 가져오기
-        try:
-            root_category = Category.objects.get(category_id=category_id)
-        except Category.DoesNotExist:
-            return queryset.none()
-
-        # 2) 해당 카테고리의 모든 하위 카테고리 ID를 재귀적으로 구하기
-        category_ids = self._get_all_subcategory_ids(root_category)
-        # 루트 카테고리 자기 자신도 포함
-        category_ids.append(root_category.category_id)
-
-        # 3) 해당 ID들을 가진 Course들만 필터링
         return queryset.filter(category_id__in=category_ids)
 
     def _get_all_subcategory_ids(self, parent_category):
         """
         재귀적으로 parent_category의 자식, 손자 ... 모든 category_id를 수집
+        (클로저 테이블이 없을 때만 사용)
         """
         result = []
         children = Category.objects.filter(parent_category_id=parent_category.category_id)
@@ -155,21 +196,14 @@ class CourseFilterService:
             }
         위 요일+교시를 포함한 강의들은 제외
 
-        1) CourseSchedule에서 해당 요일+교시를 가진 course_id들을 구한 뒤
+        1) CourseTimeSlot에서 해당 요일+교시를 가진 course_id들을 구한 뒤 (교시는 정수로 비교)
         2) 이 course_id들을 exclude() 처리
         """
         if not exclude_day_time_map:
             return queryset
 
-        # Q 객체로 제외 조건을 생성
-        q_exclude = Q()
-        for day, times_list in exclude_day_time_map.items():
-            for t in times_list:
-                # day='월' AND times__contains='03' ... 등을 OR로 결합
-                q_exclude |= Q(day=day, times__contains=t)
-
         # 제외 대상 강의 ID
-        course_ids = CourseSchedule.objects.filter(q_exclude).values_list('course_id', flat=True)
+        course_ids = self.slot_service.courses_in_slots(exclude_day_time_map)
         return queryset.exclude(course_id__in=course_ids)
 
     # -----------------------------
@@ -0,0 +1,33 @@
+# data_manager/services/course_slot_service.py
+
+from typing import Dict, Iterable, List
+from django.db.models import Q
+from data_manager.models import CourseTimeSlot
+
+
+class CourseSlotService:
+    """
+    교시별 정규화 테이블(CourseTimeSlot) 조회
+    - courses_in_slots: 요일·교시 조건에 걸리는 강의 ID를 문자열 검색 대신 인덱스 조회로 반환
+    """
+
+    @staticmethod
+    def slot_condition(slots_by_day: Dict[str, Iterable[str]]) -> Q:
+        """
+        {요일: ["03", "04", ...]} → CourseTimeSlot 조회 조건
+        교시는 정수로 비교하므로 "03"이 "13"에 매칭되지 않음
+        """
+        condition = Q(pk__in=[])
+        for day, times in slots_by_day.items():
+            periods: List[int] = sorted({int(t) for t in times if str(t).strip().isdigit()})
+            if periods:
+                condition |= Q(day=day, period__in=periods)
+        return condition
+
+    def courses_in_slots(self, slots_by_day: Dict[str, Iterable[str]]):
+        """주어진 요일·교시에 수업이 있는 강의 ID 서브쿼리"""
+        return (
+            CourseTimeSlot.objects
+            .filter(self.slot_condition(slots_by_day))
+            .values('course_id')
+        )
@@ -8,6 +8,7 @@ from django.conf import settings
 from django.db.models import Max
 from data_manager.models import Category, Rule, RuleSet, UserGraduationProgress  # 필요한 모델들을 가져옵니다.
 from .graduation_types import RuleResult
+from .category_closure_service import CategoryClosureService
 
 
 # --- 졸업 판별 엔진 ---
@@ -18,6 +19,7 @@ class GraduationEngine:
     # 클래스 변수로써, 한번 로드된 설정/데이터를 메모리에 캐싱하여 성능을 최적화
     _DEPARTMENT_GROUPS_MAP = None
     _CATEGORIES_CACHE = {}
+    _ROOT_CATEGORY_CACHE = {}
 
     def __init__(self, user_profile, transcripts):
         """Phase 2: 엔진 실행 및 초기화"""
@@ -28,6 +30,7 @@ class GraduationEngine:
         self.department_groups = self._load_department_groups()
 
         self.categories_map = {}
+        self.root_category_map = {}
         self.effective_year = None
 
         # 규칙셋 기준년도 우선, 없으면 입학년도로 카테고리 버전 결정
@@ -46,6 +49,9 @@ class GraduationEngine:
                     self.effective_year = latest
                     self.categories_map = self._load_category(self.effective_year)
 
+        if self.effective_year:
+            self.root_category_map = self._load_root_categories(self.effective_year)
+
         self.processed_data = {
             'total_credits': 0.0,
             'credits_by_category': defaultdict(float),
@@ -92,11 +98,24 @@ class GraduationEngine:
             cls._CATEGORIES_CACHE[target_year] = category_map
         return cls._CATEGORIES_CACHE[target_year]
 
+    @classmethod
+    def _load_root_categories(cls, target_year):
+        """특정 연도 카테고리별 최상위 카테고리 ID를 클로저 테이블에서 한 번에 조회하여 캐시에 저장합니다."""
+        if target_year not in cls._ROOT_CATEGORY_CACHE:
+            cls._ROOT_CATEGORY_CACHE[target_year] = CategoryClosureService().root_map(target_year)
+        return cls._ROOT_CATEGORY_CACHE[target_year]
+
     def _get_root_category(self, category_obj):
         """
         주어진 카테고리 객체로부터 최상위 부모 카테고리를 찾아 반환합니다.
-        메모리에 캐싱된 self.categories_map을 사용하므로 DB 조회가 발생하지 않습니다.
+        클로저 테이블에서 미리 읽은 self.root_category_map으로 바로 찾고,
+        없으면 메모리에 캐싱된 self.categories_map으로 부모를 따라 올라갑니다 (DB 조회 없음).
         """
+        if category_obj is not None:
+            root_cat = self.categories_map.get(self.root_category_map.get(category_obj.category_id))
+            if root_cat is not None:
+                return root_cat
+
         current_cat = category_obj
         while current_cat and current_cat.parent_category_id:
             parent_cat = self.categories_map.get(current_cat.parent_category_id)
@@ -1,3 +1,108 @@
+import contextlib
+import datetime
+import io
+
 from django.test import TestCase
 
-# Create your tests here.
+from data_manager.models import Category, CategoryClosure, Courses, CourseSchedule, CourseTimeSlot, Semester
+from data_manager.services.category_closure_service import CategoryClosureService
+from data_manager.services.course_filter_service import CourseFilterService
+
+
+class CategoryClosureTest(TestCase):
+    """클로저 테이블의 하위/최상위 카테고리 조회가 부모 링크를 따라간 결과와 같은지 확인"""
+
+    def setUp(self):
+        self.general = Category.objects.create(category_name='교양', version_year=2025)
+        self.basic = Category.objects.create(
+            category_name='일반교양', parent_category=self.general, category_level=1, version_year=2025
+        )
+        self.culture = Category.objects.create(
+            category_name='인간과문화', parent_category=self.basic, category_level=2, version_year=2025
+        )
+        self.major = Category.objects.create(category_name='전공', version_year=2025)
+        self.service = CategoryClosureService()
+
+    def test_rebuild_links_every_ancestor_with_depth(self):
+        self.assertEqual(self.service.rebuild(), 7)
+        self.assertEqual(
+            set(CategoryClosure.objects.filter(descendant=self.culture).values_list('ancestor_id', 'depth')),
+            {(self.culture.category_id, 0), (self.basic.category_id, 1), (self.general.category_id, 2)}
+        )
+        self.assertEqual(
+            sorted(self.service.descendant_ids([self.general.category_id])[self.general.category_id]),
+            sorted([self.general.category_id, self.basic.category_id, self.culture.category_id])
+        )
+        self.assertEqual(self.service.root_map(2025)[self.culture.category_id], self.general.category_id)
+
+    def test_category_filter_matches_recursive_lookup(self):
+        semester = Semester.objects.create(
+            year=2025, term='1학기',
+            start_date=datetime.date(2025, 3, 1), end_date=datetime.date(2025, 6, 30),
+            course_registration_start=datetime.date(2025, 2, 1),
+            course_registration_end=datetime.date(2025, 2, 28)
+        )
+        for index, category in enumerate([self.general, self.basic, self.culture, self.major]):
+            Courses.objects.create(
+                category=category, semester=semester, course_name=f'과목{index}', course_code=f'C{index:03d}',
+                section='01', credits=3, target_year='전학년',
+                lecture_hours=3, lecture_times=3, lab_hours=0, lab_times=0
+            )
+        filter_service = CourseFilterService()
+
+        def course_ids():
+            queryset = filter_service.filter_by_category(Courses.objects.all(), '교양')
+            return set(queryset.values_list('course_name', flat=True))
+
+        # 클로저 재생성 전에는 재귀 조회로 대체
+        with contextlib.redirect_stdout(io.StringIO()):
+            recursive = course_ids()
+        self.service.rebuild()
+        with self.assertNumQueries(3):
+            closure = course_ids()
+        self.assertEqual(recursive, {'과목0', '과목1', '과목2'})
+        self.assertEqual(closure, recursive)
+
+
+class CourseTimeSlotTest(TestCase):
+    """시간표 저장 시 교시 비트마스크/정규화 행이 생성되고, 시간 제외 검색이 교시를 정확히 비교하는지 확인"""
+
+    def setUp(self):
+        category = Category.objects.create(category_name='전공', version_year=2025)
+        semester = Semester.objects.create(
+            year=2025, term='1학기',
+            start_date=datetime.date(2025, 3, 1), end_date=datetime.date(2025, 6, 30),
+            course_registration_start=datetime.date(2025, 2, 1),
+            course_registration_end=datetime.date(2025, 2, 28)
+        )
+        self.courses = {}
+        for index, times in enumerate(['02,03', '12,13', '04@S4-1-101']):
+            course = Courses.objects.create(
+                category=category, semester=semester, course_name=f'과목{index}', course_code=f'C{index:03d}',
+                section='01', credits=3, target_year='전학년',
+                lecture_hours=3, lecture_times=3, lab_hours=0, lab_times=0
+            )
+            CourseSchedule.objects.create(course=course, day='월', times=times, location='S4-1-101')
+            self.courses[times] = course
+
+    def test_save_builds_slot_rows(self):
+        schedule = CourseSchedule.objects.get(course=self.courses['12,13'])
+        self.assertEqual(
+            sorted(CourseTimeSlot.objects.filter(schedule=schedule).values_list('period', flat=True)), [12, 13]
+        )
+        self.assertEqual(
+            list(CourseSchedule.objects.get(course=self.courses['04@S4-1-101']).time_slots.values_list('period', flat=True)),
+            [4]
+        )
+
+        # 시간 변경 시 정규화 행도 함께 교체
+        schedule.times = '05'
+        schedule.save()
+        self.assertEqual(list(schedule.time_slots.values_list('period', flat=True)), [5])
+
+    def test_exclude_times_does_not_match_substring(self):
+        filter_service = CourseFilterService()
+        queryset = filter_service.filter_by_exclude_times(Courses.objects.all(), {'월': ['03']})
+        self.assertEqual(set(queryset.values_list('course_name', flat=True)), {'과목1', '과목2'})
+        queryset = filter_service.filter_by_exclude_times(Courses.objects.all(), {'화': ['03']})
+        self.assertEqual(queryset.count(), 3)
@@ -0,0 +1,274 @@
+"""
+시간표 솔버 벤치마크
+실제 학기 개설 강좌 데이터로 모델 인코딩 방식별 모델 크기와 풀이 시간을 비교
+
+사용 예:
+    python manage.py benchmark_solver compactness --dept 소프트웨어학부 --limit 400
+    python manage.py benchmark_solver conflicts --limit 400 --max-time 60
+    python manage.py benchmark_solver pruning --limit 800 --missing-gen 일반교양=3,확대교양=6
+    python manage.py benchmark_solver time_constraints --limit 5000 --repeat 20
+"""
+
+import contextlib
+import io
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from ortools.sat.python import cp_model
+
+from data_manager.services.course_filter_service import CourseFilterService
+from home.views.timetable_types import ConstraintData
+from home.views.timetable_config import (
+    CURRENT_YEAR, CURRENT_TERM,
+    MAJOR_CATEGORIES, MAX_WALKING_TIME_NO_LIMIT,
+    SolverParameters
+)
+from home.services.timetable_generation_service import TimetableGenerationService
+from home.services.timetable_optimizer import ModelBuilder, SolutionFinder
+from home.services.candidate_pruner import CandidatePruner
+from home.services.optimization_levels import OptimizationLevel
+from home.utils import parse_time_slots, apply_time_constraints, apply_time_constraints_legacy
+
+
+class Command(BaseCommand):
+    help = '시간표 솔버 벤치마크 (실제 개설 강좌 기준 모델 크기/풀이 시간 비교)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('benchmark', choices=['compactness', 'conflicts', 'pruning', 'time_constraints'], help='실행할 벤치마크')
+        parser.add_argument('--year', type=int, default=CURRENT_YEAR)
+        parser.add_argument('--term', default=CURRENT_TERM)
+        parser.add_argument('--dept', default=None, help='전공 과목을 이 학과로 제한 (교양은 전체 포함)')
+        parser.add_argument('--limit', type=int, default=400, help='최대 후보 과목 수')
+        parser.add_argument('--target-total', type=int, default=18)
+        parser.add_argument('--target-major', type=int, default=9)
+        parser.add_argument('--target-elective', type=int, default=9)
+        parser.add_argument('--level', default='ADVANCED', help='최적화 수준 (phase1_time, num_workers 사용)')
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--max-time', type=float, default=60,
+                            help='conflicts: 최적 증명까지 기다릴 최대 시간 (초)')
+        parser.add_argument('--missing-gen', default='',
+                            help='pruning: 교양 세부 부족 학점 (예: 일반교양=3,확대교양=6)')
+
+    def handle(self, *args, **options):
+        candidate_data = self._load_catalog(options)
+        if not candidate_data:
+            self.stdout.write(self.style.ERROR('후보 과목이 없습니다.'))
+            return
+
+        constraints = ConstraintData(
+            target_total=options['target_total'],
+            target_major=options['target_major'],
+            target_elective=options['target_elective'],
+            max_walking_time=MAX_WALKING_TIME_NO_LIMIT,
+            prefer_compact=True
+        )
+
+        self.stdout.write(f"{options['year']} {options['term']} 후보 {len(candidate_data)}개, "
+                          f"최적화 수준 {options['level']}, 반복 {options['repeat']}회")
+
+        if options['benchmark'] == 'compactness':
+            self._benchmark_compactness(candidate_data, constraints, options)
+        elif options['benchmark'] == 'conflicts':
+            self._benchmark_conflicts(candidate_data, constraints, options)
+        elif options['benchmark'] == 'pruning':
+            constraints.missing_gen_sub = {
+                name: int(credits)
+                for name, credits in (item.split('=') for item in options['missing_gen'].split(',') if item)
+            }
+            self._benchmark_pruning(candidate_data, constraints, options)
+        elif options['benchmark'] == 'time_constraints':
+            self._benchmark_time_constraints(candidate_data, options)
+
+    def _load_catalog(self, options):
+        """개설 강좌를 후보 과목 데이터 형식으로 변환"""
+        service = TimetableGenerationService()
+        courses = CourseFilterService().course_search(
+            year=options['year'], term=options['term']
+        ).select_related('dept', 'category').prefetch_related('courseschedule_set').order_by('course_id')
+
+        if options['dept']:
+            courses = [
+                c for c in courses
+                if (c.dept and c.dept.dept_name == options['dept'])
+                or not (c.category and c.category.category_name in MAJOR_CATEGORIES)
+            ]
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            candidate_data = service._build_candidate_data(list(courses), [])
+        return candidate_data[:options['limit']]
+
+    def _benchmark_compactness(self, candidate_data, constraints, options):
+        """밀집도 인코딩(pairwise / span)별 모델 크기와 Phase 1 풀이 시간 비교"""
+        level_config = OptimizationLevel.get_level(options['level'])
+
+        header = (f"{'인코딩':10} {'변수':>7} {'제약':>7} {'구성(초)':>9} {'풀이(초)':>9} "
+                  f"{'상태':>9} {'공강(시간)':>10} {'과목수':>6}")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for encoding in ('pairwise', 'span'):
+            build_times, solve_times = [], []
+            for _ in range(options['repeat']):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    model, x, _ = ModelBuilder(compactness_encoding=encoding).build_model(candidate_data, constraints)
+                    build_times.append(time.perf_counter() - start)
+
+                solver = cp_model.CpSolver()
+                solver.parameters.max_time_in_seconds = level_config['phase1_time']
+                solver.parameters.num_search_workers = level_config['num_workers']
+                solver.parameters.linearization_level = SolverParameters.PHASE1_LINEARIZATION_LEVEL
+
+                start = time.perf_counter()
+                status = solver.Solve(model)
+                solve_times.append(time.perf_counter() - start)
+
+            proto = model.Proto()
+            selected = []
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                selected = [data for data in candidate_data if solver.Value(x[data['id']])]
+
+            self.stdout.write(
+                f"{encoding:10} {len(proto.variables):7d} {len(proto.constraints):7d} "
+                f"{sum(build_times) / len(build_times):9.3f} {sum(solve_times) / len(solve_times):9.3f} "
+                f"{solver.StatusName(status):>9} {self._count_idle_hours(selected):10d} {len(selected):6d}"
+            )
+
+    def _benchmark_conflicts(self, candidate_data, constraints, options):
+        """충돌 제약 인코딩(slot / clique)별 충돌 제약 수와 Phase 1 최적 증명 시간 비교"""
+        level_config = OptimizationLevel.get_level(options['level'])
+
+        header = (f"{'인코딩':10} {'충돌(전)':>8} {'충돌(후)':>8} {'전체 제약':>9} {'구성(초)':>9} "
+                  f"{'최적증명(초)':>12} {'상태':>9} {'목적함수':>12}")
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for encoding in ('slot', 'clique'):
+            build_times, solve_times = [], []
+            for _ in range(options['repeat']):
+                model_builder = ModelBuilder(conflict_encoding=encoding)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    model, x, _ = model_builder.build_model(candidate_data, constraints)
+                    build_times.append(time.perf_counter() - start)
+
+                solver = cp_model.CpSolver()
+                solver.parameters.max_time_in_seconds = options['max_time']
+                solver.parameters.num_search_workers = level_config['num_workers']
+                solver.parameters.linearization_level = SolverParameters.PHASE1_LINEARIZATION_LEVEL
+
+                start = time.perf_counter()
+                status = solver.Solve(model)
+                solve_times.append(time.perf_counter() - start)
+
+            stats = model_builder.last_conflict_stats
+            objective = solver.ObjectiveValue() if status in (cp_model.OPTIMAL, cp_model.FEASIBLE) else 0
+            self.stdout.write(
+                f"{encoding:10} {stats['slot_constraints']:8d} {stats['conflict_constraints']:8d} "
+                f"{len(model.Proto().constraints):9d} {sum(build_times) / len(build_times):9.3f} "
+                f"{sum(solve_times) / len(solve_times):12.3f} {solver.StatusName(status):>9} {objective:12.0f}"
+            )
+
+    def _benchmark_pruning(self, candidate_data, constraints, options):
+        """요건 버킷별 후보 축소 전후 후보 수, Phase 1 풀이 시간, 최적값 차이 비교"""
+        level_config = OptimizationLevel.get_level(options['level'])
+        service = TimetableGenerationService()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            scores = service._prune_scores(candidate_data, constraints, {})
+            pruned = CandidatePruner().prune(candidate_data, constraints, scores).kept
+
+        header = f"{'후보':10} {'과목수':>6} {'구성(초)':>9} {'풀이(초)':>9} {'상태':>9} {'목적함수':>12}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        values, selections, full_model = {}, {}, None
+        for label, data in (('전체', candidate_data), ('축소', pruned)):
+            build_times, solve_times = [], []
+            for _ in range(options['repeat']):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    start = time.perf_counter()
+                    model, x, _ = ModelBuilder().build_model(data, constraints)
+                    build_times.append(time.perf_counter() - start)
+
+                solver = cp_model.CpSolver()
+                solver.parameters.max_time_in_seconds = level_config['phase1_time']
+                solver.parameters.num_search_workers = level_config['num_workers']
+                solver.parameters.linearization_level = SolverParameters.PHASE1_LINEARIZATION_LEVEL
+
+                start = time.perf_counter()
+                status = solver.Solve(model)
+                solve_times.append(time.perf_counter() - start)
+
+            if full_model is None:
+                full_model = (model, x)
+            values[label] = None
+            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                values[label] = solver.ObjectiveValue()
+                selections[label] = [cid for cid, var in x.items() if solver.Value(var)]
+            self.stdout.write(
+                f"{label:10} {len(data):6d} {sum(build_times) / len(build_times):9.3f} "
+                f"{sum(solve_times) / len(solve_times):9.3f} {solver.StatusName(status):>9} {values[label] or 0:12.0f}"
+            )
+
+        # 밀집도 항은 후보 집합에 따라 달라지므로 축소 해를 전체 모델에 고정해 비교
+        if values['전체'] is not None and values['축소'] is not None:
+            with contextlib.redirect_stdout(io.StringIO()):
+                pruned_value = SolutionFinder().evaluate_selection(*full_model, selections['축소'])
+            if pruned_value is not None:
+                gap = (values['전체'] - pruned_value) / max(1.0, abs(values['전체']))
+                self.stdout.write(f"축소 해의 전체 모델 목적함수: {pruned_value:,.0f} (최적값 차이 {gap:.2%})")
+
+    def _benchmark_time_constraints(self, candidate_data, options):
+        """시간 제약 필터 기존 방식(제약별 순회)과 요일별 허용 마스크 방식의 실행 시간 비교"""
+        weekdays = ['월', '화', '수', '목', '금']
+        cases = {
+            '허용범위': dict(only_ranges=[{'days': weekdays, 'start_hour': 10, 'end_hour': 18}]),
+            '회피': dict(
+                avoid_times=[{'day': '월', 'hour': 9}, {'day': '수', 'hour': 13}],
+                avoid_ranges=[{'days': ['금'], 'start_hour': 13}]
+            ),
+            '전체': dict(
+                only_ranges=[{'days': weekdays, 'start_hour': 9, 'end_hour': 12},
+                             {'days': weekdays, 'start_hour': 13, 'end_hour': 18}],
+                avoid_times=[{'day': '월', 'hour': 9}],
+                avoid_ranges=[{'days': ['금'], 'start_hour': 15}],
+                specific_avoid_times=[{'day': '화', 'hour': 10}],
+                specific_avoid_time_ranges=[{'day': '목', 'start_hour': 13, 'end_hour': 15}]
+            ),
+        }
+
+        header = f"{'제약':10} {'통과':>6} {'기존(ms)':>10} {'마스크(ms)':>10} {'배율':>7} {'결과':>6}"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+
+        for label, case in cases.items():
+            args = (
+                case.get('only_ranges', []), case.get('avoid_times', []), case.get('avoid_ranges', []),
+                case.get('specific_avoid_times', []), case.get('specific_avoid_time_ranges', [])
+            )
+            timings = {}
+            for name, func in (('legacy', apply_time_constraints_legacy), ('mask', apply_time_constraints)):
+                elapsed = []
+                for _ in range(options['repeat']):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        start = time.perf_counter()
+                        result = func(candidate_data, *args)
+                        elapsed.append(time.perf_counter() - start)
+                timings[name] = (min(elapsed), [data['id'] for data in result])
+
+            same = timings['legacy'][1] == timings['mask'][1]
+            legacy_ms, mask_ms = timings['legacy'][0] * 1000, timings['mask'][0] * 1000
+            self.stdout.write(
+                f"{label:10} {len(timings['mask'][1]):6d} {legacy_ms:10.2f} {mask_ms:10.2f} "
+                f"{legacy_ms / max(mask_ms, 1e-9):6.1f}x {'일치' if same else '불일치':>6}"
+            )
+
+    def _count_idle_hours(self, selected):
+        """선택된 과목들의 요일별 공강 시간 합계 (인코딩과 무관한 동일 기준)"""
+        day_slots = defaultdict(set)
+        for data in selected:
+            for sch in data['schedule']:
+                day_slots[sch['day']].update(parse_time_slots(sch['times']))
+        return sum(max(slots) - min(slots) + 1 - len(slots) for slots in day_slots.values() if slots)
@@ -0,0 +1,27 @@
+"""
+학기별 충돌 골격 생성
+카탈로그(개설 강좌) 또는 건물 거리 데이터를 새로 넣은 뒤 실행
+
+사용 예:
+    python manage.py build_conflict_skeleton --year 2025 --term 1학기
+"""
+
+from django.core.management.base import BaseCommand
+
+from home.views.timetable_config import CURRENT_YEAR, CURRENT_TERM
+from home.services.conflict_skeleton import ConflictSkeletonService
+
+
+class Command(BaseCommand):
+    help = '학기별 충돌 골격 생성 (시간표 생성 시 충돌/이동시간 제약 재사용)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, default=CURRENT_YEAR)
+        parser.add_argument('--term', default=CURRENT_TERM)
+
+    def handle(self, *args, **options):
+        skeleton = ConflictSkeletonService().rebuild(options['year'], options['term'])
+        pair_count = sum(len(partners) for partners in skeleton.adjacent_pairs.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{skeleton.semester} 충돌 골격 생성 완료 - 과목 {len(skeleton.course_slots)}개, 연속 교시 쌍 {pair_count}개"
+        ))
@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_chatmessage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LastGeneratedTimetable',
+            fields=[
+                ('user_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('course_ids', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'last_generated_timetables',
+            },
+        ),
+    ]
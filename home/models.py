@@ -24,4 +24,23 @@ class ChatMessage(models.Model):
         ordering = ['created_at']
 
     def __str__(self) -> str:
-        return f"[{self.created_at}] {self.room} - {self.username}: {self.message[:30]}" 
\ No newline at end of file
+        return f"[{self.created_at}] {self.room} - {self.username}: {self.message[:30]}" 
+
+class LastGeneratedTimetable(models.Model):
+    """사용자별 직전 생성 시간표 (다음 생성 요청의 Phase 1 힌트).
+
+    - user_id: 생성 요청 사용자 ID
+    - course_ids: 최상위 시간표의 과목 ID 리스트
+    - updated_at: 마지막 생성 시각
+
+    솔버 워커 프로세스와 재시작에 관계없이 공유되도록 DB에 저장.
+    """
+    user_id = models.IntegerField(primary_key=True)
+    course_ids = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'last_generated_timetables'
+
+    def __str__(self) -> str:
+        return f"{self.user_id}: {len(self.course_ids)}개 과목 ({self.updated_at})"
@@ -0,0 +1,647 @@
+"""
+소규모 시간표 탐색 백엔드 (비트셋 분기 한정법)
+시간 제약과 필터를 거쳐 후보가 수십 개로 줄어든 요청은 CP-SAT 모델 구성과 솔버 기동 비용 없이
+요일·교시 비트마스크 위의 분기 한정 탐색으로 같은 해를 구함.
+학점·카테고리·충돌·이동시간 제약과 목적함수는 ModelBuilder와 동일
+(과목별 계수, 이동시간 제한 쌍, 밀집도 항은 ModelBuilder에서 그대로 가져옴)
+"""
+
+import heapq
+import time
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from ..views.timetable_types import ConstraintData, ConflictSkeleton, CompactSolution
+from ..views.timetable_config import (
+    ScoringWeights,
+    SolverParameters,
+    MAJOR_CATEGORIES
+)
+from .optimization_levels import OptimizationLevel
+from .cancellation import CancellationToken
+from .timetable_optimizer import ModelBuilder, SolutionFinder
+from ..utils import parse_time_slots
+
+
+# 밀집도 계산 대상 요일 (ModelBuilder와 동일)
+COMPACT_DAYS = ['월', '화', '수', '목', '금']
+
+
+class _SearchStopped(Exception):
+    """시간 제한 또는 취소로 탐색 중단"""
+
+
+class BitsetInstance:
+    """
+    분기 한정 탐색용으로 변환한 후보 과목 집합
+    과목 i는 비트 i, 요일·교시 슬롯은 (요일, 교시)마다 하나의 비트로 표현
+    """
+
+    # 시간 제한/취소 확인 간격 (탐색 노드 수)
+    CHECK_INTERVAL = 2048
+
+    def __init__(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        model_builder: ModelBuilder,
+        skeleton: Optional[ConflictSkeleton] = None
+    ):
+        self.candidate_data = candidate_data
+        self.constraints = constraints
+        self.compactness_encoding = model_builder.compactness_encoding
+        self.compact_weight = ScoringWeights.COMPACTNESS_WEIGHT if constraints.prefer_compact else 0
+        self.feasible = True
+
+        n = len(candidate_data)
+        self.ids = [data['id'] for data in candidate_data]
+        index_of = {cid: i for i, cid in enumerate(self.ids)}
+        self.credits = [data['credit'] for data in candidate_data]
+
+        # 목적함수 선형 계수 (밀집도 제외)
+        coefficients = model_builder.objective_coefficients(candidate_data, constraints)
+        self.objective_coefs = [coefficients[cid] for cid in self.ids]
+
+        # 충돌 제약: 요일·교시 슬롯 마스크 (한 과목이 같은 슬롯을 두 번 쓰면 선택 불가)
+        slot_bits: Dict[Tuple[str, int], int] = {}
+        self.slot_masks = [0] * n
+        self_conflicting = set()
+        for i, data in enumerate(candidate_data):
+            for sched in data['schedule']:
+                for slot in parse_time_slots(sched['times'], add_base_hour=True):
+                    bit = 1 << slot_bits.setdefault((sched['day'], slot), len(slot_bits))
+                    if self.slot_masks[i] & bit:
+                        self_conflicting.add(i)
+                    self.slot_masks[i] |= bit
+
+        # 동일 강의명 제약
+        name_bits: Dict[str, int] = {}
+        self.name_masks = [1 << name_bits.setdefault(data['course_name'], len(name_bits)) for data in candidate_data]
+
+        # 건물 간 이동시간 제약
+        self.far_masks = [0] * n
+        for id1, id2 in model_builder.far_course_pairs(candidate_data, constraints, skeleton):
+            i, j = index_of[id1], index_of[id2]
+            self.far_masks[i] |= 1 << j
+            self.far_masks[j] |= 1 << i
+
+        # 학점 제약 (ModelBuilder._add_credit_constraints와 동일한 규칙)
+        self.pre_added = [i for i, data in enumerate(candidate_data) if data.get('pre_added', False)]
+        pre_added_set = set(self.pre_added)
+        self.is_major = [data['category'] in MAJOR_CATEGORIES for data in candidate_data]
+        self.is_elective = [
+            bool(data.get('effective_category') and data.get('effective_category') != '')
+            or data['category'] not in MAJOR_CATEGORIES
+            for data in candidate_data
+        ]
+        excluded = set(self_conflicting)
+
+        pre_major = sum(self.credits[i] for i in self.pre_added if self.is_major[i])
+        pre_elective = sum(self.credits[i] for i in self.pre_added if self.is_elective[i])
+        self.target_total = constraints.target_total
+        self.major_target = self._equality_target(
+            constraints.target_major - pre_major, self.is_major, pre_added_set, excluded
+        )
+        self.elective_target = self._equality_target(
+            constraints.target_elective - pre_elective, self.is_elective, pre_added_set, excluded
+        )
+
+        # 교양 세부 카테고리 상한: [(과목 인덱스 집합, 남은 학점 상한)]
+        self.category_caps: List[Tuple[frozenset, int]] = []
+        for category_name, shortage_credits in (constraints.missing_gen_sub or {}).items():
+            members = {i for i, data in enumerate(candidate_data) if data.get('effective_category') == category_name}
+            if not members:
+                continue
+            remaining = shortage_credits - sum(self.credits[i] for i in members & pre_added_set)
+            if remaining > 0:
+                self.category_caps.append((frozenset(members - pre_added_set), remaining))
+            elif remaining == 0:
+                excluded |= members - pre_added_set
+        self.category_of = [
+            [k for k, (members, _) in enumerate(self.category_caps) if i in members] for i in range(n)
+        ]
+
+        self.free = [i for i in range(n) if i not in pre_added_set and i not in excluded]
+        if self_conflicting & pre_added_set:
+            self.feasible = False
+
+        self._build_compactness_terms(candidate_data, model_builder, index_of)
+
+    def _equality_target(
+        self,
+        remaining: int,
+        flags: List[bool],
+        pre_added_set: set,
+        excluded: set
+    ) -> Optional[int]:
+        """남은 학점이 양수면 등식 목표 반환, 0이면 해당 과목 제외, 음수면 제약 없음"""
+        if remaining > 0:
+            return remaining
+        if remaining == 0:
+            excluded.update(i for i, flag in enumerate(flags) if flag and i not in pre_added_set)
+        return None
+
+    def _build_compactness_terms(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        model_builder: ModelBuilder,
+        index_of: Dict[int, int]
+    ) -> None:
+        """밀집도 항 변환 (pairwise: 쌍 점수/요일 패널티, span: 요일별 교시 목록)"""
+        n = len(candidate_data)
+        self.pair_partners: List[List[Tuple[int, int]]] = [[] for _ in range(n)]
+        self.self_pair_weights = [0] * n
+        self.positive_pairs: List[Tuple[int, int, int]] = []
+        self.day_penalties: List[int] = []
+        self.day_masks = [0] * n
+        self.span_slots: List[Dict[str, List[int]]] = [{} for _ in range(n)]
+
+        if not self.compact_weight:
+            return
+
+        if self.compactness_encoding == 'span':
+            for i, data in enumerate(candidate_data):
+                for sched in data['schedule']:
+                    if sched['day'] in COMPACT_DAYS:
+                        slots = parse_time_slots(sched['times'], add_base_hour=True)
+                        self.span_slots[i].setdefault(sched['day'], []).extend(slots)
+            return
+
+        pair_terms, day_terms = model_builder.pairwise_compactness_terms(candidate_data)
+        for _, id1, id2, weight in pair_terms:
+            i, j = index_of[id1], index_of[id2]
+            if i == j:
+                self.self_pair_weights[i] += weight
+            else:
+                self.pair_partners[i].append((j, weight))
+                self.pair_partners[j].append((i, weight))
+            if weight > 0:
+                self.positive_pairs.append((i, j, weight))
+
+        for day_index, (_, day_ids, penalty) in enumerate(day_terms):
+            self.day_penalties.append(penalty)
+            for cid in day_ids:
+                self.day_masks[index_of[cid]] |= 1 << day_index
+
+    def search(
+        self,
+        k: int,
+        score_bonus: Optional[Dict[int, int]] = None,
+        min_objective: Optional[int] = None,
+        time_limit: Optional[float] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Tuple[List[Tuple[List[int], int, int]], bool]:
+        """
+        종합 점수(목적함수 + score_bonus) 상위 k개 해 탐색
+
+        Args:
+            k: 찾을 해 개수
+            score_bonus: {과목 ID: 순위 점수 추가분} (없으면 목적함수 순)
+            min_objective: 목적함수 하한 (품질 기준)
+            time_limit: 시간 제한 (초)
+            cancel_token: 취소 토큰
+
+        Returns:
+            ([(선택된 과목 ID 리스트, 목적함수 값, 종합 점수)] 종합 점수 내림차순, 탐색 완료 여부)
+        """
+        if not self.feasible or k <= 0:
+            return [], True
+
+        bonus = score_bonus or {}
+        score_coefs = [coef + bonus.get(cid, 0) for coef, cid in zip(self.objective_coefs, self.ids)]
+        credits = self.credits
+        weight = self.compact_weight
+        pairwise = weight and self.compactness_encoding != 'span'
+
+        # 필수 과목으로 시작 상태 구성 (필수 과목끼리 충돌하면 해 없음)
+        state = self._initial_state(score_coefs)
+        if state is None:
+            return [], True
+
+        # 분기 순서: 종합 점수 밀도(점수/학점) 내림차순
+        def density(i: int) -> float:
+            if credits[i] > 0:
+                return score_coefs[i] / credits[i]
+            return float('inf') if score_coefs[i] > 0 else float('-inf')
+
+        order = sorted(self.free, key=density, reverse=True)
+        m = len(order)
+        position = {i: p for p, i in enumerate(order)}
+
+        # 가지치기용 접미사 합계
+        suffix_credit = [0] * (m + 1)
+        suffix_major = [0] * (m + 1)
+        suffix_elective = [0] * (m + 1)
+        suffix_has_zero = [False] * (m + 1)
+        suffix_positive_objective = [0] * (m + 1)
+        suffix_zero_objective = [0] * (m + 1)
+        suffix_objective_density = [0.0] * (m + 1)
+        suffix_min_credit = [0] * (m + 1)
+        suffix_zero_count = [0] * (m + 1)
+        for p in range(m - 1, -1, -1):
+            i = order[p]
+            credit, coef = credits[i], self.objective_coefs[i]
+            suffix_credit[p] = suffix_credit[p + 1] + credit
+            suffix_major[p] = suffix_major[p + 1] + (credit if self.is_major[i] else 0)
+            suffix_elective[p] = suffix_elective[p + 1] + (credit if self.is_elective[i] else 0)
+            suffix_has_zero[p] = suffix_has_zero[p + 1] or credit == 0
+            suffix_positive_objective[p] = suffix_positive_objective[p + 1] + max(0, coef)
+            suffix_zero_objective[p] = suffix_zero_objective[p + 1] + (max(0, coef) if credit == 0 else 0)
+            suffix_objective_density[p] = max(
+                suffix_objective_density[p + 1], coef / credit if credit > 0 and coef > 0 else 0.0
+            )
+            suffix_min_credit[p] = min(filter(None, (suffix_min_credit[p + 1], credit)), default=0)
+            suffix_zero_count[p] = suffix_zero_count[p + 1] + (credit == 0)
+
+        # 양수 밀집도 쌍 점수는 두 과목 중 나중에 결정되는 과목에 귀속 (상한 계산용)
+        # 함께 선택될 수 없는 쌍(충돌, 동일 강의명, 이동시간 제한)은 제외
+        earlier_partners: List[List[Tuple[int, int]]] = [[] for _ in self.ids]
+        if pairwise:
+            for i, j, pair_weight in self.positive_pairs:
+                if i != j and (self.slot_masks[i] & self.slot_masks[j] or self.name_masks[i] & self.name_masks[j]
+                               or self.far_masks[i] >> j & 1):
+                    continue
+                if position.get(i, -1) < position.get(j, -1):
+                    i, j = j, i
+                if i in position:
+                    earlier_partners[i].append((j, pair_weight))
+        free_position = [position.get(i, -1) for i in range(len(self.ids))]
+
+        # 전공(없으면 교양) 학점 등식이 있으면 해당 과목과 나머지 과목의 남은 학점을 나눠 배낭 상한 계산
+        if self.major_target is not None:
+            group_flags, group_target = self.is_major, self.major_target
+        elif self.elective_target is not None:
+            group_flags, group_target = self.is_elective, self.elective_target
+        else:
+            group_flags, group_target = None, None
+
+        major_target, elective_target = self.major_target, self.elective_target
+        caps = [cap for _, cap in self.category_caps]
+        target_total = self.target_total
+
+        heap: List[Tuple[int, int, int, int]] = []
+        counter = [0, 0]  # [탐색 노드 수, 해 순번]
+        deadline = time.monotonic() + time_limit if time_limit else None
+
+        def record(sel: int, objective: int, score: int, compact: int) -> None:
+            if not pairwise and weight:
+                compact = self._span_compactness(sel)
+            objective += weight * compact
+            score += weight * compact
+            if min_objective is not None and objective < min_objective:
+                return
+            counter[1] += 1
+            entry = (score, -counter[1], objective, sel)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+        def visit(p, slots, names, blocked, sel, days, total, major, elective, category_credits,
+                  objective, score, compact):
+            counter[0] += 1
+            if counter[0] % self.CHECK_INTERVAL == 0:
+                if (deadline is not None and time.monotonic() > deadline) or \
+                        (cancel_token is not None and cancel_token.cancelled):
+                    raise _SearchStopped()
+
+            need = target_total - total
+            if suffix_credit[p] < need:
+                return
+            if major_target is not None and major_target - major > suffix_major[p]:
+                return
+            if elective_target is not None and elective_target - elective > suffix_elective[p]:
+                return
+
+            if p == m or (need == 0 and not suffix_has_zero[p]):
+                if need == 0 \
+                        and (major_target is None or major == major_target) \
+                        and (elective_target is None or elective == elective_target):
+                    record(sel, objective, score, compact)
+                return
+
+            # 남은 과목 중 현재 선택과 충돌하지 않는 과목만으로
+            # 1) 남은 학점을 채울 수 있는지 확인하고
+            # 2) 종합 점수 밀도 순으로 채우는 분수 배낭으로 상한 계산
+            if group_flags is not None:
+                group_need = group_target - (major if group_flags is self.is_major else elective)
+                required = (need - group_need, group_need)
+            else:
+                required = (need, 0)
+            capacity = list(required)
+            available = [0, 0]
+            extra = 0
+            pair_gains = []
+            for q in range(p, m):
+                i = order[q]
+                if slots & self.slot_masks[i] or names & self.name_masks[i] or blocked >> i & 1:
+                    continue
+                g = 1 if group_flags is not None and group_flags[i] else 0
+                available[g] += credits[i]
+                if earlier_partners[i]:
+                    gain = sum(w for j, w in earlier_partners[i] if sel >> j & 1 or free_position[j] >= p)
+                    if gain:
+                        pair_gains.append(gain)
+                coef = score_coefs[i]
+                if coef <= 0 or capacity[g] <= 0:
+                    continue
+                if credits[i] <= capacity[g]:
+                    extra += coef
+                    capacity[g] -= credits[i]
+                else:
+                    extra += coef * capacity[g] / credits[i]
+                    capacity[g] = 0
+            if available[0] < required[0] or available[1] < required[1]:
+                return
+
+            if len(heap) == k or min_objective is not None:
+                pair_bound = 0
+                if pairwise:
+                    max_new = (need // suffix_min_credit[p] if suffix_min_credit[p] else 0) + suffix_zero_count[p]
+                    if len(pair_gains) > max_new:
+                        pair_gains.sort(reverse=True)
+                        del pair_gains[max_new:]
+                    pair_bound = weight * (compact + sum(pair_gains))
+                if len(heap) == k and score + extra + pair_bound <= heap[0][0]:
+                    return
+                if min_objective is not None:
+                    objective_extra = min(
+                        suffix_positive_objective[p],
+                        need * suffix_objective_density[p] + suffix_zero_objective[p]
+                    )
+                    if objective + objective_extra + pair_bound < min_objective:
+                        return
+
+            i = order[p]
+            credit = credits[i]
+            if not (slots & self.slot_masks[i] or names & self.name_masks[i] or blocked >> i & 1) \
+                    and credit <= need \
+                    and not (major_target is not None and self.is_major[i] and major + credit > major_target) \
+                    and not (elective_target is not None and self.is_elective[i]
+                             and elective + credit > elective_target) \
+                    and all(category_credits[c] + credit <= caps[c] for c in self.category_of[i]):
+                new_compact = compact
+                if pairwise:
+                    new_compact += self.self_pair_weights[i] + sum(
+                        pair_weight for j, pair_weight in self.pair_partners[i] if sel >> j & 1
+                    )
+                    new_days = self.day_masks[i] & ~days
+                    d = 0
+                    while new_days:
+                        if new_days & 1:
+                            new_compact -= self.day_penalties[d]
+                        new_days >>= 1
+                        d += 1
+                new_category_credits = category_credits
+                if self.category_of[i]:
+                    new_category_credits = list(category_credits)
+                    for c in self.category_of[i]:
+                        new_category_credits[c] += credit
+                visit(
+                    p + 1,
+                    slots | self.slot_masks[i],
+                    names | self.name_masks[i],
+                    blocked | self.far_masks[i],
+                    sel | 1 << i,
+                    days | self.day_masks[i],
+                    total + credit,
+                    major + (credit if self.is_major[i] else 0),
+                    elective + (credit if self.is_elective[i] else 0),
+                    new_category_credits,
+                    objective + self.objective_coefs[i],
+                    score + score_coefs[i],
+                    new_compact
+                )
+
+            visit(p + 1, slots, names, blocked, sel, days, total, major, elective, category_credits,
+                  objective, score, compact)
+
+        complete = True
+        try:
+            visit(0, *state)
+        except _SearchStopped:
+            complete = False
+
+        results = []
+        for score, _, objective, sel in sorted(heap, reverse=True):
+            selected_ids = [self.ids[i] for i in range(len(self.ids)) if sel >> i & 1]
+            results.append((selected_ids, objective, score))
+        return results, complete
+
+    def _initial_state(self, score_coefs: List[int]) -> Optional[tuple]:
+        """필수 과목을 모두 선택한 탐색 시작 상태 (필수 과목끼리 충돌하면 None)"""
+        slots = names = blocked = sel = days = 0
+        total = objective = score = compact = 0
+        for i in self.pre_added:
+            if slots & self.slot_masks[i] or names & self.name_masks[i] or blocked >> i & 1:
+                return None
+            compact += self.self_pair_weights[i] + sum(
+                weight for j, weight in self.pair_partners[i] if sel >> j & 1
+            )
+            compact -= sum(
+                penalty for d, penalty in enumerate(self.day_penalties)
+                if self.day_masks[i] >> d & 1 and not days >> d & 1
+            )
+            slots |= self.slot_masks[i]
+            names |= self.name_masks[i]
+            blocked |= self.far_masks[i]
+            sel |= 1 << i
+            days |= self.day_masks[i]
+            total += self.credits[i]
+            objective += self.objective_coefs[i]
+            score += score_coefs[i]
+
+        if total > self.target_total:
+            return None
+        return (slots, names, blocked, sel, days, total, 0, 0, [0] * len(self.category_caps),
+                objective, score, compact)
+
+    def _span_compactness(self, sel: int) -> int:
+        """span 인코딩 밀집도 항: 요일별 (마지막 교시 - 첫 교시 + 1 - 수업 교시 수) 공강 패널티"""
+        day_slots: Dict[str, set] = {}
+        for i in range(len(self.ids)):
+            if sel >> i & 1:
+                for day, slots in self.span_slots[i].items():
+                    day_slots.setdefault(day, set()).update(slots)
+        idle = sum(max(slots) - min(slots) + 1 - len(slots) for slots in day_slots.values() if slots)
+        return -ScoringWeights.COMPACTNESS_GAP_PENALTY * 2 * idle
+
+
+class BitsetSearchBackend:
+    """
+    소규모 인스턴스용 탐색 백엔드
+    SolutionFinder와 같은 형식의 결과를 반환하므로 서비스에서 CP-SAT 대신 바로 사용 가능
+    """
+
+    def __init__(self, model_builder: Optional[ModelBuilder] = None):
+        self.model_builder = model_builder or ModelBuilder()
+        self.solution_finder = SolutionFinder()
+        # 직전 Phase 1 최적해의 선택 과목 ID (SolutionFinder.last_selected_ids와 같은 용도)
+        self.last_selected_ids: List[int] = []
+        # 직전 Phase 2 종료 사유와 통계 (SolutionFinder.last_phase2_stats와 같은 형식)
+        self.last_phase2_stats: Dict[str, Any] = {}
+
+    def supports(self, candidate_data: List[Dict[str, Any]]) -> bool:
+        """후보 수가 SMALL_INSTANCE_MAX_CANDIDATES 이하이면 사용"""
+        return (SolverParameters.ENABLE_SMALL_INSTANCE_BACKEND
+                and len(candidate_data) <= SolverParameters.SMALL_INSTANCE_MAX_CANDIDATES)
+
+    def compile(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        skeleton: Optional[ConflictSkeleton] = None
+    ) -> BitsetInstance:
+        """후보 과목을 비트셋 인스턴스로 변환 (충돌 골격이 있으면 이동시간 제약에 사용)"""
+        return BitsetInstance(candidate_data, constraints, self.model_builder, skeleton)
+
+    def find_optimal_solution(
+        self,
+        instance: BitsetInstance,
+        optimization_level: str = 'ADVANCED',
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Optional[float]:
+        """Phase 1: 최적 목적함수 값 (해가 없으면 None)"""
+        level_config = OptimizationLevel.get_level(optimization_level)
+
+        print("\n" + "="*80)
+        print("🔍 Phase 1 (bitset): 최적해 탐색 시작")
+        print("="*80)
+        print(f"후보 과목 수: {len(instance.candidate_data)}개 (분기 대상 {len(instance.free)}개)")
+
+        start = time.perf_counter()
+        results, complete = instance.search(
+            1, time_limit=level_config['phase1_time'], cancel_token=cancel_token
+        )
+        elapsed = time.perf_counter() - start
+
+        if cancel_token is not None and cancel_token.cancelled:
+            print("⛔ Phase 1: 취소됨")
+            return None
+        if not results:
+            print(f"❌ Phase 1: 해를 찾을 수 없음 ({elapsed:.3f}초)")
+            return None
+
+        selected_ids, best_value, _ = results[0]
+        self.last_selected_ids = list(selected_ids)
+        selected_set = set(selected_ids)
+        selected_courses = [data['course_name'] for data in instance.candidate_data if data['id'] in selected_set]
+        print(f"\n✅ Phase 1 완료 ({elapsed:.3f}초{'' if complete else ', 시간 제한으로 최적성 미증명'})")
+        print(f"최적 목적함수 값: {best_value:,.0f}")
+        print(f"\n선택된 과목 ({len(selected_courses)}개): {', '.join(selected_courses)}")
+        print("="*80 + "\n")
+        return float(best_value)
+
+    def find_top_k_solutions(
+        self,
+        instance: BitsetInstance,
+        preference_bonus: Dict[int, int],
+        optimization_level: str = 'ADVANCED',
+        optimal_value: Optional[float] = None,
+        on_solution: Optional[Callable[[CompactSolution], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[CompactSolution]:
+        """Phase 2 (top-K): 종합 점수(목적함수 + 스케일 × 선호도) 상위 K개 시간표"""
+        level_config = OptimizationLevel.get_level(optimization_level)
+        scale = ScoringWeights.COMBINED_OBJECTIVE_SCALE
+        score_bonus = {cid: scale * bonus for cid, bonus in preference_bonus.items() if bonus}
+        return self._run_phase2(
+            instance, level_config, level_config['return_count'],
+            score_bonus, optimal_value, on_solution, cancel_token, 'top-K'
+        )
+
+    def find_multiple_solutions(
+        self,
+        instance: BitsetInstance,
+        optimization_level: str = 'ADVANCED',
+        optimal_value: Optional[float] = None,
+        on_solution: Optional[Callable[[CompactSolution], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> List[CompactSolution]:
+        """Phase 2: 품질 하한을 만족하는 해를 목적함수 순으로 최대 solutions개"""
+        level_config = OptimizationLevel.get_level(optimization_level)
+        timetables_data = self._run_phase2(
+            instance, level_config, level_config['solutions'],
+            None, optimal_value, on_solution, cancel_token, '다양한 해'
+        )
+        return timetables_data
+
+    def _run_phase2(
+        self,
+        instance: BitsetInstance,
+        level_config: Dict[str, Any],
+        k: int,
+        score_bonus: Optional[Dict[int, int]],
+        optimal_value: Optional[float],
+        on_solution: Optional[Callable[[CompactSolution], None]],
+        cancel_token: Optional[CancellationToken],
+        label: str
+    ) -> List[CompactSolution]:
+        print("\n" + "="*80)
+        print(f"🔍 Phase 2 (bitset {label}): 최대 {k}개 시간표 탐색")
+        print("="*80)
+
+        min_objective = None
+        if optimal_value is not None:
+            min_objective = int(optimal_value * level_config['min_quality'])
+            print(f"최소 목적함수 값 제약: {min_objective:,.0f} (최적값의 {level_config['min_quality']*100:.0f}%)")
+
+        # 다양성 필터로 빠지는 해가 있으면 더 많은 상위 해를 찾아 다시 거름
+        # (CP-SAT가 해마다 다양성 제약을 추가하며 찾는 순서와 같은 결과)
+        start = time.perf_counter()
+        search_count = k
+        while True:
+            remaining = level_config['phase2_time'] - (time.perf_counter() - start)
+            results, complete = instance.search(
+                search_count, score_bonus=score_bonus, min_objective=min_objective,
+                time_limit=max(remaining, 0.001), cancel_token=cancel_token
+            )
+            diverse = self._filter_diverse(instance, results)
+            if len(diverse) >= k or len(results) < search_count or not complete:
+                break
+            search_count *= 4
+        elapsed = time.perf_counter() - start
+
+        results = diverse[:k]
+
+        finder = self.solution_finder
+        course_names = {data['id']: data['course_name'] for data in instance.candidate_data}
+        timetables_data = []
+        for selected_ids, objective, _ in results:
+            solution = finder.compact_solution(selected_ids, objective, optimal_value)
+            timetables_data.append(solution)
+            finder.print_solution_line(len(timetables_data), solution, course_names)
+            if on_solution is not None:
+                on_solution(solution)
+
+        # 분기 한정 탐색은 상위 k개를 한 번에 구하므로 정체 조기 종료는 적용하지 않음
+        if not complete:
+            stop_reason = 'cancelled' if cancel_token is not None and cancel_token.cancelled else 'time'
+        else:
+            stop_reason = 'limit' if len(timetables_data) >= k else 'exhausted'
+        self.last_phase2_stats = {'mode': 'bitset', 'stop_reason': stop_reason, 'solutions': len(timetables_data)}
+
+        print(f"\n✅ Phase 2 (bitset {label}) 완료: {len(timetables_data)}개 시간표, {elapsed:.3f}초"
+              f"{'' if complete else ' (시간 제한/취소로 중단)'}")
+        print("="*80 + "\n")
+        return timetables_data
+
+    def _filter_diverse(
+        self,
+        instance: BitsetInstance,
+        results: List[Tuple[List[int], int, int]]
+    ) -> List[Tuple[List[int], int, int]]:
+        """
+        다양성 필터: 순위순으로 이미 고른 모든 해와 PHASE2_MIN_DIFFERENT_COURSES개 이상 다른 해만 유지
+        (비교 단위와 규칙은 SolutionFinder._add_diversity_cut과 같음)
+        """
+        min_different = max(1, SolverParameters.PHASE2_MIN_DIFFERENT_COURSES)
+        groups = self.solution_finder.diversity_groups(instance.candidate_data)
+        pre_added_ids = {instance.ids[i] for i in instance.pre_added}
+
+        accepted, accepted_keys = [], []
+        for result in results:
+            key = frozenset(groups[cid] for cid in result[0] if cid not in pre_added_ids)
+            if all(len(prev - key) >= min(min_different, len(prev)) for prev in accepted_keys):
+                accepted.append(result)
+                accepted_keys.append(key)
+        return accepted
@@ -4,7 +4,9 @@
 """
 
 import re
-from typing import Optional, Dict, Tuple
+import threading
+from typing import Optional, Dict, Tuple, Iterable, List
+import numpy as np
 from data_manager.models import BuildingDistance
 from ..views.timetable_config import DEFAULT_WALKING_TIME
 
@@ -18,6 +20,13 @@ class BuildingDistanceService:
     _instance: Optional['BuildingDistanceService'] = None
     _distance_cache: Optional[Dict[Tuple[str, str], int]] = None
 
+    # 건물 코드 -> 정수 인덱스, 인덱스 기준 이동시간 행렬 (_distance_cache에서 파생)
+    # 여러 요청 스레드가 함께 확장/재구성하므로 _lock을 잡고 변경
+    _lock = threading.RLock()
+    _building_index: Optional[Dict[str, int]] = None
+    _walking_matrix: Optional[np.ndarray] = None
+    _matrix_source: Optional[Dict[Tuple[str, str], int]] = None
+
     def __new__(cls):
         """싱글톤 인스턴스 생성"""
         if cls._instance is None:
@@ -30,12 +39,23 @@ class BuildingDistanceService:
             self._load_cache()
 
     def _load_cache(self) -> None:
-        """건물 거리 데이터를 DB에서 로드하여 메모리에 캐싱"""
-        self._distance_cache = {}
+        """건물 거리 데이터를 DB에서 로드하여 메모리에 캐싱 (다 채운 뒤 교체하므로 다른 스레드가 빈 캐시를 보지 않음)"""
+        distance_cache = {}
         for dist in BuildingDistance.objects.all():
             key = (dist.from_building, dist.to_building)
-            self._distance_cache[key] = dist.walking_time
-        print(f"DEBUG: 건물 거리 캐시 로드 완료 - {len(self._distance_cache)}개 항목")
+            distance_cache[key] = dist.walking_time
+        self._distance_cache = distance_cache
+        print(f"DEBUG: 건물 거리 캐시 로드 완료 - {len(distance_cache)}개 항목")
+
+    @property
+    def cache_token(self) -> object:
+        """
+        거리 캐시 식별 토큰 (캐시가 다시 로드되거나 교체되면 다른 객체가 되므로 is로 비교)
+        거리 데이터에서 파생한 결과(모델 캐시 등)가 아직 유효한지 확인할 때 사용
+        """
+        if self._distance_cache is None:
+            self._load_cache()
+        return self._distance_cache
 
     def get_distance(self, from_building: str, to_building: str) -> int:
         """
@@ -63,6 +83,64 @@ class BuildingDistanceService:
             DEFAULT_WALKING_TIME
         )
 
+    def intern_buildings(self, buildings: Iterable[str]) -> List[int]:
+        """
+        건물 코드를 이동시간 행렬의 정수 인덱스로 변환
+        처음 보는 건물은 새 인덱스를 배정 (다른 건물까지 기본 이동시간, 행렬은 다음 조회 시 확장)
+        """
+        with self._lock:
+            self._sync_walking_matrix()
+            indices = []
+            for building in buildings:
+                index = self._building_index.get(building)
+                if index is None:
+                    index = self._building_index[building] = len(self._building_index)
+                indices.append(index)
+            return indices
+
+    def get_walking_matrix(self) -> np.ndarray:
+        """
+        intern_buildings() 인덱스 기준 이동시간 행렬 (행: 출발, 열: 도착)
+        get_distance()와 같은 값: 같은 건물 0분, 캐시에 없는 쌍은 기본값(5분)
+        """
+        with self._lock:
+            self._sync_walking_matrix()
+            size = len(self._building_index)
+            if self._walking_matrix.shape[0] < size:
+                self._walking_matrix = self._build_walking_matrix(size)
+            return self._walking_matrix
+
+    def intern_with_matrix(self, building_lists: Iterable[Iterable[str]]) -> Tuple[List[List[int]], np.ndarray]:
+        """
+        건물 코드 리스트들을 인덱스로 변환하고 그 인덱스 기준 이동시간 행렬을 함께 반환
+        한 번 잠금으로 처리하므로 중간에 다른 스레드가 거리 캐시를 다시 로드해도 인덱스와 행렬이 어긋나지 않음
+        """
+        with self._lock:
+            indices = [self.intern_buildings(buildings) for buildings in building_lists]
+            return indices, self.get_walking_matrix()
+
+    def _sync_walking_matrix(self) -> None:
+        """거리 캐시가 (재)로드되었으면 건물 인덱스와 행렬 재구성 (self._lock을 잡은 상태에서 호출)"""
+        if self._distance_cache is None:
+            self._load_cache()
+        if self._matrix_source is self._distance_cache:
+            return
+
+        self._matrix_source = self._distance_cache
+        self._building_index = {}
+        for from_building, to_building in self._distance_cache:
+            self._building_index.setdefault(from_building, len(self._building_index))
+            self._building_index.setdefault(to_building, len(self._building_index))
+        self._walking_matrix = self._build_walking_matrix(len(self._building_index))
+
+    def _build_walking_matrix(self, size: int) -> np.ndarray:
+        matrix = np.full((size, size), DEFAULT_WALKING_TIME, dtype=np.int32)
+        np.fill_diagonal(matrix, 0)
+        for (from_building, to_building), walking_time in self._distance_cache.items():
+            if from_building != to_building:
+                matrix[self._building_index[from_building], self._building_index[to_building]] = walking_time
+        return matrix
+
     def reload_cache(self) -> None:
         """캐시 재로드 (DB 변경 시 호출)"""
         self._load_cache()
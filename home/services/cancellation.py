@@ -0,0 +1,60 @@
+"""
+시간표 생성 취소 토큰
+요청 스레드/작업 관리자가 취소를 요청하면 생성 파이프라인이 단계 사이와 CP-SAT 탐색 중에 이를 확인하여 중단
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Optional, Iterator
+
+
+class GenerationCancelled(Exception):
+    """시간표 생성이 취소됨"""
+
+
+class CancellationToken:
+    """
+    협력적 취소 토큰
+    threading.Event 또는 multiprocessing.Event를 감싸므로 워커 프로세스에서도 같은 방식으로 사용
+    """
+
+    # 탐색 중 취소 여부 확인 간격 (초)
+    WATCH_INTERVAL = 0.1
+
+    def __init__(self, event: Optional[Any] = None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        """취소 요청"""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        """취소되었으면 GenerationCancelled 발생"""
+        if self._event.is_set():
+            raise GenerationCancelled()
+
+    @contextmanager
+    def watch(self, solver: Any) -> Iterator[None]:
+        """
+        Solve() 실행 동안 취소 여부를 감시하여 solver.stop_search() 호출
+        (해를 찾기 전에는 솔루션 콜백이 호출되지 않으므로 별도 스레드로 감시)
+        """
+        finished = threading.Event()
+
+        def monitor() -> None:
+            while not finished.wait(self.WATCH_INTERVAL):
+                if self._event.is_set():
+                    solver.stop_search()
+                    return
+
+        watcher = threading.Thread(target=monitor, name='solve-cancel-watch', daemon=True)
+        watcher.start()
+        try:
+            yield
+        finally:
+            finished.set()
+            watcher.join()
@@ -85,6 +85,12 @@ class CandidateFilter:
             self.service.course_search(year=CURRENT_YEAR, term=CURRENT_TERM, category_name='교양')
         ).annotate(upper_course_name=Upper('course_name'))
 
+        # 필터링·점수 계산·후보 데이터 구성에서 참조하는 카테고리 트리(최대 3단계), 학과, 시간표를
+        # 한 번에 로드 (과목마다 지연 조회하지 않도록)
+        candidate_qs = candidate_qs.select_related(
+            'category__parent_category__parent_category', 'dept'
+        ).prefetch_related('courseschedule_set')
+
         # 이미 이수한 과목 제외
         if criteria.completed_courses:
             candidate_qs = candidate_qs.exclude(
@@ -196,25 +202,22 @@ class CandidateFilter:
         if course.credits <= 0:
             return False
 
-        # 시간표 '00' slot 제거
-        if any(sch.times.strip() == EXCLUDE_TIME_SLOT for sch in course.courseschedule_set.all()):
-            return False
-
-        # 필수 과목(pre_added)은 공강일 필터를 무시
-        if course.course_id in criteria.pre_added_ids:
+        is_pre_added = course.course_id in criteria.pre_added_ids
+        if is_pre_added:
             print(f"DEBUG: 필수 과목 '{course.course_name}' - 기본 필터 통과 (공강일 무시)")
-            # 가상강의실 제외 (필수 과목도 체크)
-            if any(EXCLUDE_LOCATION_KEYWORD in (sch.location or "") for sch in course.courseschedule_set.all()):
+
+        for sch in course.courseschedule_set.all():
+            # 시간표 '00' slot 제거
+            if sch.times.strip() == EXCLUDE_TIME_SLOT:
                 return False
-            return True
 
-        # Free-day 충돌 (일반 과목만 체크)
-        if any(sch.day in criteria.free_days for sch in course.courseschedule_set.all()):
-            return False
+            # 가상강의실 제외 (필수 과목도 체크)
+            if EXCLUDE_LOCATION_KEYWORD in (sch.location or ""):
+                return False
 
-        # 가상강의실 제외
-        if any(EXCLUDE_LOCATION_KEYWORD in (sch.location or "") for sch in course.courseschedule_set.all()):
-            return False
+            # Free-day 충돌 (필수 과목(pre_added)은 공강일 필터를 무시)
+            if not is_pre_added and sch.day in criteria.free_days:
+                return False
 
         return True
 
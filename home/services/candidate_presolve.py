@@ -0,0 +1,135 @@
+"""
+CP-SAT 모델 구성 전 후보 과목 전처리 서비스
+동일 과목의 동등한 분반을 하나의 대표로 병합하고, 지배되는 분반을 제거하여
+모델의 대칭성과 Phase 2의 중복 시간표를 줄임
+"""
+
+from typing import List, Dict, Any, Tuple
+from collections import defaultdict
+
+from ..views.timetable_types import PresolveResult
+from ..utils import parse_time_slots
+
+
+# 점수 구성요소 (모두 클수록 좋음)
+SCORE_COMPONENTS = ('graduation_priority', 'preference_score', 'rating_score')
+
+
+class CandidatePresolver:
+    """후보 과목 동등 클래스 병합 및 지배 후보 제거"""
+
+    def presolve(self, candidate_data: List[Dict[str, Any]]) -> PresolveResult:
+        """
+        후보 과목 전처리
+
+        같은 과목명·학점·이수구분·시간·건물을 가진 분반들은 모델에서 구분되지 않으므로
+        점수까지 같으면 하나의 대표로 병합하고, 모든 점수 구성요소가 다른 분반 이하인
+        분반은 지배된 것으로 보고 제거한다. 필수(pre_added) 과목은 그대로 유지한다.
+
+        Args:
+            candidate_data: 후보 과목 데이터 리스트
+
+        Returns:
+            PresolveResult (대표 후보, 동등 분반, 제거된 후보)
+        """
+        result = PresolveResult(original_count=len(candidate_data))
+
+        # 1. 구조 키(모델 제약에 영향을 주는 속성)로 그룹화
+        groups = defaultdict(list)
+        passthrough = []
+        for data in candidate_data:
+            if data.get('pre_added', False):
+                passthrough.append(data)
+            else:
+                groups[self._structural_key(data)].append(data)
+
+        kept_ids = {data['id'] for data in passthrough}
+
+        for members in groups.values():
+            # 2. 점수까지 같은 분반은 동등 클래스로 병합 (첫 번째 분반이 대표)
+            classes = defaultdict(list)
+            for data in members:
+                classes[self._score_key(data)].append(data)
+
+            # 3. 지배되는 클래스 제거
+            score_keys = list(classes.keys())
+            for score_key in score_keys:
+                if any(self._dominates(other, score_key) for other in score_keys if other != score_key):
+                    result.dominated_ids.extend(data['id'] for data in classes[score_key])
+                    continue
+
+                representative, *others = classes[score_key]
+                kept_ids.add(representative['id'])
+                if others:
+                    result.equivalents[representative['id']] = others
+
+        # 원래 순서 유지
+        result.representatives = [data for data in candidate_data if data['id'] in kept_ids]
+
+        merged_count = sum(len(others) for others in result.equivalents.values())
+        print(f"DEBUG: 후보 전처리 - {result.original_count}개 → {len(result.representatives)}개 "
+              f"(동등 분반 병합 {merged_count}개, 지배 후보 제거 {len(result.dominated_ids)}개)")
+
+        return result
+
+    def expand_timetables(
+        self,
+        timetables: List[Dict[str, Any]],
+        presolve_result: PresolveResult
+    ) -> List[Dict[str, Any]]:
+        """
+        반환할 시간표에 대표 과목과 동등한 분반 정보를 다시 붙임 (in-place)
+
+        Args:
+            timetables: 정렬된 시간표 리스트 ('courses' 키 포함)
+            presolve_result: presolve() 결과
+
+        Returns:
+            동등 분반 정보가 추가된 시간표 리스트
+        """
+        if not presolve_result.equivalents:
+            return timetables
+
+        for timetable in timetables:
+            for course in timetable.get('courses', []):
+                others = presolve_result.equivalents.get(course.get('course_id'))
+                if not others:
+                    continue
+                course['equivalent_sections'] = [
+                    {
+                        'course_id': data['id'],
+                        'section': data.get('section', ''),
+                        'instructor_name': data.get('instructor_name', ''),
+                        'capacity': data.get('capacity', 0),
+                        'location': data.get('location', ''),
+                        'schedules': data.get('schedule', [])
+                    }
+                    for data in others
+                ]
+
+        return timetables
+
+    def _structural_key(self, data: Dict[str, Any]) -> Tuple:
+        """모델 제약 및 점수 외 목적함수 항에 영향을 주는 속성으로 구성한 키"""
+        slots = tuple(sorted(
+            (sch['day'], tuple(parse_time_slots(sch['times'])))
+            for sch in data['schedule']
+        ))
+        return (
+            data['course_name'],
+            data['credit'],
+            data['category'],
+            data.get('effective_category', ''),
+            data.get('year', ''),
+            data.get('is_same_year', False),
+            slots,
+            tuple(sorted(data.get('buildings', [])))
+        )
+
+    def _score_key(self, data: Dict[str, Any]) -> Tuple:
+        """점수 구성요소 튜플"""
+        return tuple(data.get(component, 0) for component in SCORE_COMPONENTS)
+
+    def _dominates(self, a: Tuple, b: Tuple) -> bool:
+        """점수 튜플 a가 b를 지배하는지 (모든 구성요소 이상, 하나 이상 초과)"""
+        return all(va >= vb for va, vb in zip(a, b)) and a != b
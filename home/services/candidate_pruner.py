@@ -0,0 +1,117 @@
+"""
+후보 과목 축소 서비스
+이수구분 버킷(전공필수/전공선택/교양 세부 카테고리)마다 실제로 고를 수 있는 과목 수보다
+충분히 많은 상위 후보와, 요일·교시마다 몇 개의 대체 후보만 남겨 솔버에 전달하는 후보 수를 줄임
+"""
+
+import math
+from typing import List, Dict, Any
+from collections import defaultdict
+
+from ..views.timetable_types import ConstraintData, PruneResult
+from ..views.timetable_config import SolverParameters, MAJOR_CATEGORIES
+from ..utils import parse_time_slots
+
+
+class CandidatePruner:
+    """요건 버킷별 상위 K개 + 시간대별 대체 후보 선별"""
+
+    def prune(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        scores: Dict[int, float]
+    ) -> PruneResult:
+        """
+        후보 과목 축소
+
+        버킷별로 남길 개수는 해당 버킷 학점 상한(전공 목표, 교양 목표, 교양 세부 부족 학점)을
+        버킷 최소 학점으로 나눈 최대 선택 가능 과목 수에 CANDIDATE_PRUNE_BUCKET_FACTOR를 곱한 값
+        (최소 CANDIDATE_PRUNE_MIN_PER_BUCKET). 상위 후보끼리 시간이 겹쳐도 해가 남도록
+        요일·교시마다 CANDIDATE_PRUNE_ALTERNATES_PER_SLOT개의 후보를 추가로 남기고,
+        미리 추가된 과목은 항상 유지한다.
+
+        Args:
+            candidate_data: 후보 과목 데이터 리스트
+            constraints: 학점 제약 조건
+            scores: 과목 ID -> 순위 점수 (클수록 우선)
+
+        Returns:
+            PruneResult (남긴 후보, 버킷별 남긴 개수)
+        """
+        result = PruneResult(original_count=len(candidate_data))
+        if len(candidate_data) <= SolverParameters.CANDIDATE_PRUNE_MIN_CANDIDATES:
+            result.kept = candidate_data
+            return result
+
+        def rank(data: Dict[str, Any]) -> tuple:
+            return (-scores.get(data['id'], 0), data['id'])
+
+        kept_ids = {data['id'] for data in candidate_data if data.get('pre_added', False)}
+
+        # 1. 버킷별 상위 K개
+        buckets = defaultdict(list)
+        for data in candidate_data:
+            buckets[self._bucket_key(data)].append(data)
+
+        for bucket, members in buckets.items():
+            limit = self._bucket_limit(bucket, members, constraints)
+            ranked = sorted(members, key=rank)
+            kept_ids.update(data['id'] for data in ranked[:limit])
+            result.bucket_sizes[bucket] = min(limit, len(members))
+
+        # 2. 요일·교시별 대체 후보 (상위 후보끼리 충돌해도 학점을 채울 수 있도록)
+        slot_members = defaultdict(list)
+        for data in candidate_data:
+            for sched in data['schedule']:
+                for slot in parse_time_slots(sched['times']):
+                    slot_members[(sched['day'], slot)].append(data)
+
+        alternates = SolverParameters.CANDIDATE_PRUNE_ALTERNATES_PER_SLOT
+        for members in slot_members.values():
+            covered = sum(1 for data in members if data['id'] in kept_ids)
+            for data in sorted(members, key=rank):
+                if covered >= alternates:
+                    break
+                if data['id'] not in kept_ids:
+                    kept_ids.add(data['id'])
+                    result.alternate_count += 1
+                    covered += 1
+
+        # 원래 순서 유지
+        result.kept = [data for data in candidate_data if data['id'] in kept_ids]
+
+        print(f"DEBUG: 후보 축소 - {result.original_count}개 → {len(result.kept)}개 "
+              f"(버킷 {len(buckets)}개, 시간대 대체 후보 {result.alternate_count}개)")
+        for bucket, size in sorted(result.bucket_sizes.items()):
+            print(f"DEBUG:   {bucket}: {len(buckets[bucket])}개 중 상위 {size}개")
+
+        return result
+
+    @staticmethod
+    def _bucket_key(data: Dict[str, Any]) -> str:
+        """전공은 이수구분, 교양은 세부 카테고리 단위 버킷"""
+        if data['category'] in MAJOR_CATEGORIES:
+            return data['category']
+        return data.get('effective_category') or data['category']
+
+    @staticmethod
+    def _bucket_limit(
+        bucket: str,
+        members: List[Dict[str, Any]],
+        constraints: ConstraintData
+    ) -> int:
+        """버킷에서 남길 후보 수"""
+        if bucket in MAJOR_CATEGORIES:
+            credit_cap = constraints.target_major
+        else:
+            credit_cap = constraints.target_elective
+            if bucket in (constraints.missing_gen_sub or {}):
+                credit_cap = min(credit_cap, constraints.missing_gen_sub[bucket])
+
+        min_credit = max(1, min(data['credit'] for data in members))
+        max_selectable = max(1, math.ceil(credit_cap / min_credit))
+        return max(
+            SolverParameters.CANDIDATE_PRUNE_MIN_PER_BUCKET,
+            max_selectable * SolverParameters.CANDIDATE_PRUNE_BUCKET_FACTOR
+        )
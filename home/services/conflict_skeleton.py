@@ -0,0 +1,191 @@
+"""
+학기별 충돌 골격 서비스
+슬롯 클리크, 동일 강의명 그룹, 연속 교시 과목 쌍의 이동시간은 개설 강좌와 건물 거리에만 의존하므로
+학기마다 한 번 계산해 메모리와 디스크에 캐싱하고, 모든 사용자 요청이 후보 ID로 잘라 재사용
+"""
+
+import os
+import pickle
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Count, Max, Sum
+
+from data_manager.models import Courses, CourseSchedule, CourseTimeSlot, BuildingDistance
+
+from ..views.timetable_types import ConflictSkeleton
+from ..views.timetable_config import CURRENT_YEAR, CURRENT_TERM, SolverParameters
+from ..utils import parse_course_schedule
+from .building_distance_service import extract_building_number
+from .timetable_optimizer import ModelBuilder
+
+
+class ConflictSkeletonService:
+    """
+    학기별 충돌 골격 관리 서비스 (싱글톤)
+    카탈로그 임포트 후 rebuild()로 미리 생성하고, 요청 처리 시 get_skeleton()으로 조회
+    """
+
+    _instance: Optional['ConflictSkeletonService'] = None
+
+    # 골격 구조가 바뀌면 올려서 기존 디스크 캐시를 무효화
+    FORMAT_VERSION = 2
+    # 메모리 캐시의 카탈로그 지문 재확인 간격 (초)
+    FINGERPRINT_CHECK_INTERVAL = 300
+
+    def __new__(cls):
+        """싱글톤 인스턴스 생성"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
+        self.model_builder = ModelBuilder()
+        self._lock = threading.Lock()
+        # (학년도, 학기) -> (골격, 마지막 지문 확인 시각)
+        self._skeletons: Dict[Tuple[int, str], Tuple[ConflictSkeleton, float]] = {}
+
+    def get_skeleton(self, year: int = CURRENT_YEAR, term: str = CURRENT_TERM) -> Optional[ConflictSkeleton]:
+        """
+        학기 충돌 골격 조회 (메모리 → 디스크 → 새로 생성 순)
+
+        Returns:
+            충돌 골격. ENABLE_CONFLICT_SKELETON이 꺼져 있으면 None
+        """
+        if not SolverParameters.ENABLE_CONFLICT_SKELETON:
+            return None
+
+        key = (year, term)
+        with self._lock:
+            cached = self._skeletons.get(key)
+            if cached is not None and time.monotonic() - cached[1] < self.FINGERPRINT_CHECK_INTERVAL:
+                return cached[0]
+
+            fingerprint = self._fingerprint(year, term)
+            if cached is not None and cached[0].fingerprint == fingerprint:
+                self._skeletons[key] = (cached[0], time.monotonic())
+                return cached[0]
+
+            skeleton = self._load(year, term, fingerprint)
+            if skeleton is None:
+                skeleton = self._build_and_save(year, term, fingerprint)
+            self._skeletons[key] = (skeleton, time.monotonic())
+            return skeleton
+
+    def rebuild(self, year: int = CURRENT_YEAR, term: str = CURRENT_TERM) -> ConflictSkeleton:
+        """카탈로그 임포트 후 골격 재생성 (메모리/디스크 캐시 모두 교체)"""
+        with self._lock:
+            skeleton = self._build_and_save(year, term, self._fingerprint(year, term))
+            self._skeletons[(year, term)] = (skeleton, time.monotonic())
+            return skeleton
+
+    def clear_cache(self) -> None:
+        """메모리 캐시 초기화 (디스크 캐시는 지문이 맞을 때만 다시 사용됨)"""
+        with self._lock:
+            self._skeletons = {}
+
+    def _build_and_save(self, year: int, term: str, fingerprint: Tuple) -> ConflictSkeleton:
+        started = time.perf_counter()
+        skeleton = self._build(year, term, fingerprint)
+        self._save(year, term, skeleton)
+        print(f"DEBUG: {skeleton.semester} 충돌 골격 생성 - 과목 {len(skeleton.course_slots)}개, "
+              f"연속 교시 쌍 {sum(len(p) for p in skeleton.adjacent_pairs.values())}개 "
+              f"({time.perf_counter() - started:.2f}초)")
+        return skeleton
+
+    def _build(self, year: int, term: str, fingerprint: Tuple) -> ConflictSkeleton:
+        """학기 개설 강좌 전체로 골격 계산 (ModelBuilder와 같은 슬롯/거리 규칙 사용)"""
+        courses = Courses.objects.filter(
+            semester__year=year, semester__term=term
+        ).prefetch_related('courseschedule_set').order_by('course_id')
+
+        rows = []
+        for course in courses:
+            schedule_list, locations = parse_course_schedule(course)
+            if not schedule_list:
+                continue
+            rows.append({
+                'id': course.course_id,
+                'course_name': course.course_name,
+                'schedule': schedule_list,
+                'buildings': [b for b in map(extract_building_number, locations) if b]
+            })
+
+        skeleton = ConflictSkeleton(semester=f"{year} {term}", fingerprint=fingerprint)
+        for data in rows:
+            skeleton.course_slots[data['id']] = self.model_builder.course_slots(data)
+            skeleton.course_names[data['id']] = data['course_name']
+
+        # 이동시간 0분(같은 건물) 쌍은 어떤 제한도 넘지 않으므로 저장하지 않음
+        for (id1, id2), max_distance in self.model_builder.adjacent_course_distances(rows).items():
+            if max_distance > 0:
+                skeleton.adjacent_pairs.setdefault(id1, []).append((id2, max_distance))
+        for partners in skeleton.adjacent_pairs.values():
+            partners.sort(key=lambda partner: -partner[1])
+
+        return skeleton
+
+    def _fingerprint(self, year: int, term: str) -> Tuple:
+        """
+        카탈로그/건물 거리 변경 감지용 지문 (집계 쿼리 4개)
+        CourseSchedule 저장 시 교시 행(CourseTimeSlot)을 새로 만들므로,
+        강좌 수가 그대로여도 시간/강의실을 고치면 교시 행의 최대 ID가 바뀜
+        """
+        courses = Courses.objects.filter(semester__year=year, semester__term=term)
+        course_stats = courses.aggregate(count=Count('course_id'), last=Max('course_id'))
+        schedule_stats = CourseSchedule.objects.filter(course__in=courses).aggregate(
+            count=Count('schedule_id'), last=Max('schedule_id')
+        )
+        slot_stats = CourseTimeSlot.objects.filter(course__in=courses).aggregate(
+            count=Count('slot_id'), last=Max('slot_id')
+        )
+        distance_stats = BuildingDistance.objects.aggregate(
+            count=Count('distance_id'), total=Sum('walking_time')
+        )
+        return (
+            self.FORMAT_VERSION,
+            course_stats['count'], course_stats['last'],
+            schedule_stats['count'], schedule_stats['last'],
+            slot_stats['count'], slot_stats['last'],
+            distance_stats['count'], distance_stats['total']
+        )
+
+    def _cache_path(self, year: int, term: str) -> str:
+        return os.path.join(settings.BASE_DIR, SolverParameters.CONFLICT_SKELETON_CACHE_DIR, f"{year}_{term}.pkl")
+
+    def _load(self, year: int, term: str, fingerprint: Tuple) -> Optional[ConflictSkeleton]:
+        """디스크 캐시 로드 (없거나 지문이 다르면 None)"""
+        path = self._cache_path(year, term)
+        try:
+            with open(path, 'rb') as f:
+                skeleton = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            print(f"DEBUG: 충돌 골격 디스크 캐시 로드 실패 ({path}): {e}")
+            return None
+
+        if not isinstance(skeleton, ConflictSkeleton) or skeleton.fingerprint != fingerprint:
+            print(f"DEBUG: 충돌 골격 디스크 캐시 만료 ({path})")
+            return None
+        print(f"DEBUG: 충돌 골격 디스크 캐시 로드 - {skeleton.semester} 과목 {len(skeleton.course_slots)}개")
+        return skeleton
+
+    def _save(self, year: int, term: str, skeleton: ConflictSkeleton) -> None:
+        """디스크 캐시 저장 (임시 파일에 쓴 뒤 교체하여 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록 함)"""
+        path = self._cache_path(year, term)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(skeleton, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"DEBUG: 충돌 골격 디스크 캐시 저장 실패 ({path}): {e}")
@@ -3,10 +3,12 @@
 졸업요건, 선호도, 평점 등을 기반으로 점수 계산
 """
 
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Sequence, Tuple
+import numpy as np
 from data_manager.models import Courses
 
-from ..views.timetable_types import ScoreCriteria
+from ..views.timetable_types import CourseScoreArrays, ScoreCriteria
 from ..views.timetable_config import (
     ScoringWeights,
     TAG_FILTERS,
@@ -16,6 +18,22 @@ from ..views.timetable_config import (
 from ..utils import get_effective_general_category, parse_time_slots
 
 
+@lru_cache(maxsize=4096)
+def _split_morning_afternoon(times_str: str) -> Tuple[int, int]:
+    """시간 문자열의 (오전 교시 수, 오후 교시 수)"""
+    hours = parse_time_slots(times_str, add_base_hour=True)
+    morning = sum(1 for hour in hours if hour < MORNING_END_HOUR)
+    return morning, len(hours) - morning
+
+
+def _contains_any(values: np.ndarray, patterns: List[str]) -> np.ndarray:
+    """values 각 문자열에 patterns 중 하나라도 부분 문자열로 포함되는지 여부 배열"""
+    matched = np.zeros(len(values), dtype=bool)
+    for pattern in patterns:
+        matched |= np.char.find(values, pattern) >= 0
+    return matched
+
+
 class CourseScorer:
     """후보 과목 점수 계산"""
 
@@ -23,76 +41,241 @@ class CourseScorer:
         self,
         courses: List[Courses],
         criteria: ScoreCriteria
-    ) -> None:
+    ) -> CourseScoreArrays:
         """
-        후보 과목들의 점수 계산 (in-place 수정)
+        후보 과목들의 점수를 과목 전체에 대해 한 번에 계산
+
+        과목별 속성(카테고리, 학점, 오전/오후 교시 수, 태그 매칭, 평점)을 배열로 한 번 모은 뒤
+        졸업요건/선호도/평점 점수를 NumPy 배열 연산으로 계산한다.
+        결과는 과목마다 _calculate_graduation_priority / _calculate_preference_score /
+        _calculate_rating_score를 호출한 것과 같다.
 
         Args:
-            courses: 후보 과목 리스트
+            courses: 후보 과목 리스트 (courseschedule_set, category prefetch 권장)
             criteria: 점수 계산 기준
+
+        Returns:
+            과목 순서와 같은 순서의 점수 배열
         """
         print("\n" + "="*80)
         print("📊 과목별 점수 계산 시작")
         print("="*80)
 
-        courses_with_scores = []
+        features = self._course_features(
+            courses, with_time_slots=criteria.prefer_morning or criteria.prefer_afternoon
+        )
+        scores = CourseScoreArrays(
+            course_ids=features['course_ids'],
+            graduation_priority=self._graduation_scores(features, criteria),
+            preference_score=self._preference_scores(features, criteria),
+            rating_score=self._rating_scores(features, criteria)
+        )
+
+        self._print_score_summary(courses, scores)
+        print("="*80 + "\n")
+        return scores
 
+    def _course_features(self, courses: List[Courses], with_time_slots: bool = True) -> Dict[str, np.ndarray]:
+        """
+        점수 계산에 쓰이는 과목별 속성 배열 (과목마다 한 번만 순회)
+        with_time_slots가 False면 오전/오후 교시 수는 계산하지 않음 (시간대 선호가 없을 때)
+        """
+        rows = []
+        category_info = {}  # 카테고리 ID -> (전공필수 여부, 교양 세부 카테고리), 카테고리마다 한 번만 계산
         for course in courses:
-            # 각 점수 계산
-            graduation_priority = self._calculate_graduation_priority(course, criteria)
-            preference_score = self._calculate_preference_score(course, criteria)
-            rating_score = self._calculate_rating_score(course, criteria)
-
-            # 과목 객체에 점수 저장
-            course.graduation_priority = graduation_priority
-            course.preference_score = preference_score
-            course.rating_score = rating_score
-
-            # 점수가 0이 아닌 과목 수집
-            total_score = graduation_priority + preference_score + rating_score
-            if total_score != 0:
-                courses_with_scores.append({
-                    'name': course.course_name,
-                    'instructor': course.instructor_name or 'N/A',
-                    'category': course.category.category_name if course.category else 'N/A',
-                    'grad_score': graduation_priority,
-                    'pref_score': preference_score,
-                    'rating_score': rating_score,
-                    'total': total_score
-                })
-
-            # 디버그 출력
-            if preference_score != 0:
-                print(f"DEBUG: Course {course.course_name} has preference_score = {preference_score}")
-            if rating_score != 0:
-                print(f"DEBUG: Course {course.course_name} has rating_score = {rating_score}")
-
-        # 점수가 있는 과목들 요약 출력
-        if courses_with_scores:
-            print("\n📈 점수가 부여된 과목 요약 (상위 20개)")
-            print("-" * 100)
-            print(f"{'과목명':30} {'교수':15} {'카테고리':10} {'졸업':>6} {'선호':>6} {'평점':>6} {'합계':>8}")
-            print("-" * 100)
-
-            # 총점 기준 정렬
-            courses_with_scores.sort(key=lambda x: x['total'], reverse=True)
-
-            for i, course_info in enumerate(courses_with_scores[:20]):
-                print(f"{course_info['name'][:30]:30} "
-                      f"{course_info['instructor'][:15]:15} "
-                      f"{course_info['category'][:10]:10} "
-                      f"{course_info['grad_score']:6d} "
-                      f"{course_info['pref_score']:6d} "
-                      f"{course_info['rating_score']:6d} "
-                      f"{course_info['total']:8d}")
-
-            if len(courses_with_scores) > 20:
-                print(f"... 외 {len(courses_with_scores) - 20}개 과목")
-
-            print("-" * 100)
-            print(f"총 {len(courses_with_scores)}개 과목에 점수 부여됨")
+            if course.category_id not in category_info:
+                category = course.category
+                category_info[course.category_id] = (
+                    category is not None and category.category_name == "전공필수",
+                    get_effective_general_category(course)
+                )
+            major_required, effective = category_info[course.category_id]
+
+            morning = afternoon = 0
+            if with_time_slots:
+                for sch in course.courseschedule_set.all():
+                    am, pm = _split_morning_afternoon(sch.times)
+                    morning += am
+                    afternoon += pm
+            rows.append((
+                course.course_id,
+                course.category_id if course.category_id is not None else -1,
+                course.credits,
+                major_required,
+                morning,
+                afternoon,
+                effective,
+                course.course_name or '',
+                course.instructor_name or '',
+            ))
+
+        columns = list(zip(*rows)) or [()] * 9
+        course_ids, category_ids, credits, major_required, morning, afternoon, effective, names, instructors = columns
+        return {
+            'course_ids': np.array(course_ids, dtype=np.int64),
+            'category_ids': np.array(category_ids, dtype=np.int64),
+            'credits': np.array(credits, dtype=np.int64),
+            'major_required': np.array(major_required, dtype=bool),
+            'morning_count': np.array(morning, dtype=np.int64),
+            'afternoon_count': np.array(afternoon, dtype=np.int64),
+            'effective_category': np.array(effective, dtype=object),
+            'is_general': np.array([bool(category) for category in effective], dtype=bool),
+            'course_names': np.array(names, dtype=str),
+            'instructors': np.array(instructors, dtype=str),
+        }
+
+    def _graduation_scores(self, features: Dict[str, np.ndarray], criteria: ScoreCriteria) -> np.ndarray:
+        """졸업요건 우선순위 점수 배열 (_calculate_graduation_priority와 같은 계산)"""
+        n = len(features['course_ids'])
+        category_ids = features['category_ids']
+
+        # 미충족 졸업요건 카테고리 우선순위
+        priority = np.zeros(n, dtype=np.float64)
+        if criteria.priority_map and n:
+            keys = np.array(sorted(criteria.priority_map), dtype=np.int64)
+            values = np.array([criteria.priority_map[key] for key in keys], dtype=np.float64)
+            positions = np.minimum(np.searchsorted(keys, category_ids), len(keys) - 1)
+            matched = keys[positions] == category_ids
+            priority[matched] = values[positions[matched]]
+            print(f"DEBUG: 졸업요건 우선순위 적용 과목 {int(matched.sum())}개")
+
+        # 교양 과목이 필요 학점보다 큰 경우 초과 학점 패널티
+        if criteria.missing_gen_sub and n:
+            categories, inverse = np.unique(features['effective_category'], return_inverse=True)
+            shortage = np.array(
+                [criteria.missing_gen_sub.get(category, 0) for category in categories], dtype=np.int64
+            )[inverse]
+            credits = features['credits']
+            excess = features['is_general'] & (shortage > 0) & (credits > shortage)
+            priority -= np.where(excess, (credits - shortage) * ScoringWeights.GENERAL_EXCESS_CREDIT_PENALTY, 0)
+            if excess.any():
+                print(f"DEBUG: 교양 초과 학점 패널티 적용 과목 {int(excess.sum())}개")
 
-        print("="*80 + "\n")
+        # 전공필수 과목에 추가 가중치
+        priority += np.where(features['major_required'], ScoringWeights.MAJOR_REQUIRED_BONUS, 0)
+        return np.trunc(priority).astype(np.int64)
+
+    def _preference_scores(self, features: Dict[str, np.ndarray], criteria: ScoreCriteria) -> np.ndarray:
+        """선호도 점수 배열 (_calculate_preference_score와 같은 계산)"""
+        n = len(features['course_ids'])
+        score = np.zeros(n, dtype=np.int64)
+        if not n:
+            return score
+
+        # 선호/기피 교수 (교수명 부분 일치, 여러 명이 일치해도 한 번만 반영)
+        instructors = features['instructors']
+        has_instructor = instructors != ''
+        preferred = _contains_any(instructors, criteria.preferred_instructors) & has_instructor
+        avoided = _contains_any(instructors, criteria.avoid_instructors) & has_instructor
+        score += np.where(preferred, ScoringWeights.PREFERRED_INSTRUCTOR_BONUS, 0)
+        score += np.where(avoided, ScoringWeights.AVOIDED_INSTRUCTOR_PENALTY, 0)
+
+        # 선호 과목 (대소문자 무시 부분 일치)
+        names = features['course_names']
+        preferred_course = _contains_any(np.char.lower(names), [name.lower() for name in criteria.preferred_courses])
+        score += np.where(preferred_course, ScoringWeights.PREFERRED_COURSE_BONUS, 0)
+
+        # 교양 과목 태그: 하나라도 매칭되면 보너스, 아니면 감점
+        if criteria.preference_tags:
+            tag_matched = self._tag_match_matrix(names, criteria.preference_tags).any(axis=1)
+            score += np.where(
+                features['is_general'],
+                np.where(tag_matched, ScoringWeights.TAG_MATCH_BONUS, ScoringWeights.TAG_MISMATCH_PENALTY),
+                0
+            )
+
+        print(
+            f"DEBUG: 선호도 매칭 - 선호 교수 {int(preferred.sum())}개, 기피 교수 {int(avoided.sum())}개, "
+            f"선호 과목 {int(preferred_course.sum())}개"
+        )
+
+        # 시간대 선호도 (Soft Constraint: 오전/오후 교시 비율 기반 점수)
+        if criteria.prefer_morning or criteria.prefer_afternoon:
+            score += self._time_preference_scores(features, criteria)
+
+        return score
+
+    @staticmethod
+    def _tag_match_matrix(names: np.ndarray, tags: List[str]) -> np.ndarray:
+        """과목 × 태그 매칭 행렬 (TAG_FILTERS에 없는 태그는 제외, 같은 과목명은 한 번만 판정)"""
+        tags = [tag for tag in tags if tag in TAG_FILTERS]
+        unique_names, inverse = np.unique(names, return_inverse=True)
+        matrix = np.array(
+            [[bool(TAG_FILTERS[tag](name)) for tag in tags] for name in unique_names], dtype=bool
+        ).reshape(len(unique_names), len(tags))
+        return matrix[inverse]
+
+    @staticmethod
+    def _time_preference_scores(features: Dict[str, np.ndarray], criteria: ScoreCriteria) -> np.ndarray:
+        """오전/오후 선호 점수 배열 (선호 시간대 비율 구간 점수)"""
+        morning = features['morning_count']
+        afternoon = features['afternoon_count']
+        total = morning + afternoon
+        has_time = total > 0
+
+        preferred_count = morning if criteria.prefer_morning else afternoon
+        ratio = np.divide(preferred_count, total, out=np.zeros(len(total)), where=has_time)
+
+        # _calculate_preference_score는 get_effective_general_category(course) is not None으로
+        # 교양 여부를 판정하므로 (빈 문자열도 해당) 모든 과목에 교양 구간 점수가 적용됨 → 같은 결과 유지
+        general_score = np.where(ratio >= 0.8, 200, np.where(ratio >= 0.5, 100, -100))
+        return np.where(has_time, general_score, 0)
+
+    def _rating_scores(self, features: Dict[str, np.ndarray], criteria: ScoreCriteria) -> np.ndarray:
+        """평점 점수 배열 (_calculate_rating_score와 같은 계산)"""
+        summaries = criteria.review_summaries
+        avg_rating = np.array(
+            [
+                float(summaries[(name, instructor)].avg_rating)
+                if name and instructor and (name, instructor) in summaries else np.nan
+                for name, instructor in zip(features['course_names'].tolist(), features['instructors'].tolist())
+            ],
+            dtype=np.float64
+        )
+        has_rating = ~np.isnan(avg_rating)
+        if has_rating.any():
+            print(f"DEBUG: 평점 적용 과목 {int(has_rating.sum())}개")
+
+        rating_score = np.select(
+            [avg_rating >= 4.5, avg_rating >= 4.0, avg_rating >= 3.5, avg_rating >= 3.0, avg_rating >= 2.0, avg_rating >= 1.5],
+            [
+                ScoringWeights.RATING_4_5_PLUS, ScoringWeights.RATING_4_0_PLUS, ScoringWeights.RATING_3_5_PLUS,
+                ScoringWeights.RATING_3_0_PLUS, ScoringWeights.RATING_2_0_TO_3_0, ScoringWeights.RATING_1_5_TO_2_0
+            ],
+            default=ScoringWeights.RATING_BELOW_1_5
+        )
+        return np.where(has_rating, rating_score, 0).astype(np.int64)
+
+    def _print_score_summary(self, courses: List[Courses], scores: CourseScoreArrays) -> None:
+        """점수가 부여된 과목 요약 출력 (총점 상위 20개)"""
+        total = scores.total
+        scored = np.flatnonzero(total != 0)
+        if not len(scored):
+            return
+
+        print("\n📈 점수가 부여된 과목 요약 (상위 20개)")
+        print("-" * 100)
+        print(f"{'과목명':30} {'교수':15} {'카테고리':10} {'졸업':>6} {'선호':>6} {'평점':>6} {'합계':>8}")
+        print("-" * 100)
+
+        # 총점 기준 정렬 (동점은 입력 순서 유지)
+        ranked = scored[np.argsort(-total[scored], kind='stable')]
+        for index in ranked[:20]:
+            course = courses[index]
+            category = course.category.category_name if course.category else 'N/A'
+            print(f"{course.course_name[:30]:30} "
+                  f"{(course.instructor_name or 'N/A')[:15]:15} "
+                  f"{category[:10]:10} "
+                  f"{int(scores.graduation_priority[index]):6d} "
+                  f"{int(scores.preference_score[index]):6d} "
+                  f"{int(scores.rating_score[index]):6d} "
+                  f"{int(total[index]):8d}")
+
+        if len(scored) > 20:
+            print(f"... 외 {len(scored) - 20}개 과목")
+
+        print("-" * 100)
+        print(f"총 {len(scored)}개 과목에 점수 부여됨")
 
     def _calculate_graduation_priority(
         self,
@@ -100,7 +283,7 @@ class CourseScorer:
         criteria: ScoreCriteria
     ) -> int:
         """
-        졸업요건 기반 우선순위 점수 계산
+        졸업요건 기반 우선순위 점수 계산 (과목 하나 기준, 배열 계산 검증용)
 
         Args:
             course: 과목
@@ -138,7 +321,7 @@ class CourseScorer:
         criteria: ScoreCriteria
     ) -> int:
         """
-        선호도 기반 점수 계산
+        선호도 기반 점수 계산 (과목 하나 기준, 배열 계산 검증용)
 
         Args:
             course: 과목
@@ -273,7 +456,7 @@ class CourseScorer:
         criteria: ScoreCriteria
     ) -> int:
         """
-        평점 기반 점수 계산
+        평점 기반 점수 계산 (과목 하나 기준, 배열 계산 검증용)
 
         Args:
             course: 과목
@@ -332,135 +515,252 @@ class CourseScorer:
         matched_prefs = {'instructors': 0, 'courses': 0, 'avoided': 0}
 
         for course in timetable:
-            instructor = course.get('instructor_name', '')
-            course_name = course.get('course_name', '')
-
-            # 선호 교수 점수
-            if instructor and criteria.preferred_instructors:
-                for pref in criteria.preferred_instructors:
-                    if pref in instructor:
-                        score += ScoringWeights.PREFERRED_INSTRUCTOR_BONUS
-                        matched_prefs['instructors'] += 1
-                        print(f"  DEBUG: 선호 교수 매칭 +{ScoringWeights.PREFERRED_INSTRUCTOR_BONUS}: {course_name} ({instructor})")
-
-            # 기피 교수 감점
-            if instructor and criteria.avoid_instructors:
-                for avoid in criteria.avoid_instructors:
-                    if avoid in instructor:
-                        score += ScoringWeights.AVOIDED_INSTRUCTOR_PENALTY
-                        matched_prefs['avoided'] += 1
-                        print(f"  DEBUG: 기피 교수 발견 {ScoringWeights.AVOIDED_INSTRUCTOR_PENALTY}: {course_name} ({instructor})")
-
-            # 선호 과목 점수
-            if criteria.preferred_courses:
-                for pref in criteria.preferred_courses:
-                    if pref.lower() in course_name.lower():
-                        score += ScoringWeights.PREFERRED_COURSE_BONUS
-                        matched_prefs['courses'] += 1
-                        print(f"  DEBUG: 선호 과목 매칭 +{ScoringWeights.PREFERRED_COURSE_BONUS}: {course_name}")
-
-            # 기피 과목 감점
-            if criteria.avoid_courses:
-                for avoid in criteria.avoid_courses:
-                    if avoid.lower() in course_name.lower():
-                        score += ScoringWeights.AVOIDED_COURSE_PENALTY
-                        matched_prefs['avoided'] += 1
-                        print(f"  DEBUG: 기피 과목 발견 {ScoringWeights.AVOIDED_COURSE_PENALTY}: {course_name}")
-
-            # 시간대 선호도 (Soft Constraint: 점수 기반 조정)
-            if criteria.prefer_morning or criteria.prefer_afternoon:
-                schedules = course.get('schedules', [])
-                morning_count = 0
-                afternoon_count = 0
-                category = course.get('category_name', '')
-
-                for sch in schedules:
-                    times = sch.get('times', '')
-                    if times:
-                        time_slots = parse_time_slots(times, add_base_hour=True)
-                        for hour in time_slots:
-                                if hour < MORNING_END_HOUR:
-                                    morning_count += 1
-                                else:
-                                    afternoon_count += 1
-
-                # 교양 과목 여부 확인
-                is_general_education = category not in ['전공필수', '전공선택', '일선']
-
-                # 디버그: 과목별 시간대 분포
-                total_hours = morning_count + afternoon_count
-                if total_hours > 0:
-                    if criteria.prefer_morning:
-                        morning_ratio = morning_count / total_hours
-
-                        # 교양 과목: 그라데이션 점수 (Hard Constraint 제거, Soft Constraint로 전환)
-                        if is_general_education:
-                            if morning_ratio >= 0.8:
-                                # 오전 80% 이상: 강한 보너스 (3000 → 200)
-                                bonus = 200
-                                print(f"  DEBUG: 오전 교양 강한 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
-                                score += bonus
-                            elif morning_ratio >= 0.5:
-                                # 오전 50-80%: 약한 보너스
-                                bonus = 100
-                                print(f"  DEBUG: 오전 교양 약한 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
-                                score += bonus
+            course_score, course_matched = self.calculate_course_preference_contribution(course, criteria)
+            score += course_score
+            for key, count in course_matched.items():
+                matched_prefs[key] += count
+
+        return score, matched_prefs
+
+    def calculate_candidate_preference_bonuses(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        criteria: ScoreCriteria
+    ) -> Dict[int, int]:
+        """
+        후보 과목별 시간표 선호도 기여 점수 계산
+
+        시간표 선호도 점수는 과목별 기여의 합이므로, 후보 과목마다 한 번만 계산해
+        목적함수에 포함하거나 시간표 점수를 합산하는 데 사용할 수 있다.
+
+        Args:
+            candidate_data: 후보 과목 데이터 리스트
+            criteria: 점수 계산 기준
+
+        Returns:
+            {과목 ID: 선호도 기여 점수} 딕셔너리
+        """
+        return {
+            cid: score
+            for cid, (score, _) in self.calculate_candidate_preference_contributions(candidate_data, criteria).items()
+        }
+
+    def calculate_candidate_preference_contributions(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        criteria: ScoreCriteria
+    ) -> Dict[int, tuple[int, Dict[str, int]]]:
+        """
+        후보 과목별 선호도 기여 점수와 매칭 정보
+        과목 ID 목록만으로 calculate_timetable_preference_score()와 같은 결과를 합산할 수 있도록 함
+
+        Returns:
+            {과목 ID: (선호도 기여 점수, 매칭 정보)} 딕셔너리
+        """
+        contributions = {}
+        for data in candidate_data:
+            course = {
+                'instructor_name': data.get('instructor_name', ''),
+                'course_name': data.get('course_name', ''),
+                'category_name': data.get('category', ''),
+                'schedules': data.get('schedule', [])
+            }
+            contributions[data['id']] = self.calculate_course_preference_contribution(
+                course, criteria, verbose=False
+            )
+        return contributions
+
+    def calculate_solution_preference_scores(
+        self,
+        solutions: Sequence[Sequence[int]],
+        contributions: Dict[int, tuple[int, Dict[str, int]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        여러 시간표(과목 ID 목록)의 선호도 점수를 한 번에 계산
+
+        모든 시간표의 과목을 한 줄로 이어 붙여 과목별 (점수, 매칭 수)를 모은 뒤 시간표 구간별로 합산
+        (np.add.reduceat, 시간표 × 후보 과목 밀집 행렬을 만들지 않음)
+        calculate_timetable_preference_score()를 시간표마다 호출한 것과 같은 값을 계산
+
+        Args:
+            solutions: 시간표별 과목 ID 목록
+            contributions: calculate_candidate_preference_contributions() 결과
+
+        Returns:
+            (시간표별 점수 배열 (n,), 시간표별 매칭 수 배열 (n, 3): instructors/courses/avoided 순)
+        """
+        column = {cid: idx for idx, cid in enumerate(contributions)}
+        weights = np.array(
+            [
+                (score, matched['instructors'], matched['courses'], matched['avoided'])
+                for score, matched in contributions.values()
+            ],
+            dtype=np.int64
+        ).reshape(len(column), 4)
+
+        lengths = np.fromiter((len(course_ids) for course_ids in solutions), dtype=np.int64, count=len(solutions))
+        columns = np.fromiter(
+            (column[cid] for course_ids in solutions for cid in course_ids), dtype=np.int64, count=int(lengths.sum())
+        )
+
+        # 과목이 없는 시간표는 0 (reduceat은 빈 구간에 다음 원소를 반환하므로 제외하고 합산)
+        totals = np.zeros((len(solutions), 4), dtype=np.int64)
+        nonempty = lengths > 0
+        if nonempty.any():
+            offsets = np.cumsum(lengths) - lengths
+            totals[nonempty] = np.add.reduceat(weights[columns], offsets[nonempty], axis=0)
+        return totals[:, 0], totals[:, 1:]
+
+    def calculate_course_preference_contribution(
+        self,
+        course: Dict[str, Any],
+        criteria: ScoreCriteria,
+        verbose: bool = True
+    ) -> tuple[int, Dict[str, int]]:
+        """
+        시간표에 포함된 과목 하나의 선호도 기여 점수 계산
+
+        Args:
+            course: 시간표 과목 딕셔너리
+            criteria: 점수 계산 기준
+            verbose: 매칭 디버그 출력 여부
+
+        Returns:
+            (점수, 매칭 정보) 튜플
+        """
+        log = print if verbose else (lambda *args, **kwargs: None)
+        score = 0
+        matched_prefs = {'instructors': 0, 'courses': 0, 'avoided': 0}
+
+        instructor = course.get('instructor_name', '')
+        course_name = course.get('course_name', '')
+
+        # 선호 교수 점수
+        if instructor and criteria.preferred_instructors:
+            for pref in criteria.preferred_instructors:
+                if pref in instructor:
+                    score += ScoringWeights.PREFERRED_INSTRUCTOR_BONUS
+                    matched_prefs['instructors'] += 1
+                    log(f"  DEBUG: 선호 교수 매칭 +{ScoringWeights.PREFERRED_INSTRUCTOR_BONUS}: {course_name} ({instructor})")
+
+        # 기피 교수 감점
+        if instructor and criteria.avoid_instructors:
+            for avoid in criteria.avoid_instructors:
+                if avoid in instructor:
+                    score += ScoringWeights.AVOIDED_INSTRUCTOR_PENALTY
+                    matched_prefs['avoided'] += 1
+                    log(f"  DEBUG: 기피 교수 발견 {ScoringWeights.AVOIDED_INSTRUCTOR_PENALTY}: {course_name} ({instructor})")
+
+        # 선호 과목 점수
+        if criteria.preferred_courses:
+            for pref in criteria.preferred_courses:
+                if pref.lower() in course_name.lower():
+                    score += ScoringWeights.PREFERRED_COURSE_BONUS
+                    matched_prefs['courses'] += 1
+                    log(f"  DEBUG: 선호 과목 매칭 +{ScoringWeights.PREFERRED_COURSE_BONUS}: {course_name}")
+
+        # 기피 과목 감점
+        if criteria.avoid_courses:
+            for avoid in criteria.avoid_courses:
+                if avoid.lower() in course_name.lower():
+                    score += ScoringWeights.AVOIDED_COURSE_PENALTY
+                    matched_prefs['avoided'] += 1
+                    log(f"  DEBUG: 기피 과목 발견 {ScoringWeights.AVOIDED_COURSE_PENALTY}: {course_name}")
+
+        # 시간대 선호도 (Soft Constraint: 점수 기반 조정)
+        if criteria.prefer_morning or criteria.prefer_afternoon:
+            schedules = course.get('schedules', [])
+            morning_count = 0
+            afternoon_count = 0
+            category = course.get('category_name', '')
+
+            for sch in schedules:
+                times = sch.get('times', '')
+                if times:
+                    time_slots = parse_time_slots(times, add_base_hour=True)
+                    for hour in time_slots:
+                            if hour < MORNING_END_HOUR:
+                                morning_count += 1
                             else:
-                                # 오전 50% 미만: 합리적 패널티 (-5000 → -100)
-                                penalty = -100
-                                print(f"  DEBUG: 오전 선호 - 오후 교양 합리적 패널티 {penalty}: {course_name} (오전 {morning_ratio:.0%})")
-                                score += penalty
+                                afternoon_count += 1
+
+            # 교양 과목 여부 확인
+            is_general_education = category not in ['전공필수', '전공선택', '일선']
+
+            # 디버그: 과목별 시간대 분포
+            total_hours = morning_count + afternoon_count
+            if total_hours > 0:
+                if criteria.prefer_morning:
+                    morning_ratio = morning_count / total_hours
+
+                    # 교양 과목: 그라데이션 점수 (Hard Constraint 제거, Soft Constraint로 전환)
+                    if is_general_education:
+                        if morning_ratio >= 0.8:
+                            # 오전 80% 이상: 강한 보너스 (3000 → 200)
+                            bonus = 200
+                            log(f"  DEBUG: 오전 교양 강한 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
+                            score += bonus
+                        elif morning_ratio >= 0.5:
+                            # 오전 50-80%: 약한 보너스
+                            bonus = 100
+                            log(f"  DEBUG: 오전 교양 약한 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
+                            score += bonus
                         else:
-                            # 전공 과목: 기존 로직 유지 (졸업요건 우선)
-                            if morning_ratio >= 0.9:
-                                bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS * 2
-                                print(f"  DEBUG: 오전 과목 강한 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
-                                score += bonus
-                            elif morning_ratio > 0.5:
-                                bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS
-                                score += bonus
-                                print(f"  DEBUG: 오전 선호 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
-                            else:
-                                # 전공은 시간대 페널티 최소화 (졸업요건 우선)
-                                penalty = -20
-                                print(f"  DEBUG: 오전 선호 - 오후 전공 약한 패널티 {penalty}: {course_name}")
-                                score += penalty
-
-                    elif criteria.prefer_afternoon:
-                        afternoon_ratio = afternoon_count / total_hours
-
-                        # 교양 과목: 그라데이션 점수 (Hard Constraint 제거, Soft Constraint로 전환)
-                        if is_general_education:
-                            if afternoon_ratio >= 0.8:
-                                # 오후 80% 이상: 강한 보너스 (3000 → 200)
-                                bonus = 200
-                                print(f"  DEBUG: 오후 교양 강한 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
-                                score += bonus
-                            elif afternoon_ratio >= 0.5:
-                                # 오후 50-80%: 약한 보너스
-                                bonus = 100
-                                print(f"  DEBUG: 오후 교양 약한 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
-                                score += bonus
-                            else:
-                                # 오후 50% 미만: 합리적 패널티 (-5000 → -100)
-                                penalty = -100
-                                print(f"  DEBUG: 오후 선호 - 오전 교양 합리적 패널티 {penalty}: {course_name} (오후 {afternoon_ratio:.0%})")
-                                score += penalty
+                            # 오전 50% 미만: 합리적 패널티 (-5000 → -100)
+                            penalty = -100
+                            log(f"  DEBUG: 오전 선호 - 오후 교양 합리적 패널티 {penalty}: {course_name} (오전 {morning_ratio:.0%})")
+                            score += penalty
+                    else:
+                        # 전공 과목: 기존 로직 유지 (졸업요건 우선)
+                        if morning_ratio >= 0.9:
+                            bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS * 2
+                            log(f"  DEBUG: 오전 과목 강한 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
+                            score += bonus
+                        elif morning_ratio > 0.5:
+                            bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS
+                            score += bonus
+                            log(f"  DEBUG: 오전 선호 보너스 +{bonus}: {course_name} (오전 {morning_ratio:.0%})")
                         else:
-                            # 전공 과목: 기존 로직 유지 (졸업요건 우선)
-                            if afternoon_ratio >= 0.9:
-                                bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS * 2
-                                print(f"  DEBUG: 오후 과목 강한 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
-                                score += bonus
-                            elif afternoon_ratio > 0.5:
-                                bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS
-                                score += bonus
-                                print(f"  DEBUG: 오후 선호 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
-                            else:
-                                # 전공은 시간대 페널티 최소화 (졸업요건 우선)
-                                penalty = -20
-                                print(f"  DEBUG: 오후 선호 - 오전 전공 약한 패널티 {penalty}: {course_name}")
-                                score += penalty
+                            # 전공은 시간대 페널티 최소화 (졸업요건 우선)
+                            penalty = -20
+                            log(f"  DEBUG: 오전 선호 - 오후 전공 약한 패널티 {penalty}: {course_name}")
+                            score += penalty
+
+                elif criteria.prefer_afternoon:
+                    afternoon_ratio = afternoon_count / total_hours
+
+                    # 교양 과목: 그라데이션 점수 (Hard Constraint 제거, Soft Constraint로 전환)
+                    if is_general_education:
+                        if afternoon_ratio >= 0.8:
+                            # 오후 80% 이상: 강한 보너스 (3000 → 200)
+                            bonus = 200
+                            log(f"  DEBUG: 오후 교양 강한 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
+                            score += bonus
+                        elif afternoon_ratio >= 0.5:
+                            # 오후 50-80%: 약한 보너스
+                            bonus = 100
+                            log(f"  DEBUG: 오후 교양 약한 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
+                            score += bonus
+                        else:
+                            # 오후 50% 미만: 합리적 패널티 (-5000 → -100)
+                            penalty = -100
+                            log(f"  DEBUG: 오후 선호 - 오전 교양 합리적 패널티 {penalty}: {course_name} (오후 {afternoon_ratio:.0%})")
+                            score += penalty
+                    else:
+                        # 전공 과목: 기존 로직 유지 (졸업요건 우선)
+                        if afternoon_ratio >= 0.9:
+                            bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS * 2
+                            log(f"  DEBUG: 오후 과목 강한 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
+                            score += bonus
+                        elif afternoon_ratio > 0.5:
+                            bonus = ScoringWeights.TIME_SLOT_PREFERENCE_BONUS
+                            score += bonus
+                            log(f"  DEBUG: 오후 선호 보너스 +{bonus}: {course_name} (오후 {afternoon_ratio:.0%})")
+                        else:
+                            # 전공은 시간대 페널티 최소화 (졸업요건 우선)
+                            penalty = -20
+                            log(f"  DEBUG: 오후 선호 - 오전 전공 약한 패널티 {penalty}: {course_name}")
+                            score += penalty
 
         return score, matched_prefs
 
@@ -0,0 +1,137 @@
+"""
+CP-SAT 모델 캐시 서비스
+Phase 1/2는 모델을 복제해서 제약·힌트를 추가하므로 구성된 모델은 변경되지 않음.
+같은 후보 과목과 제약 조건으로 다시 생성하는 경우(최적화 수준 변경, 재시도 등) 모델 구성을 건너뛰고 재사용
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional, Tuple
+
+from ortools.sat.python import cp_model
+
+from ..views.timetable_types import ConstraintData, ConflictSkeleton
+from ..views.timetable_config import SolverParameters
+from .timetable_optimizer import ModelBuilder
+
+
+# 모델 구성에 쓰이는 후보 과목 필드 (나머지 필드는 결과 표시용)
+MODEL_FIELDS = (
+    'id', 'course_name', 'credit', 'year', 'category', 'effective_category', 'buildings',
+    'pre_added', 'is_same_year', 'graduation_priority', 'preference_score', 'rating_score'
+)
+
+
+class ModelCache:
+    """
+    구성된 CP-SAT 모델 LRU 캐시 (싱글톤)
+    캐시된 모델은 여러 요청이 공유하므로 호출자는 모델을 직접 변경하지 않아야 함 (SolutionFinder는 복제본을 변경)
+    """
+
+    _instance: Optional['ModelCache'] = None
+
+    def __new__(cls):
+        """싱글톤 인스턴스 생성"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
+        self._lock = threading.Lock()
+        # 캐시 키 -> (건물 거리 데이터, 모델, 변수 딕셔너리, 목적함수 표현식, 충돌 제약 통계, 목적함수 통계)
+        self._entries: 'OrderedDict[str, Tuple]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(
+        self,
+        model_builder: ModelBuilder,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        skeleton: Optional[ConflictSkeleton] = None
+    ) -> Tuple[cp_model.CpModel, Dict[int, cp_model.IntVar], Any]:
+        """
+        캐시된 모델 반환 (없으면 model_builder.build_model()로 구성 후 저장)
+
+        Returns:
+            (모델, 변수 딕셔너리, 목적함수 표현식) 튜플
+        """
+        if not SolverParameters.ENABLE_MODEL_CACHE:
+            return model_builder.build_model(candidate_data, constraints, skeleton)
+
+        key = self._cache_key(model_builder, candidate_data, constraints, skeleton)
+        # 골격이 없으면 이동시간 제약이 건물 거리 캐시에서 계산되므로, 거리 데이터가 바뀌면 재구성
+        distance_source = model_builder.building_service.cache_token
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is distance_source:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                _, model, x, objective_expr, conflict_stats, objective_stats = entry
+                model_builder.last_conflict_stats = conflict_stats
+                model_builder.last_objective_stats = objective_stats
+                print(f"DEBUG: 모델 캐시 적중 - 후보 {len(x)}개 (적중 {self.hits}회 / 구성 {self.misses}회)")
+                return model, x, objective_expr
+
+        model, x, objective_expr = model_builder.build_model(candidate_data, constraints, skeleton)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = (
+                distance_source, model, x, objective_expr,
+                model_builder.last_conflict_stats, model_builder.last_objective_stats
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > SolverParameters.MODEL_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+        return model, x, objective_expr
+
+    def clear(self) -> None:
+        """캐시 초기화"""
+        with self._lock:
+            self._entries = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+
+    @staticmethod
+    def _cache_key(
+        model_builder: ModelBuilder,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        skeleton: Optional[ConflictSkeleton]
+    ) -> str:
+        """후보 과목(모델 구성 필드), 제약 조건, 인코딩 방식, 골격 지문으로 만든 키"""
+        courses = [
+            (
+                tuple(_freeze(data.get(name)) for name in MODEL_FIELDS),
+                tuple((sched['day'], sched['times']) for sched in data['schedule'])
+            )
+            for data in candidate_data
+        ]
+        payload = repr((
+            courses,
+            _freeze(asdict(constraints)),
+            model_builder.compactness_encoding,
+            model_builder.conflict_encoding,
+            SolverParameters.ENABLE_OBJECTIVE_COMPILER,
+            skeleton.fingerprint if skeleton is not None else None,
+        ))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _freeze(value: Any) -> Any:
+    """딕셔너리/리스트를 순서가 고정된 튜플로 변환 (캐시 키용)"""
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
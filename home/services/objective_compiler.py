@@ -0,0 +1,55 @@
+"""
+목적함수 계수 정규화 서비스
+ScoringWeights 가중치를 곱한 목적함수 계수(수천~수백만)를 최대공약수로 나누어 작은 정수 범위로 줄이고,
+CP-SAT 목적함수 배율(scaling_factor)에 그 값을 곱해 ObjectiveValue()가 원래 단위로 나오도록 함
+"""
+
+import math
+from typing import Dict
+
+from ortools.sat.python import cp_model
+
+from ..views.timetable_config import SolverParameters
+
+
+class ObjectiveCompiler:
+    """모델에 설정된 목적함수 계수를 최대공약수로 축소"""
+
+    def compile(self, model: cp_model.CpModel) -> Dict[str, int]:
+        """
+        model.Maximize()/Minimize() 이후 호출하여 목적함수 계수를 제자리에서 축소
+
+        모든 계수를 같은 양의 정수로 나누므로 해의 순위는 그대로 유지되고,
+        나눈 값은 scaling_factor에 곱해져 ObjectiveValue()/BestObjectiveBound()는 원래 단위로 반환됨.
+        목적함수 표현식(Value(objective_expr), objective_expr >= 하한 제약)은 원래 단위를 그대로 사용
+
+        Returns:
+            {'terms': 항 수, 'divisor': 나눈 값, 'max_coeff_before': ..., 'max_coeff_after': ...}
+        """
+        objective = model.Proto().objective
+        coeffs = list(objective.coeffs)
+        max_before = max((abs(c) for c in coeffs), default=0)
+        stats = {
+            'terms': len(coeffs),
+            'divisor': 1,
+            'max_coeff_before': max_before,
+            'max_coeff_after': max_before,
+        }
+        if not coeffs or not SolverParameters.ENABLE_OBJECTIVE_COMPILER:
+            return stats
+
+        divisor = 0
+        for coef in coeffs:
+            divisor = math.gcd(divisor, abs(coef))
+            if divisor == 1:
+                return stats
+
+        objective.coeffs[:] = [coef // divisor for coef in coeffs]
+        objective.offset /= divisor
+        objective.scaling_factor = (objective.scaling_factor or 1.0) * divisor
+
+        stats['divisor'] = divisor
+        stats['max_coeff_after'] = max_before // divisor
+        print(f"DEBUG: 목적함수 계수 정규화 - 항 {len(coeffs)}개, "
+              f"최대 계수 {max_before:,} → {max_before // divisor:,} (÷{divisor:,})")
+        return stats
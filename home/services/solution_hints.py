@@ -0,0 +1,171 @@
+"""
+CP-SAT 웜 스타트 힌트 서비스
+사용자의 직전 생성 결과, 저장된 시간표, 탐욕적 휴리스틱 순으로 Phase 1 힌트를 구성
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from collections import defaultdict
+
+from data_manager.models import SavedTimetable, SavedTimetableCourse
+from ..models import LastGeneratedTimetable
+
+from ..views.timetable_types import ConstraintData
+from ..views.timetable_config import (
+    CURRENT_YEAR, CURRENT_TERM,
+    MAJOR_CATEGORIES
+)
+from ..utils import parse_time_slots
+
+
+class SolutionHintProvider:
+    """Phase 1 솔루션 힌트 제공자"""
+
+    def remember_result(self, user_id: Optional[int], course_ids: List[int]) -> None:
+        """
+        생성된 최상위 시간표를 다음 요청의 힌트로 저장
+        솔버 워커 프로세스가 여러 개여도 같은 결과를 보도록 DB(LastGeneratedTimetable)에 upsert 한 번으로 기록
+        """
+        if user_id is None or not course_ids:
+            return
+        LastGeneratedTimetable.objects.bulk_create(
+            [LastGeneratedTimetable(user_id=user_id, course_ids=list(course_ids))],
+            update_conflicts=True,
+            unique_fields=['user_id'],
+            update_fields=['course_ids', 'updated_at']
+        )
+
+    def get_hint(
+        self,
+        user_id: int,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        id_aliases: Optional[Dict[int, int]] = None
+    ) -> Tuple[Optional[str], List[int]]:
+        """
+        힌트로 사용할 과목 ID 목록 반환
+
+        Args:
+            user_id: 사용자 ID
+            candidate_data: 후보 과목 데이터 (솔버에 전달되는 목록)
+            constraints: 학점 제약 조건 (탐욕적 힌트 구성용)
+            id_aliases: 병합된 분반 ID -> 대표 과목 ID 매핑
+
+        Returns:
+            (힌트 출처, 과목 ID 리스트). 힌트가 없으면 (None, [])
+        """
+        candidate_ids = {data['id'] for data in candidate_data}
+        aliases = id_aliases or {}
+
+        sources = (
+            ('last_result', lambda: self._load_last_result_ids(user_id)),
+            ('saved_timetable', lambda: self._load_saved_timetable_ids(user_id)),
+        )
+        for source, loader in sources:
+            hint_ids = self._map_to_candidates(loader(), candidate_ids, aliases)
+            if hint_ids:
+                print(f"DEBUG: 힌트 출처 = {source} ({len(hint_ids)}개 과목)")
+                return source, hint_ids
+
+        hint_ids = self.build_greedy_hint(candidate_data, constraints)
+        if hint_ids:
+            print(f"DEBUG: 힌트 출처 = greedy ({len(hint_ids)}개 과목)")
+            return 'greedy', hint_ids
+        return None, []
+
+    def _load_last_result_ids(self, user_id: Optional[int]) -> List[int]:
+        """직전 생성 결과의 과목 ID 로드"""
+        if user_id is None:
+            return []
+        return (
+            LastGeneratedTimetable.objects.filter(user_id=user_id)
+            .values_list('course_ids', flat=True)
+            .first()
+        ) or []
+
+    def _load_saved_timetable_ids(self, user_id: int) -> List[int]:
+        """이번 학기에 가장 최근 저장한 시간표의 과목 ID 로드"""
+        timetable = SavedTimetable.objects.filter(
+            user_id=user_id,
+            semester_year=CURRENT_YEAR,
+            semester_term=CURRENT_TERM
+        ).order_by('-created_at').first()
+        if not timetable:
+            return []
+
+        return list(
+            SavedTimetableCourse.objects.filter(
+                timetable=timetable,
+                course_id__isnull=False
+            ).values_list('course_id', flat=True)
+        )
+
+    def _map_to_candidates(
+        self,
+        course_ids: List[int],
+        candidate_ids: set,
+        aliases: Dict[int, int]
+    ) -> List[int]:
+        """힌트 과목 ID를 현재 후보 ID로 변환 (후보에 없는 과목은 제외)"""
+        mapped = []
+        for cid in course_ids:
+            cid = aliases.get(cid, cid)
+            if cid in candidate_ids and cid not in mapped:
+                mapped.append(cid)
+        return mapped
+
+    def build_greedy_hint(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData
+    ) -> List[int]:
+        """
+        탐욕적 휴리스틱 힌트
+        필수 과목을 먼저 담고, 점수가 높은 과목부터 시간 충돌과 학점 한도를 지키며 추가
+        """
+        def is_elective(data: Dict[str, Any]) -> bool:
+            return bool(data.get('effective_category')) or data['category'] not in MAJOR_CATEGORIES
+
+        def course_score(data: Dict[str, Any]) -> float:
+            return (data.get('graduation_priority', 0)
+                    + data.get('preference_score', 0)
+                    + data.get('rating_score', 0))
+
+        ordered = sorted(
+            candidate_data,
+            key=lambda d: (not d.get('pre_added', False), -course_score(d))
+        )
+
+        used_slots = set()
+        used_names = set()
+        credits = defaultdict(int)
+        selected = []
+
+        for data in ordered:
+            slots = {
+                (sched['day'], t)
+                for sched in data['schedule']
+                for t in parse_time_slots(sched['times'])
+            }
+            if slots & used_slots or data['course_name'] in used_names:
+                continue
+
+            credit = data['credit']
+            if not data.get('pre_added', False):
+                if credits['total'] + credit > constraints.target_total:
+                    continue
+                if is_elective(data):
+                    if credits['elective'] + credit > constraints.target_elective:
+                        continue
+                elif credits['major'] + credit > constraints.target_major:
+                    continue
+
+            selected.append(data['id'])
+            used_slots |= slots
+            used_names.add(data['course_name'])
+            credits['total'] += credit
+            credits['elective' if is_elective(data) else 'major'] += credit
+
+            if credits['total'] >= constraints.target_total:
+                break
+
+        return selected
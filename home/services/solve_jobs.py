@@ -0,0 +1,540 @@
+"""
+시간표 생성 작업 큐 서비스
+미리 fork한 워커 프로세스 풀에서 시간표 생성을 실행하고,
+웹 계층(SSE 뷰, Socket.IO)은 작업 등록과 진행 이벤트 조회만 담당
+"""
+
+import atexit
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+import traceback
+import uuid
+from typing import List, Dict, Any, Optional, Iterator
+
+from django.db import connections
+
+from ..views.timetable_types import TimetableRequest, SolveJob
+from ..views.timetable_config import SolverParameters
+from .cancellation import CancellationToken, GenerationCancelled
+from .solver_threads import SolverThreadAllocator
+
+
+# 작업이 끝났음을 나타내는 이벤트 단계
+TERMINAL_STAGES = ('done', 'error', 'cancelled')
+
+# 작업 ID 길이 (uuid4().hex, 워커별 취소 작업 ID 공유 버퍼 크기)
+JOB_ID_LENGTH = 32
+
+
+class SolveQueueFullError(Exception):
+    """대기 및 실행 중인 작업 수가 JOB_MAX_QUEUE_DEPTH에 도달함"""
+
+
+class _JobCancelSignal:
+    """
+    워커별 공유 "취소된 작업 ID" 값을 특정 작업 기준으로 보는 취소 이벤트
+    (CancellationToken이 감싸는 Event와 같은 set/is_set 인터페이스)
+    관리자가 기록한 작업 ID가 이 작업과 같을 때만 취소로 보므로,
+    워커가 이미 다음 작업으로 넘어간 뒤 이전 작업에 대한 취소가 도착해도 다음 작업은 중단되지 않음
+    """
+
+    def __init__(self, cancelled_job_id: Any, job_id: str):
+        self._cancelled_job_id = cancelled_job_id
+        self._job_id = job_id.encode('ascii')
+
+    def set(self) -> None:
+        self._cancelled_job_id.value = self._job_id
+
+    def is_set(self) -> bool:
+        return self._cancelled_job_id.value == self._job_id
+
+
+def _worker_main(
+    worker_index: int,
+    connection: Any,
+    cancelled_job_id: Any
+) -> None:
+    """
+    워커 프로세스 본체
+    감독 프로세스와 연결된 전용 파이프에서 (job_id, user_id, 요청 파라미터)를 받아 시간표를 생성하고
+    진행 이벤트를 같은 파이프로 돌려보냄 (워커가 비정상 종료되어도 다른 워커와 공유하는 큐 잠금이 남지 않음)
+    """
+    from django.contrib.auth.models import User, AnonymousUser
+    from django.db import close_old_connections
+    from .timetable_generation_service import TimetableGenerationService
+
+    service = TimetableGenerationService()
+    # CP-SAT 솔루션 콜백 스레드에서도 진행 이벤트를 보내므로 파이프 쓰기를 직렬화
+    send_lock = threading.Lock()
+
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            break
+        if task is None:
+            break
+
+        job_id, user_id, request_params = task
+
+        def send(event: Dict[str, Any], job_id: str = job_id) -> None:
+            with send_lock:
+                connection.send((job_id, event))
+
+        # 작업 관리자가 cancelled_job_id에 이 작업 ID를 기록하면 단계 사이/탐색 중에 생성이 중단됨
+        cancel_token = CancellationToken(_JobCancelSignal(cancelled_job_id, job_id))
+        send({'progress': '진행중', 'stage': 'started', 'message': "시간표 생성 시작", 'worker': worker_index})
+
+        close_old_connections()
+        try:
+            user = User.objects.get(id=user_id) if user_id else AnonymousUser()
+            result = service.generate(user, request_params, progress_callback=send, cancel_token=cancel_token)
+            send({**result, 'stage': 'done'})
+        except GenerationCancelled:
+            print(f"DEBUG: 시간표 생성 작업 중단 - {job_id}")
+            send({'progress': '취소', 'stage': 'cancelled'})
+        except Exception as e:
+            traceback.print_exc()
+            send({'progress': '오류', 'stage': 'error', 'error': str(e)})
+
+
+def _supervisor_main(
+    worker_count: int,
+    task_connection: Any,
+    event_queue: multiprocessing.Queue,
+    cancelled_job_ids: List[Any],
+    stop_event: Any,
+    parent_pid: int
+) -> None:
+    """
+    워커 감독 프로세스 본체
+    웹 프로세스가 요청 스레드를 띄우기 전에 한 번 fork되어 다른 스레드나 DB 연결이 없으므로,
+    워커를 여기서 (재)fork하면 웹 프로세스의 다른 스레드가 가진 DB 연결을 물려받지 않음
+
+    작업 관리자의 작업 파이프를 읽는 것도, 이벤트 큐에 쓰는 것도 감독 프로세스뿐이고
+    워커와는 워커별 파이프로만 주고받음. 공유 큐를 워커가 직접 읽으면 작업을 기다리던 워커가
+    큐 읽기 잠금을 쥔 채 종료되어 재시작한 워커도 작업을 받지 못하기 때문
+    워커 종료는 sentinel로 바로 감지해 그 워커가 실행하던 작업 ID와 함께 worker_exited 이벤트로 알리고
+    (작업 관리자에는 job_id가 None인 worker_started / worker_exited 이벤트), 솔버 스레드 회수 후 재시작
+    아직 시작 이벤트를 보내지 않은 작업은 실패시키지 않고 다시 대기열 맨 앞에 둠
+    """
+    context = multiprocessing.get_context('fork')
+    # 아직 워커에 넘기지 못한 작업 (등록 순서)
+    pending: List[Any] = []
+
+    def spawn(index: int) -> Dict[str, Any]:
+        parent_end, child_end = context.Pipe()
+        process = context.Process(
+            target=_worker_main,
+            args=(index, child_end, cancelled_job_ids[index]),
+            name=f'solve-worker-{index}',
+            daemon=True
+        )
+        process.start()
+        child_end.close()
+        event_queue.put((None, {'stage': 'worker_started', 'worker': index, 'pid': process.pid}))
+        return {'process': process, 'connection': parent_end, 'task': None, 'started': False}
+
+    def relay(worker: Dict[str, Any]) -> None:
+        """워커 파이프에 도착한 이벤트를 작업 관리자로 전달 (종료 단계 이벤트면 워커는 다시 대기 상태)"""
+        try:
+            while worker['connection'].poll():
+                job_id, event = worker['connection'].recv()
+                event_queue.put((job_id, event))
+                if event.get('stage') == 'started':
+                    worker['started'] = True
+                elif event.get('stage') in TERMINAL_STAGES:
+                    worker['task'] = None
+        except (EOFError, OSError):
+            pass
+
+    workers: List[Dict[str, Any]] = [spawn(index) for index in range(worker_count)]
+    while not stop_event.is_set() and os.getppid() == parent_pid:
+        multiprocessing.connection.wait(
+            [task_connection]
+            + [worker['connection'] for worker in workers]
+            + [worker['process'].sentinel for worker in workers],
+            timeout=SolverParameters.JOB_SUPERVISOR_CHECK_INTERVAL
+        )
+
+        if task_connection.poll():
+            try:
+                pending.append(task_connection.recv())
+            except EOFError:
+                break
+
+        for index, worker in enumerate(workers):
+            process = worker['process']
+            # 종료 전에 보낸 이벤트(최종 결과 등)까지 전달한 뒤 종료 처리
+            alive = process.is_alive()
+            relay(worker)
+            if alive:
+                continue
+            print(f"WARNING: 시간표 생성 워커 {index} 종료됨 (exitcode={process.exitcode}) - 재시작")
+            job_id = None
+            if worker['task'] is not None:
+                if worker['started']:
+                    job_id = worker['task'][0]
+                else:
+                    # 시작하기 전에 종료된 워커에 넘긴 작업은 다른 워커가 처음부터 실행
+                    pending.insert(0, worker['task'])
+            event_queue.put((None, {
+                'stage': 'worker_exited', 'worker': index, 'pid': process.pid,
+                'exitcode': process.exitcode, 'job_id': job_id
+            }))
+            worker['connection'].close()
+            # 종료된 워커가 반환하지 못한 솔버 스레드 회수 (웹 프로세스의 작업 관리자 잠금과 무관)
+            SolverThreadAllocator().reclaim(process.pid)
+            workers[index] = spawn(index)
+
+        for worker in workers:
+            if pending and worker['task'] is None:
+                worker['task'] = pending.pop(0)
+                worker['started'] = False
+                worker['connection'].send(worker['task'])
+    # 반환하면 multiprocessing이 데몬 워커 프로세스를 종료시킴
+
+
+class SolveJobManager:
+    """
+    시간표 생성 작업 관리자 (싱글톤)
+    submit / poll / stream / cancel API 제공, 대기 작업 수는 JOB_MAX_QUEUE_DEPTH로 제한
+    """
+
+    _instance: Optional['SolveJobManager'] = None
+
+    def __new__(cls):
+        """싱글톤 인스턴스 생성"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+        self._condition = threading.Condition()
+        self._jobs: Dict[str, SolveJob] = {}
+        # 워커 상태 (감독 프로세스의 worker_started / worker_exited 이벤트로 갱신)
+        self._workers: List[Dict[str, Any]] = []
+        # 워커별 취소된 작업 ID (공유 메모리, 실행 중인 작업 ID와 같을 때만 중단)
+        self._cancelled_job_ids: List[Any] = []
+        self._context = None
+        self._task_connection = None
+        self._event_queue = None
+        self._supervisor = None
+        self._stop_event = None
+        self._started = False
+
+    def start(self) -> None:
+        """
+        워커 감독 프로세스와 워커 프로세스 풀 시작 (이미 시작되었으면 무시)
+        ortools와 Django 설정이 로드된 현재 프로세스를 fork하므로 워커는 바로 작업을 받을 수 있음
+        요청 스레드가 생기기 전(config/asgi.py)에 호출해야 감독 프로세스가 다른 스레드의 DB 연결을 물려받지 않음
+        """
+        with self._condition:
+            if self._started:
+                return
+            # 감독 프로세스가 현재 스레드의 DB 연결을 물려받아 공유하지 않도록 fork 전에 닫음
+            connections.close_all()
+            # 솔버 스레드 예산을 모든 워커가 공유하도록 fork 전에 공유 상태 생성
+            SolverThreadAllocator()
+            self._context = multiprocessing.get_context('fork')
+            task_reader, self._task_connection = self._context.Pipe(duplex=False)
+            self._event_queue = self._context.Queue()
+            self._stop_event = self._context.Event()
+            for index in range(SolverParameters.JOB_WORKER_PROCESSES):
+                # 잠금 없는 공유 버퍼 (워커가 읽는 도중 종료되어도 관리자의 취소 기록이 막히지 않음)
+                self._cancelled_job_ids.append(self._context.Array('c', JOB_ID_LENGTH, lock=False))
+                self._workers.append({'index': index, 'pid': None, 'alive': False})
+            self._supervisor = self._context.Process(
+                target=_supervisor_main,
+                args=(
+                    SolverParameters.JOB_WORKER_PROCESSES, task_reader, self._event_queue,
+                    self._cancelled_job_ids, self._stop_event, os.getpid()
+                ),
+                name='solve-worker-supervisor'
+            )
+            self._supervisor.start()
+            task_reader.close()
+            self._started = True
+
+        # 감독 프로세스는 데몬이 아니므로(워커를 fork해야 함) 종료 시 직접 정지
+        atexit.register(self.stop)
+        threading.Thread(target=self._dispatch_events, name='solve-job-dispatcher', daemon=True).start()
+        print(f"DEBUG: 시간표 생성 워커 {SolverParameters.JOB_WORKER_PROCESSES}개 시작")
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """워커 감독 프로세스와 워커 종료 (프로세스 종료 시 atexit로 호출)"""
+        if self._supervisor is None:
+            return
+        self._stop_event.set()
+        self._supervisor.join(timeout)
+        if self._supervisor.is_alive():
+            self._supervisor.terminate()
+
+    def submit(
+        self,
+        user_id: Optional[int],
+        request_params: TimetableRequest,
+        session_key: Optional[str] = None
+    ) -> str:
+        """
+        시간표 생성 작업 등록
+
+        Args:
+            user_id: 요청 사용자 ID (비로그인 사용자는 None)
+            request_params: 시간표 생성 요청 파라미터
+            session_key: 비로그인 사용자의 세션 키 (작업 소유자 확인용)
+
+        Returns:
+            작업 ID
+
+        Raises:
+            SolveQueueFullError: 대기 및 실행 중인 작업이 상한에 도달한 경우
+        """
+        self.start()
+
+        with self._condition:
+            self._expire_finished_jobs()
+
+            # 같은 사용자가 다시 요청하면 이전 작업은 더 이상 필요 없으므로 취소
+            if user_id is not None and SolverParameters.JOB_CANCEL_PREVIOUS_ON_SUBMIT:
+                for previous in list(self._jobs.values()):
+                    if previous.user_id == user_id and previous.status in ('queued', 'running'):
+                        self._cancel_locked(previous)
+
+            active = sum(1 for job in self._jobs.values() if job.status in ('queued', 'running'))
+            if active >= SolverParameters.JOB_MAX_QUEUE_DEPTH:
+                raise SolveQueueFullError(f"active jobs {active} >= {SolverParameters.JOB_MAX_QUEUE_DEPTH}")
+
+            job = SolveJob(
+                job_id=uuid.uuid4().hex, user_id=user_id,
+                session_key=session_key if user_id is None else None, created_at=time.time()
+            )
+            self._jobs[job.job_id] = job
+            # 여러 요청 스레드가 같은 파이프에 쓰므로 잠금 안에서 전송
+            self._task_connection.send((job.job_id, user_id, request_params))
+
+        print(f"DEBUG: 시간표 생성 작업 등록 - {job.job_id} (대기+실행 {active + 1}개)")
+        return job.job_id
+
+    def poll(
+        self,
+        job_id: str,
+        user_id: Optional[int],
+        session_key: Optional[str] = None,
+        cursor: int = 0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        작업 상태와 cursor 이후의 새 이벤트 조회 (대기하지 않음, 작업 소유자만 조회 가능)
+
+        Returns:
+            {'job_id', 'status', 'queue_position', 'events', 'cursor'}. 작업이 없거나 소유자가 다르면 None
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or not self._is_owner(job, user_id, session_key):
+                return None
+            return {
+                'job_id': job.job_id,
+                'status': job.status,
+                'queue_position': self._queue_position(job),
+                'events': job.events[cursor:],
+                'cursor': len(job.events)
+            }
+
+    def stream(
+        self,
+        job_id: str,
+        heartbeat: float = 1.0,
+        cancel_on_close: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        작업이 끝날 때까지 진행 이벤트를 순서대로 반환 (블로킹)
+
+        Args:
+            job_id: 작업 ID
+            heartbeat: 새 이벤트 대기 간격 (초)
+            cancel_on_close: 끝나기 전에 제너레이터가 닫히면(클라이언트 연결 종료) 작업 취소
+        """
+        cursor = 0
+        finished = False
+        try:
+            while not finished:
+                with self._condition:
+                    job = self._jobs.get(job_id)
+                    if job is None:
+                        finished = True
+                        break
+                    if len(job.events) <= cursor and job.status not in TERMINAL_STAGES:
+                        self._condition.wait(timeout=heartbeat)
+                    events = job.events[cursor:]
+                    cursor += len(events)
+                    finished = job.status in TERMINAL_STAGES and cursor >= len(job.events)
+
+                for event in events:
+                    yield event
+        finally:
+            if cancel_on_close and not finished:
+                with self._condition:
+                    job = self._jobs.get(job_id)
+                    if job is not None and job.status not in TERMINAL_STAGES:
+                        self._cancel_locked(job)
+
+    def wait(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업이 끝날 때까지 기다린 뒤 마지막 이벤트(최종 결과) 반환"""
+        last_event = None
+        for event in self.stream(job_id):
+            last_event = event
+        return last_event
+
+    def cancel(self, job_id: str, user_id: Optional[int], session_key: Optional[str] = None) -> bool:
+        """
+        작업 취소
+        대기 중인 작업은 실행되지 않으며, 실행 중인 작업은 워커에 작업 ID로 취소를 알려
+        CP-SAT 탐색과 Phase 2 반복을 중단시킴
+
+        Args:
+            job_id: 작업 ID
+            user_id: 요청 사용자 ID (비로그인 사용자는 None)
+            session_key: 비로그인 사용자의 세션 키
+
+        Returns:
+            취소 처리 여부 (작업이 없거나 이미 끝났거나 소유자가 다르면 False)
+        """
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in TERMINAL_STAGES:
+                return False
+            if not self._is_owner(job, user_id, session_key):
+                return False
+            self._cancel_locked(job)
+            return True
+
+    @staticmethod
+    def _is_owner(job: SolveJob, user_id: Optional[int], session_key: Optional[str]) -> bool:
+        """
+        요청자가 작업 소유자인지 확인
+        로그인 사용자의 작업은 사용자 ID, 비로그인 사용자의 작업은 세션 키가 같아야 함
+        """
+        if job.user_id is not None:
+            return job.user_id == user_id
+        return user_id is None and session_key is not None and job.session_key == session_key
+
+    def _signal_cancel(self, worker_index: int, job_id: str) -> None:
+        """워커에 작업 취소 알림 (워커가 그 작업을 실행 중일 때만 중단됨)"""
+        _JobCancelSignal(self._cancelled_job_ids[worker_index], job_id).set()
+
+    def _cancel_locked(self, job: SolveJob) -> None:
+        """작업 취소 처리 (self._condition을 잡은 상태에서 호출)"""
+        if job.status == 'running' and job.worker_index is not None:
+            self._signal_cancel(job.worker_index, job.job_id)
+        self._finish(job, {'progress': '취소', 'stage': 'cancelled'})
+        print(f"DEBUG: 시간표 생성 작업 취소 - {job.job_id}")
+
+    def _queue_position(self, job: SolveJob) -> int:
+        """대기 순번 (1부터). 대기 중이 아니면 0"""
+        if job.status != 'queued':
+            return 0
+        return sum(
+            1 for other in self._jobs.values()
+            if other.status == 'queued' and other.created_at <= job.created_at
+        )
+
+    def _finish(self, job: SolveJob, event: Dict[str, Any]) -> None:
+        if event['stage'] == 'done':
+            # 최종 결과에 시간표가 모두 담기므로 탐색 중 스트리밍한 시간표 본문은 보관하지 않음
+            # (poll cursor가 어긋나지 않도록 이벤트 자리는 남김)
+            job.events = [
+                {key: value for key, value in e.items() if key != 'timetable'} if e.get('stage') == 'timetable' else e
+                for e in job.events
+            ]
+        job.events.append(event)
+        job.status = event['stage']
+        job.finished_at = time.time()
+        self._condition.notify_all()
+
+    def _expire_finished_jobs(self) -> None:
+        """보관 시간이 지난 완료 작업 정리"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at and now - job.finished_at > SolverParameters.JOB_RESULT_TTL
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _dispatch_events(self) -> None:
+        """워커 이벤트를 작업별 이벤트 목록에 반영 (부모 프로세스의 백그라운드 스레드)"""
+        while True:
+            job_id, event = self._event_queue.get()
+
+            with self._condition:
+                if job_id is None:
+                    self._handle_worker_event(event)
+                    continue
+
+                job = self._jobs.get(job_id)
+                if job is None:
+                    continue
+
+                stage = event.get('stage')
+                if stage == 'started':
+                    if job.status == 'cancelled':
+                        # 대기 중 취소된 작업을 워커가 가져감 → 바로 중단 요청
+                        self._signal_cancel(event['worker'], job_id)
+                        continue
+                    job.status = 'running'
+                    job.worker_index = event['worker']
+                    job.started_at = time.time()
+
+                if job.status == 'cancelled':
+                    continue
+
+                if stage in TERMINAL_STAGES:
+                    self._finish(job, event)
+                else:
+                    job.events.append(event)
+                    self._condition.notify_all()
+
+    def _handle_worker_event(self, event: Dict[str, Any]) -> None:
+        """
+        감독 프로세스의 워커 시작/종료 이벤트 반영 (self._condition을 잡은 상태에서 호출)
+        종료된 워커가 실행하던 작업은 오류로 종료
+        """
+        worker = self._workers[event['worker']]
+        if event['stage'] == 'worker_started':
+            worker.update(pid=event['pid'], alive=True)
+            return
+
+        if worker['pid'] == event['pid']:
+            worker['alive'] = False
+        job = self._jobs.get(event['job_id']) if event['job_id'] else None
+        if job is not None and job.status in ('queued', 'running'):
+            self._finish(job, {
+                'progress': '오류',
+                'stage': 'error',
+                'error': '시간표 생성 워커가 비정상 종료되었습니다.'
+            })
+
+    def get_state(self) -> Dict[str, Any]:
+        """모니터링용 상태 요약"""
+        with self._condition:
+            counts: Dict[str, int] = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                'started': self._started,
+                'supervisor': {
+                    'pid': self._supervisor.pid if self._supervisor else None,
+                    'alive': bool(self._supervisor and self._supervisor.is_alive())
+                },
+                'workers': [dict(worker) for worker in self._workers],
+                'max_queue_depth': SolverParameters.JOB_MAX_QUEUE_DEPTH,
+                'jobs': counts
+            }
@@ -0,0 +1,262 @@
+"""
+CP-SAT 솔버 스레드 할당 서비스
+동시에 실행되는 모든 Solve()가 하나의 CPU 예산을 나눠 쓰도록 워커 수를 배정
+(작업 큐 워커 프로세스는 fork 전에 만든 공유 상태를 물려받아 같은 예산을 사용)
+"""
+
+import multiprocessing
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+
+from ..views.timetable_config import SolverParameters
+from .cancellation import CancellationToken
+
+
+def _pid_alive(pid: int) -> bool:
+    """프로세스가 살아 있는지 확인 (회수되지 않은 좀비 프로세스는 살아 있는 것으로 봄)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class SolverThreadAllocator:
+    """
+    프로세스 전역 솔버 스레드 할당기 (싱글톤)
+    여유 코어와 실행 중인 풀이 수에 따라 요청보다 적은 워커를 배정하거나,
+    최소 워커 수도 남지 않으면 자리가 날 때까지 대기시킴
+    """
+
+    _instance: Optional['SolverThreadAllocator'] = None
+
+    # 프로세스별 사용량 기록 슬롯 수 (워커 프로세스 비정상 종료 시 회수용)
+    MAX_PROCESS_SLOTS = 64
+    # 대기 중 여유 코어와 취소 여부 확인 간격 (초)
+    WAIT_POLL_INTERVAL = 0.1
+    # 공유 잠금 대기 상한 (초). 넘으면 잠금을 잡은 채 종료된 프로세스가 있는지 확인해 잠금 회수
+    LOCK_TIMEOUT = 2.0
+
+    # 공유 카운터 이름
+    _COUNTERS = ('waiting', 'peak_in_use', 'grants', 'downgrades', 'queued', 'wait_timeouts')
+
+    def __new__(cls):
+        """싱글톤 인스턴스 생성"""
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
+
+        self.budget = max(1, SolverParameters.SOLVER_THREAD_BUDGET or os.cpu_count() or 1)
+        self.min_threads = max(1, min(SolverParameters.SOLVER_MIN_THREADS_PER_SOLVE, self.budget))
+
+        # fork된 워커 프로세스와 공유되는 상태 (잠금은 self._lock 하나로 관리)
+        # 잠금을 잡은 프로세스가 종료되면 다른 프로세스가 풀 수 있도록 재진입 잠금/Condition 대신 일반 Lock 사용
+        context = multiprocessing.get_context('fork')
+        self._lock = context.Lock()
+        self._lock_holder = context.RawValue('i', 0)
+        self._recovery_lock = context.Lock()
+        self._slot_pids = context.RawArray('i', self.MAX_PROCESS_SLOTS)
+        self._slot_threads = context.RawArray('i', self.MAX_PROCESS_SLOTS)
+        self._slot_solves = context.RawArray('i', self.MAX_PROCESS_SLOTS)
+        self._counters = {name: context.RawValue('i', 0) for name in self._COUNTERS}
+
+    @contextmanager
+    def allocate(
+        self,
+        requested: int,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Iterator[int]:
+        """
+        Solve() 한 번에 사용할 워커 수 배정
+
+        사용 예:
+            with SolverThreadAllocator().allocate(level_config['num_workers']) as num_workers:
+                solver.parameters.num_search_workers = num_workers
+                solver.Solve(model)
+        """
+        granted = self.acquire(requested, cancel_token)
+        try:
+            yield granted
+        finally:
+            self.release(granted)
+
+    def acquire(self, requested: int, cancel_token: Optional[CancellationToken] = None) -> int:
+        """
+        워커 수 배정 (여유가 없으면 SOLVER_THREAD_WAIT_TIMEOUT까지 대기)
+        대기 시간이 지나면 최소 워커 수로 실행하여 요청이 무기한 밀리지 않도록 함
+
+        Raises:
+            GenerationCancelled: 대기 중 취소된 경우
+        """
+        requested = max(1, min(requested, self.budget))
+        # 최소 워커 수보다 적게 요청하면 요청 수가 하한 (enumerate_all_solutions는 워커 1개만 허용)
+        minimum = min(requested, self.min_threads)
+        deadline = time.monotonic() + SolverParameters.SOLVER_THREAD_WAIT_TIMEOUT
+        counters = self._counters
+
+        with self._locked():
+            granted = self._grant_size(requested, counters['waiting'].value)
+            if granted:
+                self._record_grant(requested, granted)
+            else:
+                counters['waiting'].value += 1
+                counters['queued'].value += 1
+                print(f"DEBUG: 솔버 스레드 포화 ({self._in_use()}/{self.budget}) - 대기")
+
+        # 잠금을 놓고 WAIT_POLL_INTERVAL마다 다시 확인 (배정 판단과 기록은 같은 잠금 구간에서 수행)
+        while not granted:
+            remaining = deadline - time.monotonic()
+            if remaining > 0:
+                time.sleep(min(remaining, self.WAIT_POLL_INTERVAL))
+            with self._locked():
+                if cancel_token is not None and cancel_token.cancelled:
+                    counters['waiting'].value -= 1
+                    cancel_token.raise_if_cancelled()
+                if remaining <= 0:
+                    granted = minimum
+                    counters['wait_timeouts'].value += 1
+                else:
+                    granted = self._grant_size(requested, counters['waiting'].value - 1)
+                if granted:
+                    counters['waiting'].value -= 1
+                    self._record_grant(requested, granted)
+
+        if granted < requested:
+            print(f"DEBUG: 솔버 스레드 {requested}개 요청 → {granted}개 배정 (사용 중 {self._in_use()}/{self.budget})")
+        return granted
+
+    def release(self, granted: int) -> None:
+        """배정받은 워커 반환"""
+        with self._locked():
+            self._record(os.getpid(), -granted, -1)
+
+    def reclaim(self, pid: int) -> None:
+        """비정상 종료된 프로세스가 반환하지 못한 워커 회수"""
+        with self._locked():
+            for index in range(self.MAX_PROCESS_SLOTS):
+                if self._slot_pids[index] == pid:
+                    if self._slot_threads[index]:
+                        print(f"DEBUG: 종료된 프로세스 {pid}의 솔버 스레드 {self._slot_threads[index]}개 회수")
+                    self._slot_pids[index] = 0
+                    self._slot_threads[index] = 0
+                    self._slot_solves[index] = 0
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """
+        공유 잠금 구간
+        LOCK_TIMEOUT 안에 잠금을 얻지 못하면 잠금을 잡은 프로세스가 종료되었는지 확인하고,
+        종료되었으면 잠금을 강제로 풀어 예산이 영구히 잠기지 않도록 함
+        """
+        while not self._lock.acquire(timeout=self.LOCK_TIMEOUT):
+            self._recover_lock()
+        self._lock_holder.value = os.getpid()
+        try:
+            yield
+        finally:
+            self._lock_holder.value = 0
+            self._lock.release()
+
+    def _recover_lock(self) -> None:
+        """종료된 프로세스가 잡고 있는 공유 잠금 해제 (잡은 프로세스가 살아 있으면 계속 대기)"""
+        holder = self._lock_holder.value
+        # 잠금 구간은 짧으므로 LOCK_TIMEOUT이 지나도록 잡은 프로세스가 기록되지 않았다면 기록 직전/해제 직전에 종료된 것
+        if holder and _pid_alive(holder):
+            print(f"WARNING: 솔버 스레드 잠금 대기 {self.LOCK_TIMEOUT}초 초과 (잡은 프로세스 {holder})")
+            return
+        if not self._recovery_lock.acquire(timeout=self.LOCK_TIMEOUT):
+            return
+        try:
+            # 다른 프로세스가 먼저 회수했거나 그 사이 잠금이 풀렸으면 그대로 둠
+            if self._lock_holder.value != holder:
+                return
+            if self._lock.acquire(timeout=self.WAIT_POLL_INTERVAL):
+                self._lock.release()
+                return
+            print(f"WARNING: 프로세스 {holder or '(미기록)'}가 솔버 스레드 잠금을 잡은 채 종료됨 - 잠금 회수")
+            self._lock_holder.value = 0
+            self._lock.release()
+        finally:
+            self._recovery_lock.release()
+
+        # 종료된 프로세스가 배정받은 채 반환하지 못한 워커도 회수
+        if holder:
+            self.reclaim(holder)
+
+    def _grant_size(self, requested: int, others_waiting: int) -> int:
+        """
+        배정할 워커 수 (self._lock을 잡은 상태에서 호출)
+        남은 코어와 공정 몫(예산 / 동시 풀이 수) 중 작은 값, 최소 워커 수(요청이 더 적으면 요청 수)도 안 되면 0
+        """
+        free = self.budget - self._in_use()
+        if free < min(requested, self.min_threads):
+            return 0
+        concurrent = sum(self._slot_solves) + max(0, others_waiting) + 1
+        fair_share = max(self.min_threads, self.budget // concurrent)
+        return min(requested, free, fair_share)
+
+    def _record_grant(self, requested: int, granted: int) -> None:
+        """배정 기록과 통계 갱신 (self._lock을 잡은 상태에서 호출)"""
+        counters = self._counters
+        self._record(os.getpid(), granted, 1)
+        counters['grants'].value += 1
+        if granted < requested:
+            counters['downgrades'].value += 1
+        counters['peak_in_use'].value = max(counters['peak_in_use'].value, self._in_use())
+
+    def _in_use(self) -> int:
+        return sum(self._slot_threads)
+
+    def _record(self, pid: int, threads: int, solves: int) -> None:
+        """프로세스별 사용량 갱신 (self._lock을 잡은 상태에서 호출)"""
+        empty = None
+        for index in range(self.MAX_PROCESS_SLOTS):
+            if self._slot_pids[index] == pid:
+                break
+            if empty is None and self._slot_pids[index] == 0:
+                empty = index
+        else:
+            if empty is None:
+                # 슬롯이 가득 차면 첫 슬롯에 합산 (예산 계산은 유지, 회수 정확도만 낮아짐)
+                index = 0
+            else:
+                index = empty
+                self._slot_pids[index] = pid
+
+        self._slot_threads[index] += threads
+        self._slot_solves[index] += solves
+        if self._slot_solves[index] <= 0:
+            self._slot_pids[index] = 0
+            self._slot_threads[index] = 0
+            self._slot_solves[index] = 0
+
+    def get_state(self) -> Dict[str, Any]:
+        """모니터링용 상태 요약"""
+        with self._locked():
+            in_use = self._in_use()
+            return {
+                'budget': self.budget,
+                'min_threads': self.min_threads,
+                'in_use': in_use,
+                'free': max(0, self.budget - in_use),
+                'active_solves': sum(self._slot_solves),
+                'processes': [
+                    {
+                        'pid': self._slot_pids[index],
+                        'threads': self._slot_threads[index],
+                        'solves': self._slot_solves[index]
+                    }
+                    for index in range(self.MAX_PROCESS_SLOTS) if self._slot_pids[index]
+                ],
+                **{name: value.value for name, value in self._counters.items()}
+            }
@@ -4,8 +4,14 @@
 """
 
 import re
-from typing import List, Dict, Any, Optional
+import queue
+import threading
+import traceback
+import tracemalloc
+import numpy as np
+from typing import List, Dict, Any, Optional, Callable, Iterator
 from django.contrib.auth.models import User
+from django.db import connection
 from django.db.models.functions import Upper
 
 from data_manager.models import (
@@ -15,22 +21,30 @@ from data_manager.models import (
 from data_manager.services.course_filter_service import CourseFilterService
 
 from ..views.timetable_types import (
-    TimetableRequest, UserInfo, FilterCriteria, ScoreCriteria,
-    ConstraintData
+    TimetableRequest, UserInfo, FilterCriteria, ScoreCriteria, CourseScoreArrays,
+    ConstraintData, ConflictSkeleton, CompactSolution
 )
 from ..views.timetable_config import (
     CURRENT_YEAR, CURRENT_TERM,
-    ValidationMessages, CLASS_START_HOUR
+    ValidationMessages, CLASS_START_HOUR,
+    ScoringWeights, SolverParameters
 )
 from ..utils import (
     get_effective_general_category, get_simplified_category_name,
-    apply_time_constraints
+    apply_time_constraints, parse_course_schedule
 )
 
 from .parameter_parser import ParameterParser
 from .candidate_filter import CandidateFilter
 from .course_scorer import CourseScorer
-from .timetable_optimizer import ModelBuilder, SolutionFinder
+from .candidate_presolve import CandidatePresolver
+from .candidate_pruner import CandidatePruner
+from .cancellation import CancellationToken, GenerationCancelled
+from .solution_hints import SolutionHintProvider
+from .timetable_optimizer import ModelBuilder, SolutionFinder, Phase2PlateauTracker
+from .bitset_search import BitsetSearchBackend
+from .model_cache import ModelCache
+from .conflict_skeleton import ConflictSkeletonService
 from .building_distance_service import extract_building_number
 from .optimization_levels import OptimizationLevel
 
@@ -42,14 +56,22 @@ class TimetableGenerationService:
         self.parser = ParameterParser()
         self.candidate_filter = CandidateFilter()
         self.scorer = CourseScorer()
+        self.presolver = CandidatePresolver()
+        self.pruner = CandidatePruner()
+        self.hint_provider = SolutionHintProvider()
         self.model_builder = ModelBuilder()
+        self.model_cache = ModelCache()
         self.solution_finder = SolutionFinder()
+        self.bitset_backend = BitsetSearchBackend(self.model_builder)
+        self.skeleton_service = ConflictSkeletonService()
         self.course_service = CourseFilterService()
 
     def generate(
         self,
         user: User,
-        request_params: TimetableRequest
+        request_params: TimetableRequest,
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
     ) -> Dict[str, Any]:
         """
         시간표 생성 메인 함수
@@ -57,12 +79,27 @@ class TimetableGenerationService:
         Args:
             user: Django User 객체
             request_params: 시간표 생성 요청 파라미터
+            progress_callback: 단계별 진행 이벤트와 탐색 중 찾은 시간표를 받을 콜백
+            cancel_token: 취소 토큰 (단계 사이와 CP-SAT 탐색 중에 확인)
 
         Returns:
             생성된 시간표 결과 딕셔너리
+
+        Raises:
+            GenerationCancelled: 생성 도중 취소된 경우
         """
         print("DEBUG: --- Timetable Generation Start ---")
 
+        def check_cancelled() -> None:
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
+
+        def emit(stage: str, message: str, **payload) -> None:
+            # 단계가 바뀔 때마다 취소 여부 확인
+            check_cancelled()
+            if progress_callback is not None:
+                progress_callback({'progress': '진행중', 'stage': stage, 'message': message, **payload})
+
         # 1. 필수 과목 ID 파싱
         req_ids = self._parse_required_courses(request_params.required_courses)
         request_params.existing_courses = list(set(request_params.existing_courses + req_ids))
@@ -79,17 +116,20 @@ class TimetableGenerationService:
         # 4. 후보 과목 조회 및 필터링
         candidates = self.candidate_filter.get_candidates(user_info, filter_criteria)
         print("DEBUG: candidates count =", len(candidates))
+        emit('filter', f"후보 과목 {len(candidates)}개 조회", count=len(candidates))
 
         # 5. 점수 계산 기준 생성
         score_criteria = self._create_score_criteria(user_info, request_params)
 
         # 6. 후보 과목 점수 계산
-        self.scorer.calculate_scores(candidates, score_criteria)
+        scores = self.scorer.calculate_scores(candidates, score_criteria)
+        emit('score', "후보 과목 점수 계산 완료", count=len(candidates))
 
         # 7. 후보 과목 데이터 구성
         candidate_data = self._build_candidate_data(
             candidates,
-            request_params.existing_courses
+            request_params.existing_courses,
+            scores
         )
         print("DEBUG: candidate_data count (before filter) =", len(candidate_data))
 
@@ -118,6 +158,12 @@ class TimetableGenerationService:
         )
         print("DEBUG: candidate_data count (final) =", len(candidate_data))
 
+        # 10-1. 동등 분반 병합 및 지배 후보 제거 (솔버는 대표 과목만 사용)
+        presolve_result = None
+        if SolverParameters.ENABLE_CANDIDATE_PRESOLVE:
+            presolve_result = self.presolver.presolve(candidate_data)
+            candidate_data = presolve_result.representatives
+
         # 11. CP-SAT 모델 구성
         constraints = ConstraintData(
             target_total=request_params.target_total,
@@ -127,15 +173,88 @@ class TimetableGenerationService:
             max_walking_time=request_params.max_walking_time,
             prefer_compact=request_params.prefer_compact
         )
-        model, x, objective_expr = self.model_builder.build_model(candidate_data, constraints)
 
-        # 12. Phase 1: 최적해 찾기
-        best_value = self.solution_finder.find_optimal_solution(
-            model,
-            x,
+        # 학기 충돌 골격 (슬롯/강의명/이동시간 쌍을 후보 ID로 잘라 사용)
+        skeleton = self.skeleton_service.get_skeleton(CURRENT_YEAR, CURRENT_TERM)
+
+        # 과목별 시간표 선호도 기여 점수 (후보 축소 순위, Phase 2 top-K 목적함수, 최종 정렬에 사용)
+        preference_contributions = self.scorer.calculate_candidate_preference_contributions(
             candidate_data,
-            optimization_level=request_params.optimization_level
+            self._create_ranking_criteria(request_params)
         )
+        preference_bonus = {cid: score for cid, (score, _) in preference_contributions.items()}
+
+        # 11-1. 요건 버킷별 상위 후보만 남기기 (축소한 후보로 해가 없으면 전체 후보로 재시도)
+        candidate_sets = [candidate_data]
+        if SolverParameters.ENABLE_CANDIDATE_PRUNING:
+            prune_result = self.pruner.prune(
+                candidate_data,
+                constraints,
+                self._prune_scores(candidate_data, constraints, preference_bonus)
+            )
+            if len(prune_result.kept) < len(candidate_data):
+                candidate_sets.insert(0, prune_result.kept)
+
+        for attempt, candidate_data in enumerate(candidate_sets):
+            # 후보가 적으면 CP-SAT 대신 비트셋 분기 한정 백엔드 사용 (모델 구성/솔버 기동 비용 절감)
+            use_bitset = self.bitset_backend.supports(candidate_data)
+            if use_bitset:
+                print(f"DEBUG: 소규모 인스턴스 (후보 {len(candidate_data)}개) → 비트셋 탐색 백엔드 사용")
+                bitset_instance = self.bitset_backend.compile(candidate_data, constraints, skeleton)
+            else:
+                model, x, objective_expr = self.model_cache.get_or_build(
+                    self.model_builder, candidate_data, constraints, skeleton
+                )
+            emit('build', f"최적화 모델 구성 완료 (후보 {len(candidate_data)}개)", count=len(candidate_data))
+
+            # 11-2. 웜 스타트 힌트 구성
+            hint_source, hint_ids = None, []
+            if SolverParameters.ENABLE_SOLUTION_HINTS and not use_bitset:
+                id_aliases = {}
+                if presolve_result is not None:
+                    id_aliases = {
+                        other['id']: rep_id
+                        for rep_id, others in presolve_result.equivalents.items()
+                        for other in others
+                    }
+                hint_source, hint_ids = self.hint_provider.get_hint(
+                    user_info.user_id,
+                    candidate_data,
+                    constraints,
+                    id_aliases=id_aliases
+                )
+
+            # 12. Phase 1: 최적해 찾기
+            emit('phase1', "최적 시간표 탐색 중")
+            if use_bitset:
+                best_value = self.bitset_backend.find_optimal_solution(
+                    bitset_instance,
+                    optimization_level=request_params.optimization_level,
+                    cancel_token=cancel_token
+                )
+            else:
+                best_value = self.solution_finder.find_optimal_solution(
+                    model,
+                    x,
+                    candidate_data,
+                    optimization_level=request_params.optimization_level,
+                    hint_ids=hint_ids,
+                    hint_source=hint_source,
+                    cancel_token=cancel_token
+                )
+            check_cancelled()
+
+            if best_value is not None and attempt + 1 < len(candidate_sets):
+                if SolverParameters.CANDIDATE_PRUNE_REPORT_GAP:
+                    finder = self.bitset_backend if use_bitset else self.solution_finder
+                    self._report_pruning_gap(
+                        finder.last_selected_ids, candidate_sets[-1], constraints, skeleton,
+                        request_params.optimization_level
+                    )
+                break
+            if best_value is None and attempt + 1 < len(candidate_sets):
+                print(f"DEBUG: 축소 후보 {len(candidate_data)}개로 해 없음 → 전체 후보 {len(candidate_sets[-1])}개로 재시도")
+
         if best_value is None:
             return {
                 'progress': '완료',
@@ -145,21 +264,103 @@ class TimetableGenerationService:
             }
 
         # 13. Phase 2: 다양한 해 찾기 (Phase 1의 최적값 활용)
-        timetables_data = self.solution_finder.find_multiple_solutions(
-            model,
-            x,
-            candidate_data,
-            score_criteria.review_summaries,
-            optimization_level=request_params.optimization_level,  # 최적화 수준 전달
-            optimal_value=best_value,  # Phase 1 최적값 전달
-            objective_expr=objective_expr  # 목적함수 표현식 전달
+        emit('phase2', "다양한 시간표 탐색 중", best_value=best_value)
+        trace_memory = SolverParameters.REPORT_PHASE2_MEMORY and not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+
+        # 스트리밍은 종합 점수 상위 return_count개에 새로 드는 해만 과목 딕셔너리로 구성해 전달
+        # (callback/iterative 모드는 해를 수천 개까지 찾으므로 모두 보내면 워커 큐와 작업 이벤트가 커짐)
+        stream_top = Phase2PlateauTracker(
+            OptimizationLevel.get_level(request_params.optimization_level)['return_count'], 0, preference_bonus
         )
+        found_count = 0
+
+        def on_solution(solution: CompactSolution) -> None:
+            nonlocal found_count
+            entries = stream_top.entries
+            stream_top.add(solution.course_ids, solution.objective_value)
+            if stream_top.entries == entries:
+                return
+            found_count += 1
+            timetable = self.solution_finder.hydrate_solution(
+                solution, candidate_data, score_criteria.review_summaries
+            )
+            emit('timetable', f"상위 시간표 {found_count}개 발견", index=found_count, timetable=timetable)
+
+        phase2_mode = SolverParameters.PHASE2_ENUMERATION_MODE
+        if phase2_mode == 'topk':
+            # 선호도 점수를 목적함수에 포함하여 반환할 상위 K개만 탐색
+            if use_bitset:
+                timetables_data = self.bitset_backend.find_top_k_solutions(
+                    bitset_instance,
+                    preference_bonus,
+                    optimization_level=request_params.optimization_level,
+                    optimal_value=best_value,
+                    on_solution=on_solution if progress_callback else None,
+                    cancel_token=cancel_token
+                )
+            else:
+                timetables_data = self.solution_finder.find_top_k_solutions(
+                    model,
+                    x,
+                    candidate_data,
+                    preference_bonus,
+                    optimization_level=request_params.optimization_level,
+                    optimal_value=best_value,
+                    objective_expr=objective_expr,
+                    on_solution=on_solution if progress_callback else None,
+                    cancel_token=cancel_token,
+                    hint_ids=self.solution_finder.last_selected_ids
+                )
+        elif use_bitset:
+            timetables_data = self.bitset_backend.find_multiple_solutions(
+                bitset_instance,
+                optimization_level=request_params.optimization_level,
+                optimal_value=best_value,
+                on_solution=on_solution if progress_callback else None,
+                cancel_token=cancel_token
+            )
+        else:
+            timetables_data = self.solution_finder.find_multiple_solutions(
+                model,
+                x,
+                candidate_data,
+                optimization_level=request_params.optimization_level,  # 최적화 수준 전달
+                optimal_value=best_value,  # Phase 1 최적값 전달
+                objective_expr=objective_expr,  # 목적함수 표현식 전달
+                enumeration_mode=phase2_mode,
+                on_solution=on_solution if progress_callback else None,
+                cancel_token=cancel_token,
+                hint_ids=self.solution_finder.last_selected_ids,
+                preference_bonus=preference_bonus
+            )
+
+        check_cancelled()
 
-        # 14. 선호도 기반 정렬
+        # 14. 선호도 기반 정렬 (압축 해로 점수 계산 후 반환할 시간표만 과목 딕셔너리로 변환)
         sorted_timetables = self._sort_by_preference(
             timetables_data,
-            request_params
+            request_params,
+            candidate_data,
+            preference_contributions,
+            score_criteria.review_summaries
         )
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"DEBUG: Phase 2 ~ 정렬 최대 메모리 {peak / 1024:,.0f}KB (해 {len(timetables_data)}개)")
+
+        # 14-1. 병합된 동등 분반 정보 복원
+        if presolve_result is not None:
+            self.presolver.expand_timetables(sorted_timetables, presolve_result)
+
+        # 14-2. 최상위 시간표를 다음 요청의 힌트로 저장
+        if sorted_timetables:
+            self.hint_provider.remember_result(
+                user_info.user_id,
+                [course['course_id'] for course in sorted_timetables[0]['courses']]
+            )
 
         # 전체 프로세스 요약
         print("\n" + "="*80)
@@ -168,7 +369,8 @@ class TimetableGenerationService:
         print(f"✅ 후보 과목 수: {len(candidates)}개")
         print(f"✅ 시간 제약 적용 후: {len(candidate_data)}개")
         print(f"✅ Phase 1 최적해: {best_value:,.0f}점")
-        print(f"✅ Phase 2 생성 시간표: {len(timetables_data)}개")
+        phase2_stats = (self.bitset_backend if use_bitset else self.solution_finder).last_phase2_stats
+        print(f"✅ Phase 2 생성 시간표: {len(timetables_data)}개 (종료 사유: {phase2_stats.get('stop_reason')})")
         print(f"✅ 최종 선별 시간표: {len(sorted_timetables)}개")
 
         if sorted_timetables:
@@ -202,11 +404,72 @@ class TimetableGenerationService:
             'message': ValidationMessages.SUCCESS_MESSAGE_TEMPLATE.format(count=len(sorted_timetables)) if sorted_timetables else ValidationMessages.NO_TIMETABLE_FOUND
         }
 
+    def generate_stream(
+        self,
+        user: User,
+        request_params: TimetableRequest,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        스트리밍 시간표 생성
+        단계별 진행 이벤트, 탐색 중 찾은 시간표, 최종 정렬 결과(stage='done') 순으로 이벤트를 반환.
+        반환된 제너레이터가 도중에 닫히면(클라이언트 연결 종료) 생성도 취소됨
+
+        Args:
+            user: Django User 객체
+            request_params: 시간표 생성 요청 파라미터
+            cancel_token: 취소 토큰 (없으면 내부에서 생성)
+
+        Yields:
+            이벤트 딕셔너리 (모든 이벤트에 'stage' 키 포함)
+        """
+        events = queue.Queue()
+        finished = object()
+        cancel_token = cancel_token or CancellationToken()
+
+        # 작업 스레드에서 지연 로딩되지 않도록 사용자 객체를 미리 평가
+        user.is_authenticated
+
+        def run() -> None:
+            try:
+                result = self.generate(
+                    user, request_params,
+                    progress_callback=events.put,
+                    cancel_token=cancel_token
+                )
+                events.put({**result, 'stage': 'done'})
+            except GenerationCancelled:
+                print("DEBUG: 시간표 생성 취소됨")
+                events.put({'progress': '취소', 'stage': 'cancelled'})
+            except Exception as e:
+                traceback.print_exc()
+                events.put({'progress': '오류', 'stage': 'error', 'error': str(e)})
+            finally:
+                # 작업 스레드가 연 DB 연결 정리
+                connection.close()
+                events.put(finished)
+
+        threading.Thread(target=run, daemon=True).start()
+
+        completed = False
+        try:
+            while True:
+                event = events.get()
+                if event is finished:
+                    completed = True
+                    break
+                yield event
+        finally:
+            if not completed:
+                cancel_token.cancel()
+
     def _parse_required_courses(self, req_names: List[str]) -> List[int]:
         """필수 과목명을 Course ID 리스트로 변환"""
         req_ids = []
         # 모든 카테고리에서 검색하도록 수정 (category_name 필터 제거)
-        all_courses = self.course_service.course_search(year=CURRENT_YEAR, term=CURRENT_TERM)
+        all_courses = self.course_service.course_search(
+            year=CURRENT_YEAR, term=CURRENT_TERM
+        ).select_related('category')
 
         for name in req_names:
             course = all_courses.filter(course_name__icontains=name).first()
@@ -336,34 +599,14 @@ class TimetableGenerationService:
     def _build_candidate_data(
         self,
         courses: List[Courses],
-        pre_added_ids: List[int]
+        pre_added_ids: List[int],
+        scores: Optional[CourseScoreArrays] = None
     ) -> List[Dict[str, Any]]:
-        """후보 과목 데이터 구성"""
+        """후보 과목 데이터 구성 (scores가 없으면 점수는 0)"""
         candidate_data = []
 
-        for course in courses:
-            schedule_list = []
-            locations = []
-
-            for sch in course.courseschedule_set.all():
-                raw = sch.times.strip()
-                if "@" in raw:
-                    parts = raw.split("@", 1)
-                    raw_time = parts[0].strip()
-                    loc = parts[1].strip()
-                else:
-                    raw_time = raw
-                    loc = sch.location
-                if not raw_time:
-                    continue
-
-                schedule_list.append({
-                    'day': sch.day,
-                    'times': raw_time,
-                    'location': loc
-                })
-                locations.append(loc)
-
+        for index, course in enumerate(courses):
+            schedule_list, locations = parse_course_schedule(course)
             if not schedule_list:
                 continue
 
@@ -383,9 +626,9 @@ class TimetableGenerationService:
                 'schedule': schedule_list,
                 'location': locations[0] if locations else "",
                 'pre_added': course.course_id in pre_added_ids,
-                'graduation_priority': getattr(course, 'graduation_priority', 0),
-                'preference_score': getattr(course, 'preference_score', 0),
-                'rating_score': getattr(course, 'rating_score', 0)
+                'graduation_priority': int(scores.graduation_priority[index]) if scores is not None else 0,
+                'preference_score': int(scores.preference_score[index]) if scores is not None else 0,
+                'rating_score': int(scores.rating_score[index]) if scores is not None else 0
             }
 
             # 교양 강좌: effective_category 추가 (항상 추가, 빈 문자열이라도)
@@ -403,18 +646,45 @@ class TimetableGenerationService:
 
         return candidate_data
 
-    def _sort_by_preference(
+    def _prune_scores(
         self,
-        timetables: List[Dict[str, Any]],  # 구조 변경: Dict로 수정
-        request_params: TimetableRequest
-    ) -> List[List[Dict[str, Any]]]:
-        """선호도 기반 시간표 정렬"""
-        print("\n" + "="*80)
-        print("📊 선호도 기반 시간표 정렬 및 선별")
-        print("="*80)
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        preference_bonus: Dict[int, int]
+    ) -> Dict[int, float]:
+        """후보 축소 순위 점수: 목적함수 선형 계수 + 선호도 기여 (Phase 2 종합 점수와 같은 비율)"""
+        coefficients = self.model_builder.objective_coefficients(candidate_data, constraints)
+        scale = ScoringWeights.COMBINED_OBJECTIVE_SCALE
+        return {
+            cid: coef + scale * preference_bonus.get(cid, 0)
+            for cid, coef in coefficients.items()
+        }
+
+    def _report_pruning_gap(
+        self,
+        selected_ids: List[int],
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        skeleton: Optional[ConflictSkeleton],
+        optimization_level: str
+    ) -> None:
+        """
+        후보 축소로 잃은 목적함수 값 출력 (디버그용)
+        밀집도 항이 후보 집합에 따라 달라지므로, 축소 후보에서 찾은 해를 전체 후보 모델에 고정해 같은 기준으로 비교
+        """
+        model, x, _ = self.model_cache.get_or_build(self.model_builder, candidate_data, constraints, skeleton)
+        pruned_value = self.solution_finder.evaluate_selection(model, x, selected_ids)
+        full_value = self.solution_finder.find_optimal_solution(
+            model, x, candidate_data, optimization_level=optimization_level
+        )
+        if full_value is None or pruned_value is None:
+            return
+        gap = (full_value - pruned_value) / max(1.0, abs(full_value))
+        print(f"DEBUG: 후보 축소 최적값 차이 - 축소 해 {pruned_value:,.0f} / 전체 최적 {full_value:,.0f} (gap {gap:.2%})")
 
-        # ScoreCriteria 생성 (간소화 버전) - prefer_compact 추가
-        score_criteria = ScoreCriteria(
+    def _create_ranking_criteria(self, request_params: TimetableRequest) -> ScoreCriteria:
+        """시간표 순위 계산용 ScoreCriteria 생성 (간소화 버전)"""
+        return ScoreCriteria(
             preferred_instructors=request_params.preferred_instructors,
             avoid_instructors=request_params.avoid_instructors,
             preferred_courses=request_params.preferred_courses,
@@ -424,6 +694,23 @@ class TimetableGenerationService:
             prefer_compact=request_params.prefer_compact  # 밀집도 선호 추가
         )
 
+    def _sort_by_preference(
+        self,
+        timetables: List[CompactSolution],
+        request_params: TimetableRequest,
+        candidate_data: List[Dict[str, Any]],
+        preference_contributions: Dict[int, tuple],
+        review_summaries: Dict[tuple, Any]
+    ) -> List[Dict[str, Any]]:
+        """
+        선호도 기반 시간표 정렬
+        선호도 점수는 과목별 기여의 합이므로 압축 해(과목 ID 튜플)에서 바로 계산하고,
+        반환할 return_count개만 과목 딕셔너리로 변환
+        """
+        print("\n" + "="*80)
+        print("📊 선호도 기반 시간표 정렬 및 선별")
+        print("="*80)
+
         # 선호 조건 출력
         print("📌 사용자 선호 조건:")
         if request_params.preferred_instructors:
@@ -442,71 +729,66 @@ class TimetableGenerationService:
         print(f"\n총 {len(timetables)}개 시간표 평가 시작...")
         print("-" * 80)
 
-        # 각 시간표에 선호도 점수 계산 및 추가
-        scored_timetables = []
-        for idx, timetable_data in enumerate(timetables):
-            # 시간표 과목 리스트 추출
-            timetable = timetable_data['courses']
-            objective_value = timetable_data.get('objective_value', 0)
-            objective_percentage = timetable_data.get('objective_percentage', 0)
-
-            score, matched = self.scorer.calculate_timetable_preference_score(
-                timetable,
-                score_criteria
-            )
-            recommendation_level = self.scorer.get_recommendation_level(score)
+        course_names = {data['id']: data['course_name'] for data in candidate_data}
 
-            # 종합 점수 계산: 목적함수 값 + 선호도 보너스
-            # 목적함수 값을 1/1000로 스케일링하여 선호도 점수와 균형 맞춤
-            combined_score = (objective_value / 1000) + score
+        # 각 시간표의 선호도 점수: 시간표별 과목 기여 점수 구간 합
+        pref_scores, matched_counts = self.scorer.calculate_solution_preference_scores(
+            [solution.course_ids for solution in timetables], preference_contributions
+        )
+        obj_values = np.array([solution.objective_value for solution in timetables], dtype=np.float64)
+        obj_percentages = np.array([solution.objective_percentage for solution in timetables], dtype=np.float64)
 
-            scored_timetables.append({
-                'number': idx + 1,
-                'preference_score': score,
-                'objective_value': objective_value,
-                'objective_percentage': objective_percentage,
-                'combined_score': combined_score,
-                'timetable': timetable,
-                'matched': matched,
-                'recommendation': recommendation_level,
-                'num_courses': len(timetable)
-            })
+        # 종합 점수 계산: 목적함수 값 + 선호도 보너스
+        # 목적함수 값을 1/1000로 스케일링하여 선호도 점수와 균형 맞춤
+        combined_scores = obj_values / ScoringWeights.COMBINED_OBJECTIVE_SCALE + pref_scores
 
         # 종합 점수로 정렬 (높은 점수가 먼저)
-        # 1차: combined_score, 2차: objective_value
-        scored_timetables.sort(key=lambda x: (x['combined_score'], x['objective_value']), reverse=True)
+        # 1차: combined_score, 2차: objective_value (동점은 생성 순서 유지)
+        order = np.lexsort((-obj_values, -combined_scores))
 
-        # 점수 분포 분석
-        pref_scores = [st['preference_score'] for st in scored_timetables]
-        obj_values = [st['objective_value'] for st in scored_timetables]
-        combined_scores = [st['combined_score'] for st in scored_timetables]
+        def scored(rank: int) -> Dict[str, Any]:
+            """정렬 순위의 시간표 점수 정보"""
+            idx = int(order[rank])
+            score = int(pref_scores[idx])
+            return {
+                'number': idx + 1,
+                'preference_score': score,
+                'objective_value': timetables[idx].objective_value,
+                'objective_percentage': timetables[idx].objective_percentage,
+                'combined_score': float(combined_scores[idx]),
+                'solution': timetables[idx],
+                'matched': dict(zip(('instructors', 'courses', 'avoided'), map(int, matched_counts[idx]))),
+                'recommendation': self.scorer.get_recommendation_level(score),
+                'num_courses': len(timetables[idx].course_ids)
+            }
 
+        # 점수 분포 분석
         print("\n📈 점수 분포 분석:")
         print("1️⃣ 목적함수 값:")
-        print(f"  - 최고: {max(obj_values):,.0f} ({max(st['objective_percentage'] for st in scored_timetables):.1f}%)")
-        print(f"  - 최저: {min(obj_values):,.0f} ({min(st['objective_percentage'] for st in scored_timetables):.1f}%)")
-        print(f"  - 평균: {sum(obj_values)/len(obj_values):,.0f}")
+        print(f"  - 최고: {obj_values.max():,.0f} ({obj_percentages.max():.1f}%)")
+        print(f"  - 최저: {obj_values.min():,.0f} ({obj_percentages.min():.1f}%)")
+        print(f"  - 평균: {obj_values.mean():,.0f}")
 
         print("\n2️⃣ 선호도 점수:")
-        print(f"  - 최고: {max(pref_scores)}점")
-        print(f"  - 최저: {min(pref_scores)}점")
-        print(f"  - 평균: {sum(pref_scores)/len(pref_scores):.1f}점")
+        print(f"  - 최고: {pref_scores.max()}점")
+        print(f"  - 최저: {pref_scores.min()}점")
+        print(f"  - 평균: {pref_scores.mean():.1f}점")
 
         print("\n3️⃣ 종합 점수 (목적함수/1000 + 선호도):")
-        print(f"  - 최고: {max(combined_scores):.1f}점")
-        print(f"  - 최저: {min(combined_scores):.1f}점")
-        print(f"  - 평균: {sum(combined_scores)/len(combined_scores):.1f}점")
+        print(f"  - 최고: {combined_scores.max():.1f}점")
+        print(f"  - 최저: {combined_scores.min():.1f}점")
+        print(f"  - 평균: {combined_scores.mean():.1f}점")
 
         # 상위 20개와 나머지 비교
-        top_20 = scored_timetables[:20]
-        rest = scored_timetables[20:] if len(scored_timetables) > 20 else []
+        top_20 = order[:20]
+        rest = order[20:]
 
-        if top_20:
-            top_20_avg = sum(st['combined_score'] for st in top_20) / len(top_20)
+        if len(top_20):
+            top_20_avg = combined_scores[top_20].mean()
             print(f"\n📊 상위 20개 시간표:")
             print(f"  - 평균 종합점수: {top_20_avg:.1f}점")
-            print(f"  - 종합점수 범위: {top_20[-1]['combined_score']:.1f}점 ~ {top_20[0]['combined_score']:.1f}점")
-            print(f"  - 목적함수 범위: {min(st['objective_value'] for st in top_20):,.0f} ~ {max(st['objective_value'] for st in top_20):,.0f}")
+            print(f"  - 종합점수 범위: {combined_scores[top_20[-1]]:.1f}점 ~ {combined_scores[top_20[0]]:.1f}점")
+            print(f"  - 목적함수 범위: {obj_values[top_20].min():,.0f} ~ {obj_values[top_20].max():,.0f}")
 
             # 상위 5개 시간표 상세 정보
             print("\n🏆 상위 5개 시간표 상세:")
@@ -514,26 +796,33 @@ class TimetableGenerationService:
             print(f"{'순위':4} {'목적함수':>10} {'선호도':>8} {'종합점수':>10} {'추천':5} {'과목수':>6} {'주요 과목'}")
             print("-" * 120)
 
-            for i, st in enumerate(top_20[:5]):
-                course_names = [c['course_name'] for c in st['timetable']]
-                main_courses = ', '.join(course_names[:3]) + ('...' if len(course_names) > 3 else '')
+            for i in range(min(5, len(top_20))):
+                st = scored(i)
+                names = [course_names[cid] for cid in st['solution'].course_ids]
+                main_courses = ', '.join(names[:3]) + ('...' if len(names) > 3 else '')
                 print(f"{i+1:4d} {st['objective_value']:10,.0f} {st['preference_score']:8d} "
                       f"{st['combined_score']:10.1f} {st['recommendation']:5} {st['num_courses']:6d} "
                       f"{main_courses}")
 
-        if rest:
-            rest_avg = sum(st['combined_score'] for st in rest) / len(rest)
+        if len(rest):
+            rest_avg = combined_scores[rest].mean()
             print(f"\n📊 나머지 {len(rest)}개 시간표:")
             print(f"  - 평균 종합점수: {rest_avg:.1f}점")
-            print(f"  - 종합점수 범위: {rest[-1]['combined_score']:.1f}점 ~ {rest[0]['combined_score']:.1f}점")
+            print(f"  - 종합점수 범위: {combined_scores[rest[-1]]:.1f}점 ~ {combined_scores[rest[0]]:.1f}점")
             print(f"  - 상위 20개 대비 평균 종합점수 차이: {top_20_avg - rest_avg:.1f}점")
-            print(f"  - 목적함수 범위: {min(st['objective_value'] for st in rest):,.0f} ~ {max(st['objective_value'] for st in rest):,.0f}")
+            print(f"  - 목적함수 범위: {obj_values[rest].min():,.0f} ~ {obj_values[rest].max():,.0f}")
 
-        # 정렬된 시간표 리스트 생성 (추천 정보 포함)
-        sorted_timetables = []
-        for st in scored_timetables:
-            sorted_timetables.append({
-                'courses': st['timetable'],
+        # 최적화 수준에 따라 반환할 시간표 수 결정
+        level_config = OptimizationLevel.get_level(request_params.optimization_level)
+        return_count = level_config['return_count']
+
+        # 반환할 상위 시간표만 과목 딕셔너리로 변환 (추천 정보 포함)
+        top_timetables = []
+        for rank in range(min(return_count, len(order))):
+            st = scored(rank)
+            timetable = self.solution_finder.hydrate_solution(st['solution'], candidate_data, review_summaries)
+            top_timetables.append({
+                'courses': timetable['courses'],
                 'preference_score': st['preference_score'],
                 'matched_preferences': st['matched'],
                 'recommendation_level': st['recommendation'],
@@ -542,14 +831,7 @@ class TimetableGenerationService:
                 'combined_score': st['combined_score']
             })
 
-        # 최적화 수준에 따라 반환할 시간표 수 결정
-        level_config = OptimizationLevel.get_level(request_params.optimization_level)
-        return_count = level_config['return_count']
-
-        # 상위 시간표 반환
-        top_timetables = sorted_timetables[:return_count]
-
-        print(f"\n✅ 최종 선별: 총 {len(sorted_timetables)}개 중 상위 {len(top_timetables)}개 시간표 제공")
+        print(f"\n✅ 최종 선별: 총 {len(timetables)}개 중 상위 {len(top_timetables)}개 시간표 제공")
         print(f"   (최적화 수준 '{level_config['display_name']}'에 따라 {return_count}개 반환)")
         print("="*80 + "\n")
 
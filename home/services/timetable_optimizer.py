@@ -4,11 +4,13 @@ ModelBuilder: CP-SAT 모델 구성
 SolutionFinder: 최적해 및 다양한 해 찾기
 """
 
-from typing import List, Dict, Any, Optional
+import heapq
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from collections import defaultdict
+import numpy as np
 from ortools.sat.python import cp_model
 
-from ..views.timetable_types import ConstraintData
+from ..views.timetable_types import ConstraintData, ConflictSkeleton, CompactSolution
 from ..views.timetable_config import (
     ScoringWeights,
     SolverParameters,
@@ -18,6 +20,9 @@ from ..views.timetable_config import (
 )
 from .building_distance_service import BuildingDistanceService
 from .optimization_levels import OptimizationLevel
+from .cancellation import CancellationToken
+from .solver_threads import SolverThreadAllocator
+from .objective_compiler import ObjectiveCompiler
 from ..utils import (
     get_effective_general_category,
     DummyObj,
@@ -29,13 +34,25 @@ from ..utils import (
 class ModelBuilder:
     """CP-SAT 모델 구성"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        compactness_encoding: Optional[str] = None,
+        conflict_encoding: Optional[str] = None
+    ):
         self.building_service = BuildingDistanceService()
+        self.objective_compiler = ObjectiveCompiler()
+        self.compactness_encoding = compactness_encoding or SolverParameters.COMPACTNESS_ENCODING
+        self.conflict_encoding = conflict_encoding or SolverParameters.CONFLICT_ENCODING
+        # 직전 build_model()의 충돌 제약 수 (계측용): {'slot_constraints', 'clique_constraints', ...}
+        self.last_conflict_stats: Dict[str, int] = {}
+        # 직전 build_model()의 목적함수 계수 정규화 결과 (계측용): {'terms', 'divisor', ...}
+        self.last_objective_stats: Dict[str, int] = {}
 
     def build_model(
         self,
         candidate_data: List[Dict[str, Any]],
-        constraints: ConstraintData
+        constraints: ConstraintData,
+        skeleton: Optional[ConflictSkeleton] = None
     ) -> tuple[cp_model.CpModel, Dict[int, cp_model.IntVar], Any]:
         """
         CP-SAT 모델 구성
@@ -43,6 +60,7 @@ class ModelBuilder:
         Args:
             candidate_data: 후보 과목 데이터 리스트
             constraints: 제약 조건
+            skeleton: 학기별 충돌 골격 (있으면 충돌/이동시간 제약을 후보 ID로 잘라 사용)
 
         Returns:
             (모델, 변수 딕셔너리, 목적함수 표현식) 튜플
@@ -61,10 +79,10 @@ class ModelBuilder:
         self._add_credit_constraints(model, x, candidate_data, constraints)
 
         # 4. 시간표 충돌 제약
-        slot_mapping, name_groups = self._add_conflict_constraints(model, x, candidate_data)
+        slot_mapping, name_groups = self._add_conflict_constraints(model, x, candidate_data, skeleton)
 
         # 5. 건물 간 이동시간 제약
-        self._add_distance_constraints(model, x, candidate_data, constraints)
+        self._add_distance_constraints(model, x, candidate_data, constraints, skeleton)
 
         # 6. 목적함수 설정 및 표현식 저장
         objective_expr = self._set_objective_function(model, x, candidate_data, constraints)
@@ -233,83 +251,283 @@ class ModelBuilder:
         self,
         model: cp_model.CpModel,
         x: Dict[int, cp_model.IntVar],
-        candidate_data: List[Dict[str, Any]]
+        candidate_data: List[Dict[str, Any]],
+        skeleton: Optional[ConflictSkeleton] = None
     ) -> tuple[Dict, Dict]:
         """시간표 충돌 제약"""
+        if self._skeleton_covers(skeleton, candidate_data):
+            slot_mapping, name_groups = self._slice_conflict_groups(skeleton, candidate_data)
+        else:
+            slot_mapping, name_groups = self._conflict_groups(candidate_data)
+
+        slot_constraint_count = len(slot_mapping) + len(name_groups)
+
+        if self.conflict_encoding == 'clique':
+            cliques, self_conflicting = self._conflict_cliques(slot_mapping, name_groups)
+            # 같은 슬롯을 두 번 쓰는 과목은 선택 불가 (슬롯별 제약에서는 2x <= 1로 표현되던 경우)
+            for cid in self_conflicting:
+                model.Add(x[cid] == 0)
+            for clique in cliques:
+                model.AddAtMostOne(x[cid] for cid in clique)
+            emitted = len(cliques) + len(self_conflicting)
+        else:
+            # 동일 시간대에 최대 1개 과목
+            for (day, slot), ids in slot_mapping.items():
+                model.Add(sum(x[cid] for cid in ids) <= 1)
+
+            # 동일 강의명 제약
+            for name, ids in name_groups.items():
+                model.Add(sum(x[cid] for cid in ids) <= 1)
+            emitted = slot_constraint_count
+
+        self.last_conflict_stats = {
+            'slot_constraints': slot_constraint_count,
+            'conflict_constraints': emitted,
+        }
+        print(f"DEBUG: 충돌 제약 ({self.conflict_encoding}) - 슬롯/강의명 제약 {slot_constraint_count}개 → {emitted}개")
+
+        return slot_mapping, name_groups
+
+    def _conflict_cliques(
+        self,
+        slot_mapping: Dict,
+        name_groups: Dict
+    ) -> Tuple[List[List[int]], List[int]]:
+        """
+        충돌 그래프(같은 슬롯 또는 같은 강의명이면 간선)의 극대 클리크로 충돌 제약 압축
+
+        슬롯/강의명 그룹 각각을 씨앗 클리크로 삼아 모든 구성원과 충돌하는 과목을 탐욕적으로 추가해
+        극대 클리크로 확장하고, 다른 클리크에 포함되는 클리크는 제거함.
+        모든 씨앗이 남은 클리크 중 하나에 포함되므로 기존 슬롯별 제약을 모두 함의함.
+
+        Returns:
+            (과목 ID 클리크 리스트, 같은 슬롯을 두 번 쓰는 과목 ID 리스트)
+        """
+        self_conflicting = set()
+        seeds = []
+        for ids in list(slot_mapping.values()) + list(name_groups.values()):
+            unique_ids = set(ids)
+            if len(unique_ids) < len(ids):
+                self_conflicting.update(cid for cid in unique_ids if ids.count(cid) > 1)
+            seeds.append(unique_ids)
+
+        # 충돌 그래프 인접 비트마스크 (선택 불가 과목은 제외)
+        ids = sorted({cid for seed in seeds for cid in seed} - self_conflicting)
+        index_of = {cid: i for i, cid in enumerate(ids)}
+        seed_masks = set()
+        for seed in seeds:
+            mask = 0
+            for cid in seed:
+                if cid in index_of:
+                    mask |= 1 << index_of[cid]
+            if mask & (mask - 1):  # 과목 2개 이상
+                seed_masks.add(mask)
+
+        adjacency = [0] * len(ids)
+        for mask in seed_masks:
+            remaining = mask
+            while remaining:
+                low = remaining & -remaining
+                adjacency[low.bit_length() - 1] |= mask & ~low
+                remaining ^= low
+
+        # 씨앗 클리크를 극대 클리크로 확장
+        cliques = set()
+        for mask in seed_masks:
+            common = ~0
+            remaining = mask
+            while remaining:
+                low = remaining & -remaining
+                common &= adjacency[low.bit_length() - 1]
+                remaining ^= low
+            common &= ~mask
+
+            clique = mask
+            while common:
+                # 남은 후보와 가장 많이 충돌하는 과목 우선 (동률이면 작은 인덱스)
+                best, best_degree = 0, -1
+                remaining = common
+                while remaining:
+                    low = remaining & -remaining
+                    degree = bin(adjacency[low.bit_length() - 1] & common).count('1')
+                    if degree > best_degree:
+                        best, best_degree = low, degree
+                    remaining ^= low
+                clique |= best
+                common &= adjacency[best.bit_length() - 1]
+            cliques.add(clique)
+
+        # 다른 클리크에 포함되는 클리크 제거 (큰 클리크부터 확인)
+        kept = []
+        for clique in sorted(cliques, key=lambda c: (-bin(c).count('1'), c)):
+            if not any(clique & other == clique for other in kept):
+                kept.append(clique)
+
+        return (
+            [[ids[i] for i in range(len(ids)) if clique >> i & 1] for clique in kept],
+            sorted(self_conflicting)
+        )
+
+    def _conflict_groups(self, candidate_data: List[Dict[str, Any]]) -> tuple[Dict, Dict]:
+        """후보 과목의 스케줄로 (요일, 시각) 슬롯 매핑과 동일 강의명 그룹 구성"""
         # 시간 슬롯 매핑
         slot_mapping = defaultdict(list)
         for data in candidate_data:
-            for sched in data['schedule']:
-                day = sched['day']
-                for t in sched['times'].split(","):
-                    if t.strip().isdigit():
-                        slot = int(t.strip()) + CLASS_START_HOUR
-                        slot_mapping[(day, slot)].append(data['id'])
+            for day, slot in self.course_slots(data):
+                slot_mapping[(day, slot)].append(data['id'])
 
-        # 동일 시간대에 최대 1개 과목
-        for (day, slot), ids in slot_mapping.items():
-            model.Add(sum(x[cid] for cid in ids) <= 1)
-
-        # 동일 강의명 제약
+        # 동일 강의명 그룹
         name_groups = defaultdict(list)
         for data in candidate_data:
             name_groups[data['course_name']].append(data['id'])
-        for name, ids in name_groups.items():
-            model.Add(sum(x[cid] for cid in ids) <= 1)
 
         return slot_mapping, name_groups
 
+    def course_slots(self, data: Dict[str, Any]) -> List[Tuple[str, int]]:
+        """과목이 차지하는 (요일, 시각) 슬롯 목록 (같은 슬롯이 두 번 나오면 그대로 유지)"""
+        slots = []
+        for sched in data['schedule']:
+            for t in sched['times'].split(","):
+                if t.strip().isdigit():
+                    slots.append((sched['day'], int(t.strip()) + CLASS_START_HOUR))
+        return slots
+
+    @staticmethod
+    def _skeleton_covers(
+        skeleton: Optional[ConflictSkeleton],
+        candidate_data: List[Dict[str, Any]]
+    ) -> bool:
+        """충돌 골격이 모든 후보 과목을 포함하는지 여부 (골격 생성 이후 추가된 과목이 있으면 직접 계산)"""
+        return skeleton is not None and all(data['id'] in skeleton.course_slots for data in candidate_data)
+
+    def _slice_conflict_groups(
+        self,
+        skeleton: ConflictSkeleton,
+        candidate_data: List[Dict[str, Any]]
+    ) -> tuple[Dict, Dict]:
+        """충돌 골격을 후보 과목 ID로 잘라 슬롯 매핑과 동일 강의명 그룹 구성"""
+        slot_mapping = defaultdict(list)
+        name_groups = defaultdict(list)
+        for data in candidate_data:
+            cid = data['id']
+            for slot_key in skeleton.course_slots[cid]:
+                slot_mapping[slot_key].append(cid)
+            name_groups[skeleton.course_names[cid]].append(cid)
+        return slot_mapping, name_groups
+
     def _add_distance_constraints(
         self,
         model: cp_model.CpModel,
         x: Dict[int, cp_model.IntVar],
         candidate_data: List[Dict[str, Any]],
-        constraints: ConstraintData
+        constraints: ConstraintData,
+        skeleton: Optional[ConflictSkeleton] = None
     ) -> None:
         """건물 간 이동시간 제약"""
-        if constraints.max_walking_time >= MAX_WALKING_TIME_NO_LIMIT:
-            return  # "상관없음" 옵션
+        for id1, id2 in self.far_course_pairs(candidate_data, constraints, skeleton):
+            model.Add(x[id1] + x[id2] <= 1)
 
-        # 시간-과목 매핑 구성
-        time_course_map = defaultdict(lambda: defaultdict(list))
+    def far_course_pairs(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData,
+        skeleton: Optional[ConflictSkeleton] = None
+    ) -> List[Tuple[int, int]]:
+        """연속된 교시에 수업이 있고 건물 간 이동시간이 제한을 넘는 과목 ID 쌍"""
+        if constraints.max_walking_time >= MAX_WALKING_TIME_NO_LIMIT:
+            return []  # "상관없음" 옵션
+
+        if self._skeleton_covers(skeleton, candidate_data):
+            candidate_ids = {data['id'] for data in candidate_data}
+            far_pairs = []
+            for data in candidate_data:
+                # 이동시간 내림차순이므로 제한 이하가 나오면 중단
+                for other_id, distance in skeleton.adjacent_pairs.get(data['id'], []):
+                    if distance <= constraints.max_walking_time:
+                        break
+                    if other_id in candidate_ids:
+                        far_pairs.append((data['id'], other_id))
+            return far_pairs
+
+        ids, pair_max = self._adjacent_course_matrix(candidate_data)
+        return self._pairs_from_matrix(ids, pair_max > constraints.max_walking_time)
+
+    def adjacent_course_distances(
+        self,
+        candidate_data: List[Dict[str, Any]]
+    ) -> Dict[Tuple[int, int], int]:
+        """연속된 교시에 수업이 있는 과목 ID 쌍 (작은 ID, 큰 ID) -> 두 과목 건물 간 최대 이동시간"""
+        ids, pair_max = self._adjacent_course_matrix(candidate_data)
+        rows, columns = np.nonzero(np.triu(pair_max >= 0, 1))
+        return dict(zip(
+            self._pairs_from_matrix(ids, pair_max >= 0),
+            pair_max[rows, columns].tolist()
+        ))
+
+    @staticmethod
+    def _pairs_from_matrix(ids: List[int], mask: np.ndarray) -> List[Tuple[int, int]]:
+        """대칭 불리언 행렬에서 True인 과목 ID 쌍 (작은 ID, 큰 ID)"""
+        if not ids:
+            return []
+        id_array = np.asarray(ids)
+        rows, columns = np.nonzero(np.triu(mask, 1))
+        first, second = id_array[rows], id_array[columns]
+        return list(zip(np.minimum(first, second).tolist(), np.maximum(first, second).tolist()))
+
+    def _adjacent_course_matrix(
+        self,
+        candidate_data: List[Dict[str, Any]]
+    ) -> Tuple[List[int], np.ndarray]:
+        """
+        연속된 교시 과목 쌍의 최대 이동시간 행렬 (건물 정보가 있는 과목만, 인접하지 않은 쌍은 -1)
+        앞 교시 과목 건물에서 뒤 교시 과목 건물까지의 최대값이며, 어느 과목이 먼저든 같은 쌍으로 취급.
+        슬롯 점유 행렬의 곱으로 인접 쌍을 찾고, 건물 인덱스 이동시간 행렬로 최대 이동시간을 한 번에 계산
+        """
+        courses, building_codes = [], []
         for data in candidate_data:
-            if not data.get('buildings'):
-                continue
+            buildings = [b for b in data.get('buildings') or [] if b]
+            if buildings:
+                courses.append(data)
+                building_codes.append(buildings)
+        ids = [data['id'] for data in courses]
+        if len(courses) < 2:
+            return ids, np.full((len(courses), len(courses)), -1)
+
+        # 과목 x (요일, 교시) 점유 행렬
+        slot_columns: Dict[Tuple[str, int], int] = {}
+        rows, columns = [], []
+        for i, data in enumerate(courses):
             for sched in data['schedule']:
-                day = sched['day']
-                times = parse_time_slots(sched['times'], add_base_hour=True)
-                for t in times:
-                    time_course_map[day][t].append(data)
-
-        # 연속된 시간에 수업이 있는 경우 거리 체크
-        checked_pairs = set()
-        for day in time_course_map:
-            for hour in sorted(time_course_map[day].keys()):
-                if hour + 1 not in time_course_map[day]:
-                    continue
-
-                curr_courses = time_course_map[day][hour]
-                next_courses = time_course_map[day][hour + 1]
-
-                for curr in curr_courses:
-                    for next_c in next_courses:
-                        if curr['id'] >= next_c['id']:
-                            continue
-
-                        pair_key = (curr['id'], next_c['id'])
-                        if pair_key in checked_pairs:
-                            continue
-
-                        # 두 과목의 건물 간 최대 거리 계산
-                        max_distance = 0
-                        for curr_bldg in curr.get('buildings', []):
-                            for next_bldg in next_c.get('buildings', []):
-                                distance = self.building_service.get_distance(curr_bldg, next_bldg)
-                                max_distance = max(max_distance, distance)
-
-                        if max_distance > constraints.max_walking_time:
-                            model.Add(x[curr['id']] + x[next_c['id']] <= 1)
-                            checked_pairs.add(pair_key)
+                for t in parse_time_slots(sched['times'], add_base_hour=True):
+                    rows.append(i)
+                    columns.append(slot_columns.setdefault((sched['day'], t), len(slot_columns)))
+        following = [
+            (column, slot_columns[(day, hour + 1)])
+            for (day, hour), column in slot_columns.items() if (day, hour + 1) in slot_columns
+        ]
+        if not following:
+            return ids, np.full((len(courses), len(courses)), -1)
+
+        occupancy = np.zeros((len(courses), len(slot_columns)), dtype=np.int32)
+        occupancy[rows, columns] = 1
+        curr_columns, next_columns = (list(cols) for cols in zip(*following))
+        # adjacent[i, j]: 과목 i 수업 바로 다음 교시에 과목 j 수업
+        adjacent = occupancy[:, curr_columns] @ occupancy[:, next_columns].T > 0
+        np.fill_diagonal(adjacent, False)
+
+        # 과목별 건물 인덱스 (빈 칸은 이동시간 -1인 가상 건물로 채워 최대값에 영향 없도록 함)
+        building_lists, matrix = self.building_service.intern_with_matrix(building_codes)
+        pad = matrix.shape[0]
+        walking = np.full((pad + 1, pad + 1), -1, dtype=matrix.dtype)
+        walking[:pad, :pad] = matrix
+        building_index = np.full((len(courses), max(map(len, building_lists))), pad)
+        for i, indices in enumerate(building_lists):
+            building_index[i, :len(indices)] = indices
+
+        from_course = walking[building_index].max(axis=1)              # 과목 i 건물 -> 각 건물 최대
+        distances = from_course[:, building_index].max(axis=2)         # 과목 i 건물 -> 과목 j 건물 최대
+        directed = np.where(adjacent, distances, -1)
+        return ids, np.maximum(directed, directed.T)
 
     def _set_objective_function(
         self,
@@ -319,140 +537,30 @@ class ModelBuilder:
         constraints: ConstraintData
     ) -> Any:
         """목적함수 설정 및 목적함수 표현식 반환"""
-        # 1. 졸업요건 충족도
-        graduation_priority = sum(
-            x[data['id']] * data.get('graduation_priority', 0)
-            for data in candidate_data
-        )
-
-        # 2. 사용자 선호도 점수
-        preference_priority = sum(
-            x[data['id']] * data.get('preference_score', 0)
-            for data in candidate_data
-        )
-
-        # 3. 강의 평점 점수
-        rating_priority = sum(
-            x[data['id']] * data.get('rating_score', 0)
-            for data in candidate_data
-        )
-
-        # 4. 전공필수 우선
-        required_priority = sum(
-            x[data['id']] for data in candidate_data
-            if data['category'] == '전공필수' and (
-                data['year'] == "전학년" or (
-                    data['year'] and data['year'][0].isdigit() and int(data['year'][0]) <= 100
-                )
-            )
-        )
-
-        # 5. 동일학년 전공선택 우선
-        elective_priority = sum(
-            x[data['id']] for data in candidate_data
-            if data['category'] == '전공선택' and data.get('is_same_year', False)
-        )
-
-        # 6. 교양 카테고리 충족도 보너스
-        gen_category_bonus = 0
-        if constraints.missing_gen_sub:
-            for category_name, shortage_credits in constraints.missing_gen_sub.items():
-                category_courses = [
-                    data for data in candidate_data
-                    if data.get('effective_category') == category_name
-                ]
-                if category_courses:
-                    # 해당 카테고리 과목들에 추가 보너스 부여
-                    for data in category_courses:
-                        # 부족 학점 대비 과목 학점 비율에 따른 보너스
-                        bonus = min(100, (data['credit'] / max(1, shortage_credits)) * 100)
-                        gen_category_bonus += x[data['id']] * int(bonus)
+        # 1~6. 과목별 선형 점수 (졸업요건, 선호도, 평점, 전필/전선 우선, 교양 카테고리 보너스)
+        coefficients = self.objective_coefficients(candidate_data, constraints)
+        linear_priority = sum(x[cid] * coef for cid, coef in coefficients.items() if coef)
 
-        # 7. 시간표 밀집도 (개선된 로직)
+        # 7. 시간표 밀집도 (인코딩 방식은 SolverParameters.COMPACTNESS_ENCODING)
         compactness_bonus = 0
         if constraints.prefer_compact:
             print(f"DEBUG: 밀집도 선호 활성화됨 (prefer_compact=True)")
             print(f"DEBUG:   - 공강시간 패널티: {ScoringWeights.COMPACTNESS_GAP_PENALTY}점/시간")
             print(f"DEBUG:   - 연속 수업 보너스: {ScoringWeights.COMPACTNESS_BASE_BONUS}점")
 
-            # 각 요일별로 선택된 과목들의 시간 간격을 최소화
-            for day in ['월', '화', '수', '목', '금']:
-                day_courses = []
-                for data in candidate_data:
-                    for sch in data['schedule']:
-                        if sch['day'] == day:
-                            times = parse_time_slots(sch['times'], add_base_hour=True)
-                            if times:
-                                day_courses.append((min(times), max(times), data['id'], data['course_name']))
-
-                if len(day_courses) >= 2:
-                    # 시간순으로 정렬
-                    day_courses.sort(key=lambda x: x[0])
-                    print(f"DEBUG:   {day}요일 - {len(day_courses)}개 과목:")
-                    for start, end, cid, name in day_courses:
-                        print(f"DEBUG:     - {name}: {start}교시~{end}교시")
-
-                    # 연속된 과목들 간의 공강 계산 (개선)
-                    for i in range(len(day_courses) - 1):
-                        start1, end1, id1, name1 = day_courses[i]
-                        start2, end2, id2, name2 = day_courses[i + 1]
-
-                        gap = start2 - end1 - 1  # 공강 시간
-
-                        if gap > 0:
-                            # 공강이 있는 경우 페널티
-                            penalty = gap * ScoringWeights.COMPACTNESS_GAP_PENALTY * 2  # 페널티 강화
-                            both_selected = model.NewBoolVar(f'gap_{day}_{i}')
-                            model.AddMultiplicationEquality(both_selected, [x[id1], x[id2]])
-                            compactness_bonus += both_selected * (-penalty)
-                            print(f"DEBUG:     공강 {gap}시간 발생: {name1} → {name2} (패널티 {penalty}점)")
-                        elif gap == 0:
-                            # 연속된 수업인 경우 보너스
-                            consecutive_bonus = ScoringWeights.COMPACTNESS_BASE_BONUS
-                            both_selected = model.NewBoolVar(f'consecutive_{day}_{i}')
-                            model.AddMultiplicationEquality(both_selected, [x[id1], x[id2]])
-                            compactness_bonus += both_selected * consecutive_bonus
-                            print(f"DEBUG:     연속 수업: {name1} → {name2} (보너스 {consecutive_bonus}점)")
-
-                    # 하루 전체 시간 범위에 대한 패널티 (첫 수업부터 마지막 수업까지)
-                    if len(day_courses) > 0:
-                        first_start = day_courses[0][0]
-                        last_end = day_courses[-1][1]
-                        total_span = last_end - first_start + 1
-                        total_class_time = sum(end - start + 1 for start, end, _, _ in day_courses)
-                        total_gap = total_span - total_class_time
-
-                        if total_gap > 0:
-                            # 전체 공강 시간에 대한 추가 패널티
-                            span_penalty_var = model.NewIntVar(0, 1000, f'span_penalty_{day}')
-                            day_active = model.NewBoolVar(f'day_active_{day}')
-
-                            # 해당 요일에 수업이 있는지 확인
-                            model.Add(sum(x[cid] for _, _, cid, _ in day_courses) >= 1).OnlyEnforceIf(day_active)
-                            model.Add(sum(x[cid] for _, _, cid, _ in day_courses) == 0).OnlyEnforceIf(day_active.Not())
-
-                            # 요일이 활성화되면 패널티 적용 (강화)
-                            model.Add(span_penalty_var == total_gap * 50).OnlyEnforceIf(day_active)  # 20 -> 50
-                            model.Add(span_penalty_var == 0).OnlyEnforceIf(day_active.Not())
-                            compactness_bonus = compactness_bonus - span_penalty_var
-
-                            print(f"DEBUG:   {day}요일 전체 범위: {first_start}~{last_end}교시 (총 공강 {total_gap}시간)")
+            if self.compactness_encoding == 'span':
+                compactness_bonus = self._build_span_compactness(model, x, candidate_data)
+            else:
+                compactness_bonus = self._build_pairwise_compactness(model, x, candidate_data)
 
             print(f"DEBUG: 밀집도 보너스/페널티 적용 완료 (가중치: {ScoringWeights.COMPACTNESS_WEIGHT})")
 
         # 최종 목적함수 표현식 생성
-        objective_expr = (
-            graduation_priority * ScoringWeights.GRADUATION_PRIORITY_WEIGHT +
-            preference_priority * ScoringWeights.PREFERENCE_WEIGHT +
-            rating_priority * ScoringWeights.RATING_WEIGHT +
-            compactness_bonus * ScoringWeights.COMPACTNESS_WEIGHT +
-            required_priority * ScoringWeights.REQUIRED_COURSE_WEIGHT +
-            elective_priority * ScoringWeights.ELECTIVE_COURSE_WEIGHT +
-            gen_category_bonus * ScoringWeights.GENERAL_CATEGORY_BONUS_WEIGHT
-        )
+        objective_expr = linear_priority + compactness_bonus * ScoringWeights.COMPACTNESS_WEIGHT
 
-        # 목적함수 설정
+        # 목적함수 설정 (계수는 최대공약수로 축소, 보고값은 원래 단위)
         model.Maximize(objective_expr)
+        self.last_objective_stats = self.objective_compiler.compile(model)
 
         print(f"DEBUG: 목적함수 가중치 - 졸업:{ScoringWeights.GRADUATION_PRIORITY_WEIGHT}, " +
               f"선호도:{ScoringWeights.PREFERENCE_WEIGHT}, " +
@@ -464,19 +572,375 @@ class ModelBuilder:
         # 목적함수 표현식 반환
         return objective_expr
 
+    def objective_coefficients(
+        self,
+        candidate_data: List[Dict[str, Any]],
+        constraints: ConstraintData
+    ) -> Dict[int, int]:
+        """
+        과목별 목적함수 선형 계수 (가중치 적용, 밀집도 항 제외)
+        CP-SAT 모델, 소규모 탐색 백엔드, 후보 축소 순위 점수가 같은 계수를 사용
+        """
+        coefficients = {}
+        for data in candidate_data:
+            # 1. 졸업요건 충족도, 2. 사용자 선호도 점수, 3. 강의 평점 점수
+            coef = (
+                data.get('graduation_priority', 0) * ScoringWeights.GRADUATION_PRIORITY_WEIGHT +
+                data.get('preference_score', 0) * ScoringWeights.PREFERENCE_WEIGHT +
+                data.get('rating_score', 0) * ScoringWeights.RATING_WEIGHT
+            )
+
+            # 4. 전공필수 우선
+            if data['category'] == '전공필수' and (
+                data['year'] == "전학년" or (
+                    data['year'] and data['year'][0].isdigit() and int(data['year'][0]) <= 100
+                )
+            ):
+                coef += ScoringWeights.REQUIRED_COURSE_WEIGHT
+
+            # 5. 동일학년 전공선택 우선
+            if data['category'] == '전공선택' and data.get('is_same_year', False):
+                coef += ScoringWeights.ELECTIVE_COURSE_WEIGHT
+
+            coefficients[data['id']] = coef
+
+        # 6. 교양 카테고리 충족도 보너스
+        if constraints.missing_gen_sub:
+            for category_name, shortage_credits in constraints.missing_gen_sub.items():
+                for data in candidate_data:
+                    if data.get('effective_category') == category_name:
+                        # 부족 학점 대비 과목 학점 비율에 따른 보너스
+                        bonus = min(100, (data['credit'] / max(1, shortage_credits)) * 100)
+                        coefficients[data['id']] += int(bonus) * ScoringWeights.GENERAL_CATEGORY_BONUS_WEIGHT
+
+        return coefficients
+
+    def _build_pairwise_compactness(
+        self,
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        candidate_data: List[Dict[str, Any]]
+    ) -> Any:
+        """
+        밀집도 항 (pairwise 인코딩)
+        요일별로 시간순 정렬한 인접 후보 쌍마다 곱 변수를 만들어 공강 패널티/연속 보너스 부여
+        """
+        pair_terms, day_terms = self.pairwise_compactness_terms(candidate_data)
+        compactness_bonus = 0
+
+        for var_name, id1, id2, weight in pair_terms:
+            both_selected = model.NewBoolVar(var_name)
+            model.AddMultiplicationEquality(both_selected, [x[id1], x[id2]])
+            compactness_bonus += both_selected * weight
+
+        for day, day_ids, penalty in day_terms:
+            # 전체 공강 시간에 대한 추가 패널티
+            span_penalty_var = model.NewIntVar(0, 1000, f'span_penalty_{day}')
+            day_active = model.NewBoolVar(f'day_active_{day}')
+
+            # 해당 요일에 수업이 있는지 확인
+            model.Add(sum(x[cid] for cid in day_ids) >= 1).OnlyEnforceIf(day_active)
+            model.Add(sum(x[cid] for cid in day_ids) == 0).OnlyEnforceIf(day_active.Not())
+
+            # 요일이 활성화되면 패널티 적용
+            model.Add(span_penalty_var == penalty).OnlyEnforceIf(day_active)
+            model.Add(span_penalty_var == 0).OnlyEnforceIf(day_active.Not())
+            compactness_bonus = compactness_bonus - span_penalty_var
+
+        return compactness_bonus
+
+    def pairwise_compactness_terms(
+        self,
+        candidate_data: List[Dict[str, Any]]
+    ) -> Tuple[List[Tuple[str, int, int, int]], List[Tuple[str, List[int], int]]]:
+        """
+        pairwise 밀집도 항 목록 (CP-SAT 모델과 소규모 탐색 백엔드가 공유)
+
+        Returns:
+            (인접 쌍 항 [(변수명, 과목 ID 1, 과목 ID 2, 점수)],
+             요일 범위 항 [(요일, 해당 요일 과목 ID 리스트, 요일 활성 시 패널티)])
+        """
+        pair_terms = []
+        day_terms = []
+
+        # 각 요일별로 선택된 과목들의 시간 간격을 최소화
+        for day in ['월', '화', '수', '목', '금']:
+            day_courses = []
+            for data in candidate_data:
+                for sch in data['schedule']:
+                    if sch['day'] == day:
+                        times = parse_time_slots(sch['times'], add_base_hour=True)
+                        if times:
+                            day_courses.append((min(times), max(times), data['id'], data['course_name']))
+
+            if len(day_courses) >= 2:
+                # 시간순으로 정렬
+                day_courses.sort(key=lambda x: x[0])
+                print(f"DEBUG:   {day}요일 - {len(day_courses)}개 과목:")
+                for start, end, cid, name in day_courses:
+                    print(f"DEBUG:     - {name}: {start}교시~{end}교시")
+
+                # 연속된 과목들 간의 공강 계산 (개선)
+                for i in range(len(day_courses) - 1):
+                    start1, end1, id1, name1 = day_courses[i]
+                    start2, end2, id2, name2 = day_courses[i + 1]
+
+                    gap = start2 - end1 - 1  # 공강 시간
+
+                    if gap > 0:
+                        # 공강이 있는 경우 페널티
+                        penalty = gap * ScoringWeights.COMPACTNESS_GAP_PENALTY * 2  # 페널티 강화
+                        pair_terms.append((f'gap_{day}_{i}', id1, id2, -penalty))
+                        print(f"DEBUG:     공강 {gap}시간 발생: {name1} → {name2} (패널티 {penalty}점)")
+                    elif gap == 0:
+                        # 연속된 수업인 경우 보너스
+                        consecutive_bonus = ScoringWeights.COMPACTNESS_BASE_BONUS
+                        pair_terms.append((f'consecutive_{day}_{i}', id1, id2, consecutive_bonus))
+                        print(f"DEBUG:     연속 수업: {name1} → {name2} (보너스 {consecutive_bonus}점)")
+
+                # 하루 전체 시간 범위에 대한 패널티 (첫 수업부터 마지막 수업까지)
+                first_start = day_courses[0][0]
+                last_end = day_courses[-1][1]
+                total_span = last_end - first_start + 1
+                total_class_time = sum(end - start + 1 for start, end, _, _ in day_courses)
+                total_gap = total_span - total_class_time
+
+                if total_gap > 0:
+                    # 요일이 활성화되면 패널티 적용 (강화: 20 -> 50)
+                    day_terms.append((day, [cid for _, _, cid, _ in day_courses], total_gap * 50))
+                    print(f"DEBUG:   {day}요일 전체 범위: {first_start}~{last_end}교시 (총 공강 {total_gap}시간)")
+
+        return pair_terms, day_terms
+
+    def _build_span_compactness(
+        self,
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        candidate_data: List[Dict[str, Any]]
+    ) -> Any:
+        """
+        밀집도 항 (span 인코딩)
+        요일별 첫/마지막 수업 교시 정수 변수로 공강 시간을 계산하여 패널티 부여.
+        과목 쌍마다 곱 변수를 만들지 않으므로 변수 수가 후보 수와 무관하게 요일당 상수 개
+        (연속 수업 보너스는 공강 패널티에 흡수되어 별도로 부여하지 않음)
+        """
+        # 요일·교시별 점유 표현식 (충돌 제약에 의해 항상 0 또는 1)
+        day_slot_courses = defaultdict(lambda: defaultdict(list))
+        for data in candidate_data:
+            for sch in data['schedule']:
+                for t in parse_time_slots(sch['times'], add_base_hour=True):
+                    day_slot_courses[sch['day']][t].append(data['id'])
+
+        gap_penalty = ScoringWeights.COMPACTNESS_GAP_PENALTY * 2
+        idle_vars = []
+
+        for day in ['월', '화', '수', '목', '금']:
+            slot_courses = day_slot_courses.get(day)
+            if not slot_courses or len(slot_courses) < 2:
+                continue
+
+            slots = sorted(slot_courses)
+            min_slot, max_slot = slots[0], slots[-1]
+            big = max_slot - min_slot + 1
+            occupied = {t: sum(x[cid] for cid in slot_courses[t]) for t in slots}
+            day_ids = {cid for ids in slot_courses.values() for cid in ids}
+
+            # 첫 교시는 -max(-t)로 계산 (AddMinEquality는 선형식 인자의 부호 변환이 잘못되어 사용하지 않음)
+            # 수업이 없는 교시는 big만큼 밀려나 최대값 계산에서 제외됨
+            neg_first = model.NewIntVar(-(max_slot + big), -min_slot, f'neg_first_slot_{day}')
+            last = model.NewIntVar(min_slot - big, max_slot, f'last_slot_{day}')
+            model.AddMaxEquality(neg_first, [-t - big * (1 - occupied[t]) for t in slots])
+            model.AddMaxEquality(last, [t - big * (1 - occupied[t]) for t in slots])
+
+            day_active = model.NewBoolVar(f'day_active_{day}')
+            model.Add(sum(x[cid] for cid in day_ids) >= 1).OnlyEnforceIf(day_active)
+            model.Add(sum(x[cid] for cid in day_ids) == 0).OnlyEnforceIf(day_active.Not())
+
+            idle = model.NewIntVar(0, big, f'idle_slots_{day}')
+            model.Add(idle == last + neg_first + 1 - sum(occupied.values())).OnlyEnforceIf(day_active)
+            model.Add(idle == 0).OnlyEnforceIf(day_active.Not())
+
+            idle_vars.append(idle)
+            print(f"DEBUG:   {day}요일 - {len(day_ids)}개 과목, {min_slot}~{max_slot}교시 (span 변수 4개)")
+
+        return -gap_penalty * sum(idle_vars) if idle_vars else 0
+
+
+class Phase2SolutionCollector(cp_model.CpSolverSolutionCallback):
+    """
+    Phase 2 솔루션 콜백
+    한 번의 탐색 중 발견되는 해를 품질 하한과 다양성 필터를 거쳐 수집
+    """
+
+    def __init__(
+        self,
+        x: Dict[int, cp_model.IntVar],
+        candidate_data: List[Dict[str, Any]],
+        objective_expr: Any,
+        max_solutions: int,
+        min_value: Optional[int] = None,
+        min_different_courses: int = 1,
+        on_accept: Optional[Callable[[List[int], int], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        groups: Optional[Dict[int, Any]] = None,
+        plateau: Optional['Phase2PlateauTracker'] = None
+    ):
+        super().__init__()
+        self._x = x
+        self._objective_expr = objective_expr
+        self._max_solutions = max_solutions
+        self._min_value = min_value
+        self._min_different = max(1, min_different_courses)
+        self._on_accept = on_accept
+        self._cancel_token = cancel_token
+        self._pre_added_ids = {data['id'] for data in candidate_data if data.get('pre_added', False)}
+        # 과목 ID -> 다양성 비교 단위 (없으면 과목 ID 그대로)
+        self._groups = groups or {}
+        self._accepted_keys = []
+        self._accepted_key_set = set()
+        self._plateau = plateau
+
+        self.solutions = []  # (선택된 과목 ID 리스트, 목적함수 값)
+        self.seen_count = 0
+        self.rejected_count = 0
+        self.plateaued = False
+
+    def on_solution_callback(self) -> None:
+        if self._cancel_token is not None and self._cancel_token.cancelled:
+            self.StopSearch()
+            return
+
+        self.seen_count += 1
+
+        selected_ids = [cid for cid, var in self._x.items() if self.Value(var)]
+        # 필수 과목은 모든 해에 공통이므로 다양성 비교에서 제외
+        key = frozenset(self._groups.get(cid, cid) for cid in selected_ids if cid not in self._pre_added_ids)
+
+        if key in self._accepted_key_set or not self._is_diverse(key):
+            self.rejected_count += 1
+            return
+
+        value = self.Value(self._objective_expr)
+        if self._min_value is not None and value < self._min_value:
+            self.rejected_count += 1
+            return
+
+        self._accepted_keys.append(key)
+        self._accepted_key_set.add(key)
+        self.solutions.append((selected_ids, value))
+        if self._on_accept is not None:
+            self._on_accept(selected_ids, value)
+
+        plateaued = self._plateau is not None and self._plateau.add(selected_ids, value)
+        if len(self.solutions) >= self._max_solutions:
+            self.StopSearch()
+        elif plateaued:
+            self.plateaued = True
+            self.StopSearch()
+
+    def _is_diverse(self, key: frozenset) -> bool:
+        """이미 수집한 모든 해와 최소 min_different_courses개 이상 다른지 확인"""
+        if self._min_different <= 1:
+            return True
+        return all(
+            len(prev - key) >= min(self._min_different, len(prev)) for prev in self._accepted_keys
+        )
+
+
+class Phase2PlateauTracker:
+    """
+    Phase 2 정체 감지
+    종합 점수(목적함수 + 스케일 × 선호도) 상위 K개의 커트라인과 새 해의 상위 K 진입을 추적하여
+    상위 K개가 채워진 뒤 연속 window개의 해가 상위권에 들지 못하면 정체로 판단
+    """
+
+    def __init__(self, k: int, window: int, preference_bonus: Optional[Dict[int, int]] = None):
+        self._k = max(1, k)
+        self._window = window
+        self._bonus = preference_bonus or {}
+        self._top: List[int] = []  # 상위 K개 종합 점수 최소 힙
+
+        self.seen = 0
+        self.entries = 0
+        self.since_entry = 0
+
+    def add(self, selected_ids: List[int], objective_value: float) -> bool:
+        """해를 반영하고 정체 여부 반환"""
+        scale = ScoringWeights.COMBINED_OBJECTIVE_SCALE
+        combined = round(objective_value) + scale * sum(self._bonus.get(cid, 0) for cid in selected_ids)
+
+        self.seen += 1
+        if len(self._top) < self._k:
+            heapq.heappush(self._top, combined)
+        elif combined > self._top[0]:
+            heapq.heapreplace(self._top, combined)
+        else:
+            self.since_entry += 1
+            return self.plateaued
+        self.entries += 1
+        self.since_entry = 0
+        return False
+
+    @property
+    def plateaued(self) -> bool:
+        return self._window > 0 and len(self._top) >= self._k and self.since_entry >= self._window
+
+    def summary(self) -> Dict[str, Any]:
+        """상위 K 커트라인(종합 점수 단위)과 진입률"""
+        threshold = self._top[0] / ScoringWeights.COMBINED_OBJECTIVE_SCALE if len(self._top) >= self._k else None
+        return {
+            'threshold': threshold,
+            'entries': self.entries,
+            'entry_rate': self.entries / self.seen if self.seen else 0.0,
+            'since_entry': self.since_entry,
+        }
+
+
+class FirstSolutionTimer(cp_model.CpSolverSolutionCallback):
+    """Phase 1 첫 해 도달 시간 측정 콜백"""
+
+    def __init__(self, cancel_token: Optional[CancellationToken] = None):
+        super().__init__()
+        self._cancel_token = cancel_token
+        self.first_solution_time = None
+        self.first_solution_value = None
+        self.best_solution_time = None
+        self.solution_count = 0
+
+    def on_solution_callback(self) -> None:
+        if self._cancel_token is not None and self._cancel_token.cancelled:
+            self.StopSearch()
+            return
+
+        self.solution_count += 1
+        self.best_solution_time = self.WallTime()
+        if self.first_solution_time is None:
+            self.first_solution_time = self.best_solution_time
+            self.first_solution_value = self.ObjectiveValue()
+
 
 class SolutionFinder:
     """최적해 및 다양한 해 찾기"""
 
+    # 힌트 사용 여부별 첫 해 도달 시간 누적 [합계(초), 횟수] (프로세스 단위, 평균 계산용)
+    _first_solution_stats: Dict[str, List[float]] = {'cold': [0.0, 0], 'hinted': [0.0, 0]}
+
     def __init__(self):
-        pass
+        # 직전 Phase 1 최적해의 선택 과목 ID (후보 축소 최적값 비교 등에 사용)
+        self.last_selected_ids: List[int] = []
+        self.objective_compiler = ObjectiveCompiler()
+        # 직전 Phase 2 종료 사유와 통계 ('limit', 'time', 'plateau', 'exhausted', 'cancelled')
+        self.last_phase2_stats: Dict[str, Any] = {}
 
     def find_optimal_solution(
         self,
         model: cp_model.CpModel,
         x: Dict[int, cp_model.IntVar],
         candidate_data: List[Dict[str, Any]],
-        optimization_level: str = 'ADVANCED'
+        optimization_level: str = 'ADVANCED',
+        hint_ids: Optional[List[int]] = None,
+        hint_source: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None
     ) -> Optional[float]:
         """
         Phase 1: 최적해 찾기
@@ -486,6 +950,9 @@ class SolutionFinder:
             x: 변수 딕셔너리
             candidate_data: 후보 과목 데이터
             optimization_level: 최적화 수준 (BASIC, ADVANCED, EXPERT, ULTRA)
+            hint_ids: 웜 스타트 힌트로 사용할 과목 ID 리스트
+            hint_source: 힌트 출처 (로그용)
+            cancel_token: 취소 토큰 (취소되면 탐색 중단)
 
         Returns:
             최적 목적함수 값. 해를 찾지 못하면 None
@@ -495,7 +962,6 @@ class SolutionFinder:
 
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = level_config['phase1_time']
-        solver.parameters.num_search_workers = level_config['num_workers']
         solver.parameters.linearization_level = SolverParameters.PHASE1_LINEARIZATION_LEVEL
 
         print("\n" + "="*80)
@@ -506,7 +972,17 @@ class SolutionFinder:
         print(f"최대 시간: {level_config['phase1_time']}초")
         print(f"병렬 워커: {level_config['num_workers']}개")
 
-        status = solver.Solve(model)
+        # 웜 스타트 힌트 설정 (복제본에 설정하여 공유 모델은 변경하지 않음)
+        solve_model = model
+        if hint_ids:
+            solve_model = self._with_hints(model, x, hint_ids)
+            print(f"힌트: {hint_source or 'unknown'} ({len(set(hint_ids))}개 과목)")
+
+        timer = FirstSolutionTimer(cancel_token)
+        status = self._solve(solver, solve_model, level_config['num_workers'], timer, cancel_token)
+        if cancel_token is not None and cancel_token.cancelled:
+            print("⛔ Phase 1: 취소됨")
+            return None
         if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             print("❌ Phase 1: 해를 찾을 수 없음")
             return None
@@ -516,6 +992,7 @@ class SolutionFinder:
         # Phase 1 결과 상세 출력
         print("\n✅ Phase 1 완료")
         print(f"최적 목적함수 값: {best_value:,.0f}")
+        self._report_first_solution(timer, best_value, level_config['phase1_time'], bool(hint_ids))
         print("\n📊 목적함수 구성요소 분석:")
 
         # 디버그: 목적함수 구성요소 출력
@@ -523,25 +1000,120 @@ class SolutionFinder:
 
         # 선택된 과목 출력
         selected_courses = []
+        self.last_selected_ids = []
         for data in candidate_data:
             if solver.Value(x[data['id']]) == 1:
                 selected_courses.append(data['course_name'])
+                self.last_selected_ids.append(data['id'])
 
         print(f"\n선택된 과목 ({len(selected_courses)}개): {', '.join(selected_courses)}")
         print("="*80 + "\n")
 
         return best_value
 
+    def _with_hints(
+        self,
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        hint_ids: Optional[List[int]]
+    ) -> cp_model.CpModel:
+        """
+        모델 복제본 반환 (힌트가 있으면 복제본에 설정)
+        Phase 1/2가 추가하는 힌트·품질 하한·no-good 제약은 모두 복제본에만 들어가므로
+        build_model()로 구성한 모델은 다른 최적화 수준, 재시도, 캐시 재사용에 그대로 쓸 수 있음
+        """
+        cloned = model.clone()
+        cloned.ClearHints()
+        if hint_ids:
+            hint_set = set(hint_ids)
+            for cid, var in x.items():
+                cloned.AddHint(var, 1 if cid in hint_set else 0)
+        return cloned
+
+    def evaluate_selection(
+        self,
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        selected_ids: List[int]
+    ) -> Optional[float]:
+        """선택 과목을 고정했을 때 모델의 목적함수 값 (다른 후보 집합에서 찾은 해를 같은 기준으로 비교)"""
+        fixed = model.clone()
+        selected = set(selected_ids)
+        for cid, var in x.items():
+            fixed.Add(fixed.GetBoolVarFromProtoIndex(var.Index()) == (1 if cid in selected else 0))
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = SolverParameters.PHASE1_MAX_TIME
+        status = self._solve(solver, fixed, 1)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+        return solver.ObjectiveValue()
+
+    def _solve(
+        self,
+        solver: cp_model.CpSolver,
+        model: cp_model.CpModel,
+        num_workers: int,
+        callback: Optional[cp_model.CpSolverSolutionCallback] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ) -> int:
+        """
+        Solve() 실행
+        병렬 워커 수는 솔버 스레드 할당기에서 배정받고 (num_workers는 요청 수),
+        취소 토큰이 있으면 탐색 중 취소 여부를 감시
+        """
+        with SolverThreadAllocator().allocate(num_workers, cancel_token) as granted:
+            solver.parameters.num_search_workers = granted
+            if cancel_token is None:
+                return solver.Solve(model, callback)
+            with cancel_token.watch(solver):
+                return solver.Solve(model, callback)
+
+    def _report_first_solution(
+        self,
+        timer: FirstSolutionTimer,
+        best_value: float,
+        time_limit: float,
+        hinted: bool
+    ) -> None:
+        """첫 해 도달 시간 및 힌트 사용 전후 비교 출력"""
+        if timer.first_solution_time is None:
+            return
+
+        first_time = timer.first_solution_time
+        stats = self._first_solution_stats['hinted' if hinted else 'cold']
+        stats[0] += first_time
+        stats[1] += 1
+
+        quality = (timer.first_solution_value / best_value * 100) if best_value else 100.0
+        print(f"⏱️ 첫 해 도달: {first_time:.3f}초 (phase1_time의 {first_time / time_limit * 100:.1f}%), "
+              f"첫 해 품질 {quality:.1f}%, 발견 해 {timer.solution_count}개")
+        print(f"⏱️ 최종 해 도달: {timer.best_solution_time:.3f}초 "
+              f"(phase1_time의 {timer.best_solution_time / time_limit * 100:.1f}%)")
+
+        cold_total, cold_count = self._first_solution_stats['cold']
+        warm_total, warm_count = self._first_solution_stats['hinted']
+        if cold_count and warm_count:
+            cold_avg = cold_total / cold_count
+            warm_avg = warm_total / warm_count
+            speedup = cold_avg / warm_avg if warm_avg > 0 else float('inf')
+            print(f"⏱️ 평균 첫 해 도달 시간: 힌트 없음 {cold_avg:.3f}초 ({cold_count}회) vs "
+                  f"힌트 사용 {warm_avg:.3f}초 ({warm_count}회) → {speedup:.1f}배")
+
     def find_multiple_solutions(
         self,
         model: cp_model.CpModel,
         x: Dict[int, cp_model.IntVar],
         candidate_data: List[Dict[str, Any]],
-        review_summaries: Dict[tuple, Any],
         optimization_level: str = 'ADVANCED',
         optimal_value: Optional[float] = None,
-        objective_expr: Any = None
-    ) -> List[List[Dict[str, Any]]]:
+        objective_expr: Any = None,
+        enumeration_mode: Optional[str] = None,
+        on_solution: Optional[Callable[[CompactSolution], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        hint_ids: Optional[List[int]] = None,
+        preference_bonus: Optional[Dict[int, int]] = None
+    ) -> List[CompactSolution]:
         """
         Phase 2: 다양한 해 찾기 (개선된 버전)
 
@@ -549,23 +1121,23 @@ class SolutionFinder:
             model: CP-SAT 모델
             x: 변수 딕셔너리
             candidate_data: 후보 과목 데이터
-            review_summaries: 강의 평점 정보
             optimization_level: 최적화 수준 (BASIC, ADVANCED, EXPERT, ULTRA)
             optimal_value: Phase 1에서 찾은 최적값
             objective_expr: 목적함수 표현식
+            enumeration_mode: 탐색 방식 ('callback' 또는 'iterative').
+                None이면 SolverParameters.PHASE2_ENUMERATION_MODE 사용
+            on_solution: 해를 찾을 때마다 압축 해로 호출되는 콜백 (스트리밍용, 과목 딕셔너리 구성은 호출 측에서)
+            cancel_token: 취소 토큰 (취소되면 탐색 중단)
+            hint_ids: 힌트로 사용할 과목 ID 리스트 (보통 Phase 1 최적해)
+            preference_bonus: {과목 ID: 시간표 선호도 기여 점수} (정체 조기 종료의 종합 점수 계산용)
 
         Returns:
-            시간표 리스트 (각 시간표는 과목 딕셔너리 리스트)
+            압축 해 리스트 (과목 딕셔너리는 hydrate_solution()으로 구성)
         """
         # 최적화 레벨 설정 로드
         level_config = OptimizationLevel.get_level(optimization_level)
         max_solutions = level_config['solutions']
-
-        timetables_data = []
-        timetable_scores = []  # 각 시간표의 점수 추적
-        solver = cp_model.CpSolver()
-        solver.parameters.max_time_in_seconds = level_config['phase2_time']
-        solver.parameters.num_search_workers = level_config['num_workers']
+        mode = enumeration_mode or SolverParameters.PHASE2_ENUMERATION_MODE
 
         print("\n" + "="*80)
         print("🔍 Phase 2: 다양한 시간표 생성 시작")
@@ -573,117 +1145,448 @@ class SolutionFinder:
         print(f"🎯 최적화 수준: {level_config['display_name']}")
         print(f"목표: 최대 {max_solutions}개 시간표 생성")
         print(f"최대 시간: {level_config['phase2_time']}초")
-        print(f"병렬 워커: {level_config['num_workers']}개")
+        print(f"탐색 방식: {mode}")
 
         # Phase 1의 최적값을 활용하여 일정 범위 내의 해만 탐색
+        min_acceptable_value = None
         if optimal_value is not None and objective_expr is not None:
             # 최적화 레벨에 따른 최소 품질 기준 적용
             min_quality = level_config['min_quality']
-            min_acceptable_value = optimal_value * min_quality
-            model.Add(objective_expr >= int(min_acceptable_value))
+            min_acceptable_value = int(optimal_value * min_quality)
             print(f"최소 목적함수 값 제약: {min_acceptable_value:,.0f} (최적값의 {min_quality*100:.0f}%)")
             print(f"최적값: {optimal_value:,.0f}")
 
         print("\n시간표 생성 진행상황:")
         print("-" * 80)
 
-        # 최대 max_solutions개의 서로 다른 시간표 찾기
-        for i in range(max_solutions):
-            status = solver.Solve(model)
-
-            if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-                solution = []
-                selected_ids = []
-                current_objective_value = solver.ObjectiveValue()
+        # 종합 점수 상위 return_count개가 더 이상 바뀌지 않으면 조기 종료
+        plateau = Phase2PlateauTracker(
+            level_config['return_count'], SolverParameters.PHASE2_PLATEAU_WINDOW, preference_bonus
+        )
 
-                for data in candidate_data:
-                    if solver.Value(x[data['id']]) == 1:
-                        selected_ids.append(data['id'])
-
-                        # 평점 정보 조회
-                        avg_rating = None
-                        review_key = (data.get('course_name', ''), data.get('instructor_name', ''))
-                        if review_key in review_summaries and review_key[0] and review_key[1]:
-                            avg_rating = float(review_summaries[review_key].avg_rating)
-
-                        solution.append({
-                            'course_id': data['id'],
-                            'course_name': data.get('course_name', ''),
-                            'course_code': data.get('course_code', ''),
-                            'section': data.get('section', ''),
-                            'credits': data.get('credit', 0),
-                            'target_year': data.get('year', ''),
-                            'instructor_name': data.get('instructor_name', ''),
-                            'capacity': data.get('capacity', 0),
-                            'dept_name': data.get('dept_name', ''),
-                            'category_name': data.get('category', ''),
-                            'semester': data.get('semester', ''),
-                            'schedules': data.get('schedule', []),
-                            'location': data.get('location', ''),
-                            'avg_rating': avg_rating
-                        })
-
-                # percentage 계산을 먼저 수행
-                percentage = (current_objective_value / optimal_value * 100) if optimal_value else 100
-                course_names = [c['course_name'] for c in solution]
-
-                # 시간표에 목적함수 값 추가
-                solution_with_score = {
-                    'courses': solution,
-                    'objective_value': current_objective_value,
-                    'objective_percentage': percentage
-                }
-                timetables_data.append(solution_with_score)
-
-                # 시간표 점수 정보 저장
-                timetable_scores.append({
-                    'number': i + 1,
-                    'objective_value': current_objective_value,
-                    'percentage': percentage,
-                    'num_courses': len(solution),
-                    'courses': course_names
-                })
-
-                print(f"시간표 #{i+1:3d}: 목적함수값 {current_objective_value:8,.0f} ({percentage:5.1f}%) | {len(solution)}과목 | {', '.join(course_names[:3])}{'...' if len(course_names) > 3 else ''}")
-
-                # 다음 반복에서 다양한 해를 찾도록 제약 추가
-                # 개선된 다양성 전략: pre_added 과목을 제외한 과목들 중에서 최소 1개는 다르게
-                pre_added_ids = [cid for cid in selected_ids
-                                if any(data['id'] == cid and data.get('pre_added', False) for data in candidate_data)]
-                non_pre_added_ids = [cid for cid in selected_ids if cid not in pre_added_ids]
-
-                if non_pre_added_ids:
-                    # 필수 과목이 아닌 과목들 중 최소 1개는 다르게 선택
-                    # 이렇게 하면 필수 과목은 그대로 유지하면서도 다양한 조합 생성 가능
-                    if len(non_pre_added_ids) > 2:
-                        # 선택 가능한 과목이 3개 이상이면 최소 1개는 다르게
-                        model.Add(sum(x[cid] for cid in non_pre_added_ids) <= len(non_pre_added_ids) - 1)
-                    else:
-                        # 선택 가능한 과목이 적으면 정확히 같은 조합만 제외
-                        model.Add(sum(x[cid] for cid in selected_ids) < len(selected_ids))
-                else:
-                    # 모든 과목이 필수인 경우 (드문 경우)
-                    model.Add(sum(x[cid] for cid in selected_ids) < len(selected_ids))
-            else:
-                print(f"\n⚠️ {i}개 시간표 생성 후 더 이상 해를 찾을 수 없음")
-                break
+        # 품질 하한·no-good 제약은 복제본에만 추가 (Phase 1 모델은 재사용 가능하도록 그대로 유지)
+        search_model = self._with_hints(model, x, hint_ids)
+        if mode == 'callback' and objective_expr is not None:
+            timetables_data, stop_reason = self._enumerate_with_callback(
+                search_model, x, candidate_data, level_config,
+                optimal_value, objective_expr, min_acceptable_value, on_solution, cancel_token, plateau
+            )
+        else:
+            timetables_data, stop_reason = self._enumerate_iteratively(
+                search_model, x, candidate_data, level_config,
+                optimal_value, objective_expr, min_acceptable_value, on_solution, cancel_token, plateau
+            )
 
         print("-" * 80)
 
+        self.last_phase2_stats = {'mode': mode, 'stop_reason': stop_reason, 'solutions': len(timetables_data)}
+        self.last_phase2_stats.update(plateau.summary())
+        threshold = self.last_phase2_stats['threshold']
+        print(f"DEBUG: Phase 2 종료 사유: {stop_reason} | 상위 {level_config['return_count']}개 진입 "
+              f"{plateau.entries}회 / {plateau.seen}개 (진입률 {self.last_phase2_stats['entry_rate']:.1%}), "
+              f"마지막 진입 후 {plateau.since_entry}개"
+              + (f", 커트라인 {threshold:,.1f}" if threshold is not None else ""))
+
         # Phase 2 결과 요약
-        if timetable_scores:
+        if timetables_data:
             print(f"\n✅ Phase 2 완료: 총 {len(timetables_data)}개 시간표 생성")
             print("\n📊 목적함수 값 분포:")
-            obj_values = [ts['objective_value'] for ts in timetable_scores]
+            obj_values = [t.objective_value for t in timetables_data]
+            percentages = [t.objective_percentage for t in timetables_data]
             print(f"  - 최고점: {max(obj_values):,.0f}")
             print(f"  - 최저점: {min(obj_values):,.0f}")
             print(f"  - 평균: {sum(obj_values)/len(obj_values):,.0f}")
-            print(f"  - 최적값 대비: {min(ts['percentage'] for ts in timetable_scores):.1f}% ~ {max(ts['percentage'] for ts in timetable_scores):.1f}%")
+            print(f"  - 최적값 대비: {min(percentages):.1f}% ~ {max(percentages):.1f}%")
 
         print("="*80 + "\n")
 
         return timetables_data
 
+    def find_top_k_solutions(
+        self,
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        candidate_data: List[Dict[str, Any]],
+        preference_bonus: Dict[int, int],
+        optimization_level: str = 'ADVANCED',
+        optimal_value: Optional[float] = None,
+        objective_expr: Any = None,
+        on_solution: Optional[Callable[[CompactSolution], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        hint_ids: Optional[List[int]] = None
+    ) -> List[CompactSolution]:
+        """
+        Phase 2 (top-K): 최종 반환할 상위 K개 시간표만 탐색
+
+        시간표 선호도 점수(과목별 기여의 합)를 목적함수에 포함하여
+        종합 점수(목적함수/스케일 + 선호도) 순서대로 K개의 해를 하나씩 증명한다.
+        각 해를 찾은 뒤 동일 조합을 제외하고 다시 최적화하며,
+        솔버가 최적성을 증명하지 못한 채 시간 예산이 끝나면 탐색을 종료한다.
+
+        Args:
+            model: CP-SAT 모델 (변경되지 않음)
+            x: 변수 딕셔너리
+            candidate_data: 후보 과목 데이터
+            preference_bonus: {과목 ID: 시간표 선호도 기여 점수}
+            optimization_level: 최적화 수준 (BASIC, ADVANCED, EXPERT, ULTRA)
+            optimal_value: Phase 1에서 찾은 최적값
+            objective_expr: 목적함수 표현식
+            on_solution: 해를 찾을 때마다 압축 해로 호출되는 콜백 (스트리밍용, 과목 딕셔너리 구성은 호출 측에서)
+            cancel_token: 취소 토큰 (취소되면 탐색 중단)
+            hint_ids: 힌트로 사용할 과목 ID 리스트 (보통 Phase 1 최적해)
+
+        Returns:
+            종합 점수 내림차순의 압축 해 리스트 (최대 return_count개)
+        """
+        level_config = OptimizationLevel.get_level(optimization_level)
+        k = level_config['return_count']
+        time_budget = level_config['phase2_time']
+
+        print("\n" + "="*80)
+        print("🔍 Phase 2 (top-K): 상위 시간표 탐색 시작")
+        print("="*80)
+        print(f"🎯 최적화 수준: {level_config['display_name']}")
+        print(f"목표: 상위 {k}개 시간표 (최대 {time_budget}초)")
+        print(f"병렬 워커: {level_config['num_workers']}개")
+
+        search_model = self._with_hints(model, x, hint_ids)
+
+        # 최적화 레벨에 따른 최소 품질 기준 적용
+        if optimal_value is not None and objective_expr is not None:
+            min_acceptable_value = int(optimal_value * level_config['min_quality'])
+            search_model.Add(objective_expr >= min_acceptable_value)
+            print(f"최소 목적함수 값 제약: {min_acceptable_value:,.0f} (최적값의 {level_config['min_quality']*100:.0f}%)")
+
+        # 종합 점수 × 스케일 = 목적함수 + 스케일 × 선호도 (정수 유지)
+        scale = ScoringWeights.COMBINED_OBJECTIVE_SCALE
+        preference_expr = sum(
+            x[cid] * bonus for cid, bonus in preference_bonus.items() if bonus and cid in x
+        )
+        search_model.Maximize(objective_expr + scale * preference_expr)
+        self.objective_compiler.compile(search_model)
+
+        print("\n시간표 생성 진행상황:")
+        print("-" * 80)
+
+        groups = self.diversity_groups(candidate_data)
+        course_names = {data['id']: data['course_name'] for data in candidate_data}
+        timetables_data = []
+        elapsed = 0.0
+        stop_reason = 'limit'
+
+        while len(timetables_data) < k:
+            if cancel_token is not None and cancel_token.cancelled:
+                stop_reason = 'cancelled'
+                break
+
+            remaining = time_budget - elapsed
+            if remaining <= 0:
+                stop_reason = 'time'
+                break
+
+            solver = cp_model.CpSolver()
+            solver.parameters.max_time_in_seconds = remaining
+            status = self._solve(solver, search_model, level_config['num_workers'], cancel_token=cancel_token)
+            elapsed += solver.WallTime()
+
+            if cancel_token is not None and cancel_token.cancelled:
+                stop_reason = 'cancelled'
+                break
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                stop_reason = 'exhausted'
+                break
+
+            selected_ids = [data['id'] for data in candidate_data if solver.Value(x[data['id']]) == 1]
+            solution = self.compact_solution(selected_ids, solver.Value(objective_expr), optimal_value)
+            timetables_data.append(solution)
+            self.print_solution_line(len(timetables_data), solution, course_names)
+            if on_solution is not None:
+                on_solution(solution)
+
+            if status != cp_model.OPTIMAL:
+                # 시간 예산 내에 이번 순위를 증명하지 못함 → 현재 해까지만 반환
+                print(f"⚠️ #{len(timetables_data)} 최적성 미증명 "
+                      f"(현재 {solver.ObjectiveValue():,.0f}, 상한 {solver.BestObjectiveBound():,.0f})")
+                stop_reason = 'time'
+                break
+
+            # 이미 찾은 해와 충분히 다른 조합만 남기고 다음 순위 탐색
+            self._add_diversity_cut(search_model, x, candidate_data, groups, selected_ids)
+
+        print("-" * 80)
+        stop_messages = {
+            'limit': f"상위 {k}개 증명 완료",
+            'time': "시간 예산 소진",
+            'exhausted': "조건을 만족하는 해 없음",
+            'cancelled': "취소됨"
+        }
+        self.last_phase2_stats = {'mode': 'topk', 'stop_reason': stop_reason, 'solutions': len(timetables_data)}
+        print(f"\n✅ Phase 2 (top-K) 완료: {len(timetables_data)}개 시간표, "
+              f"{elapsed:.1f}초 ({stop_messages[stop_reason]})")
+        print("="*80 + "\n")
+
+        return timetables_data
+
+    def _enumerate_iteratively(
+        self,
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        candidate_data: List[Dict[str, Any]],
+        level_config: Dict[str, Any],
+        optimal_value: Optional[float],
+        objective_expr: Any,
+        min_acceptable_value: Optional[int],
+        on_solution: Optional[Callable[[CompactSolution], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        plateau: Optional[Phase2PlateauTracker] = None
+    ) -> Tuple[List[CompactSolution], str]:
+        """
+        기존 방식: 해마다 Solve()를 다시 호출하고 no-good 제약 추가 (model은 Phase 2 전용 복제본)
+
+        Returns:
+            (압축 해 리스트, 종료 사유) 튜플
+        """
+        max_solutions = level_config['solutions']
+        timetables_data = []
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = level_config['phase2_time']
+        print(f"병렬 워커: {level_config['num_workers']}개")
+
+        if min_acceptable_value is not None:
+            model.Add(objective_expr >= min_acceptable_value)
+
+        groups = self.diversity_groups(candidate_data)
+        course_names = {data['id']: data['course_name'] for data in candidate_data}
+
+        stop_reason = 'limit'
+
+        # 최대 max_solutions개의 서로 다른 시간표 찾기
+        for i in range(max_solutions):
+            if cancel_token is not None and cancel_token.cancelled:
+                print(f"\n⛔ {i}개 시간표 생성 후 취소됨")
+                stop_reason = 'cancelled'
+                break
+
+            status = self._solve(solver, model, level_config['num_workers'], cancel_token=cancel_token)
+
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                print(f"\n⚠️ {i}개 시간표 생성 후 더 이상 해를 찾을 수 없음")
+                stop_reason = 'time' if status == cp_model.UNKNOWN else 'exhausted'
+                break
+
+            selected_ids = [data['id'] for data in candidate_data if solver.Value(x[data['id']]) == 1]
+            solution = self.compact_solution(selected_ids, solver.ObjectiveValue(), optimal_value)
+            timetables_data.append(solution)
+            self.print_solution_line(i + 1, solution, course_names)
+            if on_solution is not None:
+                on_solution(solution)
+
+            if plateau is not None and plateau.add(selected_ids, solution.objective_value):
+                print(f"\n⏹️ {i + 1}개 시간표 생성 후 상위권 정체로 종료")
+                stop_reason = 'plateau'
+                break
+
+            # 다음 반복에서 다양한 해를 찾도록 제약 추가
+            self._add_diversity_cut(model, x, candidate_data, groups, selected_ids)
+
+        return timetables_data, stop_reason
+
+    def _enumerate_with_callback(
+        self,
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        candidate_data: List[Dict[str, Any]],
+        level_config: Dict[str, Any],
+        optimal_value: Optional[float],
+        objective_expr: Any,
+        min_acceptable_value: Optional[int],
+        on_solution: Optional[Callable[[CompactSolution], None]] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        plateau: Optional[Phase2PlateauTracker] = None
+    ) -> Tuple[List[CompactSolution], str]:
+        """
+        솔루션 콜백 방식: 한 번의 탐색에서 품질 하한을 만족하는 해를 모두 열거하며 수집
+
+        목적함수를 제거한 복제 모델(model은 Phase 2 전용 복제본)에서 enumerate_all_solutions로 탐색하므로
+        presolve와 탐색이 한 번만 수행되고, Phase 1 모델은 변경되지 않음
+
+        Returns:
+            (압축 해 리스트, 종료 사유) 튜플
+        """
+        model.ClearObjective()
+        if min_acceptable_value is not None:
+            model.Add(objective_expr >= min_acceptable_value)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = level_config['phase2_time']
+        # enumerate_all_solutions는 단일 워커에서만 동작
+        solver.parameters.enumerate_all_solutions = True
+        solver.parameters.num_search_workers = 1
+        print("병렬 워커: 1개 (솔루션 열거 모드)")
+
+        timetables_data = []
+        course_names = {data['id']: data['course_name'] for data in candidate_data}
+
+        def accept(selected_ids: List[int], value: int) -> None:
+            # 해를 받는 즉시 스트리밍 콜백에 전달
+            solution = self.compact_solution(selected_ids, value, optimal_value)
+            timetables_data.append(solution)
+            self.print_solution_line(len(timetables_data), solution, course_names)
+            if on_solution is not None:
+                on_solution(solution)
+
+        collector = Phase2SolutionCollector(
+            x,
+            candidate_data,
+            objective_expr,
+            max_solutions=level_config['solutions'],
+            min_value=min_acceptable_value,
+            min_different_courses=SolverParameters.PHASE2_MIN_DIFFERENT_COURSES,
+            on_accept=accept,
+            cancel_token=cancel_token,
+            groups=self.diversity_groups(candidate_data),
+            plateau=plateau
+        )
+        status = self._solve(solver, model, 1, collector, cancel_token)
+
+        print(f"\n탐색 상태: {solver.StatusName(status)} | "
+              f"콜백 호출 {collector.seen_count}회, 다양성 필터로 제외 {collector.rejected_count}회, "
+              f"소요 {solver.WallTime():.1f}초")
+        if status == cp_model.OPTIMAL and len(timetables_data) < level_config['solutions']:
+            print(f"⚠️ 조건을 만족하는 해를 모두 열거함 ({len(timetables_data)}개)")
+
+        if cancel_token is not None and cancel_token.cancelled:
+            stop_reason = 'cancelled'
+        elif collector.plateaued:
+            stop_reason = 'plateau'
+        elif len(timetables_data) >= level_config['solutions']:
+            stop_reason = 'limit'
+        elif status == cp_model.OPTIMAL:
+            stop_reason = 'exhausted'
+        else:
+            stop_reason = 'time'
+        return timetables_data, stop_reason
+
+    @staticmethod
+    def diversity_groups(
+        candidate_data: List[Dict[str, Any]],
+        key_type: Optional[str] = None
+    ) -> Dict[int, Any]:
+        """
+        과목 ID -> 다양성 비교 단위 (key_type이 없으면 SolverParameters.PHASE2_DIVERSITY_KEY)
+        - 'section': 분반(과목 ID)마다 다른 과목
+        - 'slot': 같은 과목의 분반이라도 요일·교시·건물이 모두 같으면 같은 과목 (분반만 바뀐 시간표는 중복)
+        - 'course_code': 같은 과목 코드의 분반은 모두 같은 과목
+        """
+        key_type = key_type or SolverParameters.PHASE2_DIVERSITY_KEY
+        groups = {}
+        for data in candidate_data:
+            if key_type == 'section':
+                groups[data['id']] = data['id']
+                continue
+            # 같은 강의명은 AtMostOne 제약이 있으므로 그룹 안에서 최대 한 과목만 선택됨
+            course_key = (data.get('course_code') or data['course_name'], data['course_name'])
+            if key_type == 'slot':
+                course_key += (
+                    tuple(sorted((sched['day'], sched['times']) for sched in data['schedule'])),
+                    tuple(sorted(data.get('buildings', [])))
+                )
+            groups[data['id']] = course_key
+        return groups
+
+    @staticmethod
+    def _add_diversity_cut(
+        model: cp_model.CpModel,
+        x: Dict[int, cp_model.IntVar],
+        candidate_data: List[Dict[str, Any]],
+        groups: Dict[int, Any],
+        selected_ids: List[int]
+    ) -> None:
+        """
+        찾은 해와 PHASE2_MIN_DIFFERENT_COURSES개 이상 다른 해만 남기는 제약 추가
+
+        필수 과목을 제외한 선택 과목의 비교 단위(groups) 중 최소 d개가 빠지도록 함
+        (d = min(PHASE2_MIN_DIFFERENT_COURSES, 비교 단위 수)). 같은 단위의 다른 분반으로 바꾸는 것은
+        다른 해로 보지 않음. 필수 과목만 선택된 해는 정확히 같은 조합만 제외
+        """
+        pre_added_set = {data['id'] for data in candidate_data if data.get('pre_added', False)}
+        selected_groups = {groups[cid] for cid in selected_ids if cid not in pre_added_set}
+        if not selected_groups:
+            model.Add(sum(x[cid] for cid in selected_ids) < len(selected_ids))
+            return
+
+        group_vars = [x[cid] for cid in x if groups[cid] in selected_groups]
+        min_different = min(max(1, SolverParameters.PHASE2_MIN_DIFFERENT_COURSES), len(selected_groups))
+        model.Add(sum(group_vars) <= len(selected_groups) - min_different)
+
+    def compact_solution(
+        self,
+        selected_ids: List[int],
+        objective_value: float,
+        optimal_value: Optional[float]
+    ) -> CompactSolution:
+        """선택된 과목 ID 목록으로 압축 해 구성 (과목 딕셔너리는 hydrate_solution()에서 구성)"""
+        percentage = (objective_value / optimal_value * 100) if optimal_value else 100
+        return CompactSolution(
+            course_ids=tuple(sorted(selected_ids)),
+            objective_value=objective_value,
+            objective_percentage=percentage
+        )
+
+    def hydrate_solution(
+        self,
+        solution: CompactSolution,
+        candidate_data: List[Dict[str, Any]],
+        review_summaries: Dict[tuple, Any]
+    ) -> Dict[str, Any]:
+        """압축 해를 시간표 딕셔너리로 변환 (최종 반환/스트리밍하는 시간표에만 사용)"""
+        selected_set = set(solution.course_ids)
+        courses = []
+        for data in candidate_data:
+            if data['id'] not in selected_set:
+                continue
+
+            # 평점 정보 조회
+            avg_rating = None
+            review_key = (data.get('course_name', ''), data.get('instructor_name', ''))
+            if review_key in review_summaries and review_key[0] and review_key[1]:
+                avg_rating = float(review_summaries[review_key].avg_rating)
+
+            courses.append({
+                'course_id': data['id'],
+                'course_name': data.get('course_name', ''),
+                'course_code': data.get('course_code', ''),
+                'section': data.get('section', ''),
+                'credits': data.get('credit', 0),
+                'target_year': data.get('year', ''),
+                'instructor_name': data.get('instructor_name', ''),
+                'capacity': data.get('capacity', 0),
+                'dept_name': data.get('dept_name', ''),
+                'category_name': data.get('category', ''),
+                'semester': data.get('semester', ''),
+                'schedules': data.get('schedule', []),
+                'location': data.get('location', ''),
+                'avg_rating': avg_rating
+            })
+
+        return {
+            'courses': courses,
+            'objective_value': solution.objective_value,
+            'objective_percentage': solution.objective_percentage
+        }
+
+    def print_solution_line(
+        self,
+        number: int,
+        solution: CompactSolution,
+        course_names: Dict[int, str]
+    ) -> None:
+        """Phase 2 진행상황 한 줄 출력"""
+        names = [course_names[cid] for cid in solution.course_ids]
+        print(f"시간표 #{number:3d}: 목적함수값 {solution.objective_value:8,.0f} "
+              f"({solution.objective_percentage:5.1f}%) | {len(names)}과목 | "
+              f"{', '.join(names[:3])}{'...' if len(names) > 3 else ''}")
+
     def _print_objective_components(
         self,
         solver: cp_model.CpSolver,
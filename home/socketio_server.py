@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Dict, Set, DefaultDict
+from typing import Dict, Set, DefaultDict, Callable
 from collections import defaultdict
 
 import socketio
@@ -21,6 +21,11 @@ sid_to_rooms: DefaultDict[str, Set[str]] = defaultdict(set)
 # Track counts per room
 room_user_counts: DefaultDict[str, int] = defaultdict(int)
 
+# 시간표 생성 작업 진행 상황 폴링 간격 (초)
+SOLVE_JOB_POLL_INTERVAL = 0.2
+# 소켓별 진행 중인 시간표 생성 취소 함수 (연결 종료/취소 요청 시 호출)
+sid_to_generation_cancel: Dict[str, Callable[[], None]] = {}
+
 
 async def _broadcast_user_count(room: str):
     count = room_user_counts.get(room, 0)
@@ -174,6 +179,38 @@ async def chat_message(sid, data):
     await sio.emit("chat_message", payload, room=room, skip_sid=sid)
 
 
+async def _run_solve_job(sid, user_id, timetable_request) -> Dict:
+    """
+    시간표 생성 작업을 워커 프로세스 풀에 등록하고, 끝날 때까지 진행 이벤트를 전달
+    (이벤트 루프와 동기 스레드를 점유하지 않도록 짧은 간격으로 폴링)
+    """
+    from home.services.solve_jobs import SolveJobManager, SolveQueueFullError, TERMINAL_STAGES
+    from home.views.timetable_config import ValidationMessages
+
+    manager = SolveJobManager()
+    try:
+        job_id = await sync_to_async(manager.submit, thread_sensitive=False)(user_id, timetable_request)
+    except SolveQueueFullError:
+        return {"error": ValidationMessages.SOLVE_QUEUE_FULL, "stage": "error"}
+    sid_to_generation_cancel[sid] = lambda: manager.cancel(job_id, user_id)
+
+    await sio.emit("nl_timetable_progress", {
+        "progress": "대기중", "stage": "queued", "job_id": job_id, "message": "시간표 생성 대기 중"
+    }, room=sid)
+
+    cursor = 0
+    while True:
+        snapshot = manager.poll(job_id, user_id, cursor=cursor)
+        if snapshot is None:
+            return {"error": ValidationMessages.SOLVE_JOB_NOT_FOUND, "stage": "error"}
+        cursor = snapshot["cursor"]
+        for event in snapshot["events"]:
+            if event.get("stage") in TERMINAL_STAGES:
+                return event
+            await sio.emit("nl_timetable_progress", event, room=sid)
+        await asyncio.sleep(SOLVE_JOB_POLL_INTERVAL)
+
+
 @sio.event
 async def nl_timetable_request(sid, data):
     """자연어 기반 시간표 생성 요청 처리"""
@@ -223,17 +260,45 @@ async def nl_timetable_request(sid, data):
             # 시간표 생성 (비동기 처리)
             from django.contrib.auth.models import User
             from home.services.timetable_generation_service import TimetableGenerationService
+            from home.views.timetable_config import SolverParameters
 
             django_user = await sync_to_async(User.objects.get)(id=user_id)
             timetable_request = nl_service.constraints_to_timetable_request(constraints, django_user)
 
-            generation_service = TimetableGenerationService()
-            result = await sync_to_async(
-                generation_service.generate,
-                thread_sensitive=True
-            )(django_user, timetable_request)
-
-            # 결과 전송
+            # 단계별 진행 이벤트와 탐색 중 찾은 시간표를 SSE와 동일한 형식으로 전달
+            if SolverParameters.USE_SOLVE_JOB_POOL:
+                result = await _run_solve_job(sid, user_id, timetable_request)
+            else:
+                from home.services.cancellation import CancellationToken, GenerationCancelled
+
+                cancel_token = CancellationToken()
+                sid_to_generation_cancel[sid] = cancel_token.cancel
+                loop = asyncio.get_running_loop()
+
+                def forward_progress(event):
+                    asyncio.run_coroutine_threadsafe(
+                        sio.emit("nl_timetable_progress", event, room=sid), loop
+                    )
+
+                generation_service = TimetableGenerationService()
+                try:
+                    result = await sync_to_async(
+                        generation_service.generate,
+                        thread_sensitive=True
+                    )(django_user, timetable_request,
+                      progress_callback=forward_progress, cancel_token=cancel_token)
+                except GenerationCancelled:
+                    result = {"progress": "취소", "stage": "cancelled"}
+            sid_to_generation_cancel.pop(sid, None)
+
+            # 결과 전송 (연결이 끊겨 취소된 경우 보낼 대상 없음)
+            if result.get("stage") == "cancelled":
+                if sid in sid_to_user:
+                    await sio.emit("nl_timetable_response", {
+                        "message": "시간표 생성이 취소되었습니다.",
+                        "stage": "cancelled"
+                    }, room=sid)
+                return
             await sio.emit("nl_timetable_result", result, room=sid)
 
             # 세션 초기화
@@ -247,8 +312,21 @@ async def nl_timetable_request(sid, data):
         }, room=sid)
 
 
+@sio.event
+async def nl_timetable_cancel(sid, data=None):
+    """진행 중인 시간표 생성 취소 요청"""
+    cancel = sid_to_generation_cancel.pop(sid, None)
+    if cancel is not None:
+        await sync_to_async(cancel, thread_sensitive=False)()
+
+
 @sio.event
 async def disconnect(sid):
+    # 진행 중인 시간표 생성이 있으면 취소 (CPU 낭비 방지)
+    cancel = sid_to_generation_cancel.pop(sid, None)
+    if cancel is not None:
+        await sync_to_async(cancel, thread_sensitive=False)()
+
     # On disconnect, remove from all rooms and update counts
     rooms = list(sid_to_rooms.get(sid, set()))
     for room in rooms:
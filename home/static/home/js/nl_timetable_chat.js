@@ -41,6 +41,9 @@
     // 시간표 생성 시작 알림
     nlSocket.on('nl_timetable_generating', handleGeneratingStatus);
 
+    // 시간표 생성 단계별 진행 상황 수신
+    nlSocket.on('nl_timetable_progress', handleGenerationProgress);
+
     // 시간표 생성 결과 수신
     nlSocket.on('nl_timetable_result', handleTimetableResult);
   }
@@ -126,6 +129,28 @@
     scrollToBottom(chatEntry);
   }
 
+  /**
+   * 시간표 생성 진행 상황 처리
+   * 단계 이벤트는 그대로 표시하고, 탐색 중 찾은 시간표는 첫 번째만 알림
+   */
+  function handleGenerationProgress(data) {
+    const chatEntry = getAIChatEntry();
+    if (!chatEntry || !data) return;
+
+    if (data.stage === 'timetable') {
+      if (data.index === 1) {
+        appendAIMessage(chatEntry, '⏳ 첫 시간표를 찾았습니다. 더 나은 조합을 탐색하고 있습니다...', 'generating');
+        scrollToBottom(chatEntry);
+      }
+      return;
+    }
+
+    if (data.message) {
+      appendAIMessage(chatEntry, `🔄 ${data.message}`, 'generating');
+      scrollToBottom(chatEntry);
+    }
+  }
+
   /**
    * 시간표 생성 결과 처리
    */
@@ -185,8 +185,8 @@ function setupSseConnection(url, onComplete) {
     const progressText = document.getElementById("progress-text");
     progressOverlay.style.display = "block";
 
-    // Dots 애니메이션을 위한 변수
-    const baseText = "시간표 생성 중";
+    // Dots 애니메이션을 위한 변수 (서버 진행 이벤트에 따라 갱신)
+    let baseText = "시간표 생성 중";
     let dotCount = 0;
 
     // 초기 텍스트 설정
@@ -293,9 +293,27 @@ function setupSseConnection(url, onComplete) {
                     if (onComplete) onComplete(true);
                 }, 1500);
             });
-        } else {
-            // 진행 중 메시지 업데이트 (dots 애니메이션은 계속 진행)
-            // progressText는 dots 애니메이션이 처리하므로 건드리지 않음
+        } else if (data.stage === "error") {
+            clearInterval(dotsInterval);
+            progressText.textContent = "오류 발생";
+            evtSource.close();
+            setTimeout(() => { progressOverlay.style.display = "none"; }, 2000);
+            if (onComplete) onComplete(false);
+        } else if (data.stage === "timetable" && data.timetable) {
+            // 탐색 중 찾은 시간표를 바로 표시 (최종 정렬 결과가 오면 교체됨)
+            baseText = data.message || baseText;
+            if (data.index === 1) {
+                timetables = [];
+            }
+            const courses = Course.createFromApiData(data.timetable.courses || []);
+            timetables.push(new Timetable(courses));
+            if (data.index === 1) {
+                currentIndex = 0;
+                applyTimetableToMiddlePanel();
+            }
+        } else if (data.message) {
+            // 단계별 진행 메시지 (dots 애니메이션은 계속 진행)
+            baseText = data.message;
         }
     };
 
@@ -1,3 +1,818 @@
-from django.test import TestCase
+import contextlib
+import datetime
+import io
+import multiprocessing
+import os
+import random
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from ortools.sat.python import cp_model
+
+from data_manager.models import Semester, Category, Courses, CourseSchedule, University, Department
+from data_manager.services.category_closure_service import CategoryClosureService
+
+from home.services.bitset_search import BitsetSearchBackend
+from home.services.candidate_pruner import CandidatePruner
+from home.services.building_distance_service import BuildingDistanceService
+from home.services.conflict_skeleton import ConflictSkeletonService
+from home.services.course_scorer import CourseScorer
+from home.services.model_cache import ModelCache
+from home.services.optimization_levels import OptimizationLevel
+from home.services.cancellation import CancellationToken
+from home.services.solution_hints import SolutionHintProvider
+from home.services.solve_jobs import JOB_ID_LENGTH, SolveJobManager, _JobCancelSignal
+from home.services.solver_threads import SolverThreadAllocator
+from home.services.timetable_generation_service import TimetableGenerationService
+from home.services.timetable_optimizer import ModelBuilder, Phase2PlateauTracker, SolutionFinder
+from home.views.timetable_config import ScoringWeights, SolverParameters
+from home.views.timetable_types import ConstraintData, ScoreCriteria, SolveJob, TimetableRequest
+from home.utils import apply_time_constraints, apply_time_constraints_legacy
+
+
+DAYS = ['월', '화', '수', '목', '금']
+BUILDINGS = ['N14', 'S1', 'E8', 'N10', 'S21']
+CATEGORIES = ['전공필수', '전공선택', '전공선택', '일반교양', '개신기초교양', '확대교양']
+GENERAL_CATEGORIES = ['일반교양', '개신기초교양', '확대교양']
+
+
+def use_test_building_distances():
+    """건물 간 이동시간: 구역(N/S/E)이 다르면 7분, 같으면 3분"""
+    BuildingDistanceService()._distance_cache = {
+        (a, b): 7 if a[0] != b[0] else 3
+        for a in BUILDINGS for b in BUILDINGS if a != b
+    }
+
+
+def make_random_case(seed, size=24):
+    """무작위 후보 과목과 제약 조건 생성"""
+    rng = random.Random(seed)
+    names = [f'과목{i}' for i in range(size * 2 // 3)]
+    candidate_data = []
+    for cid in range(1, size + 1):
+        category = rng.choice(CATEGORIES)
+        days = rng.sample(DAYS, rng.choice([1, 2]))
+        schedule = []
+        for day in days:
+            start = rng.randint(1, 8)
+            length = rng.choice([1, 2, 3]) if len(days) == 1 else rng.choice([1, 2])
+            times = ','.join(f'{t:02d}' for t in range(start, min(start + length, 10)))
+            schedule.append({'day': day, 'times': times, 'location': f'{rng.choice(BUILDINGS)}-101'})
+        candidate_data.append({
+            'id': cid,
+            'course_name': rng.choice(names),
+            'credit': rng.choice([2, 3, 3, 3]),
+            'year': rng.choice(['전학년', '1학년', '2학년', '3학년']),
+            'category': category,
+            'effective_category': category if category in GENERAL_CATEGORIES else '',
+            'schedule': schedule,
+            'buildings': [sched['location'].split('-')[0] for sched in schedule],
+            'pre_added': cid <= seed % 3,
+            'is_same_year': rng.random() < 0.5,
+            'graduation_priority': rng.choice([0, 0, 30, 50, 100]),
+            'preference_score': rng.choice([0, 0, 100, -20, 200]),
+            'rating_score': rng.choice([0, 15, 25, 40, -15]),
+        })
+
+    target_major = rng.choice([0, 3, 6, 9])
+    target_elective = rng.choice([3, 6, 9])
+    constraints = ConstraintData(
+        target_total=target_major + target_elective,
+        target_major=target_major,
+        target_elective=target_elective,
+        missing_gen_sub=rng.choice([{}, {'일반교양': 3, '확대교양': 6}]),
+        max_walking_time=rng.choice([5, 20]),
+        prefer_compact=rng.random() < 0.6
+    )
+    preference_bonus = {data['id']: rng.choice([0, 0, 5, 10, -5]) for data in candidate_data}
+    return candidate_data, constraints, preference_bonus
+
+
+class BitsetSearchDifferentialTest(TestCase):
+    """소규모 인스턴스 비트셋 탐색 백엔드가 CP-SAT와 같은 최적값/상위 K개 점수를 내는지 비교"""
+
+    def setUp(self):
+        use_test_building_distances()
+
+    def _combined_scores(self, timetables, preference_bonus):
+        scale = ScoringWeights.COMBINED_OBJECTIVE_SCALE
+        return [
+            round(timetable.objective_value) + scale * sum(preference_bonus[cid] for cid in timetable.course_ids)
+            for timetable in timetables
+        ]
+
+    def _assert_backends_agree(self, encoding, seeds):
+        for seed in seeds:
+            candidate_data, constraints, preference_bonus = make_random_case(seed)
+            with self.subTest(seed=seed, encoding=encoding), contextlib.redirect_stdout(io.StringIO()):
+                model_builder = ModelBuilder(compactness_encoding=encoding)
+                finder = SolutionFinder()
+                model, x, objective_expr = model_builder.build_model(candidate_data, constraints)
+                cp_sat_best = finder.find_optimal_solution(model, x, candidate_data, 'BASIC')
+
+                backend = BitsetSearchBackend(model_builder)
+                instance = backend.compile(candidate_data, constraints)
+                bitset_best = backend.find_optimal_solution(instance, 'BASIC')
+
+                self.assertEqual(cp_sat_best is None, bitset_best is None)
+                if cp_sat_best is None:
+                    continue
+                self.assertEqual(round(cp_sat_best), round(bitset_best))
+
+                cp_sat_top = finder.find_top_k_solutions(
+                    model, x, candidate_data, preference_bonus, 'BASIC', cp_sat_best, objective_expr
+                )
+                bitset_top = backend.find_top_k_solutions(instance, preference_bonus, 'BASIC', bitset_best)
+                self.assertEqual(
+                    self._combined_scores(cp_sat_top, preference_bonus),
+                    self._combined_scores(bitset_top, preference_bonus)
+                )
+
+    def test_pairwise_compactness_matches_cp_sat(self):
+        self._assert_backends_agree('pairwise', range(20))
+
+    def test_span_compactness_matches_cp_sat(self):
+        self._assert_backends_agree('span', range(10))
+
+    def test_section_only_swaps_are_not_returned(self):
+        for seed in range(5):
+            candidate_data, constraints, preference_bonus = make_random_case(seed)
+            # 시간·건물이 같은 분반 추가 (점수만 다름)
+            for data in candidate_data[:8]:
+                section = dict(data, id=data['id'] + 100, pre_added=False, rating_score=data['rating_score'] + 5)
+                candidate_data.append(section)
+                preference_bonus[section['id']] = preference_bonus[data['id']]
+            groups = SolutionFinder.diversity_groups(candidate_data, 'slot')
+
+            with self.subTest(seed=seed), contextlib.redirect_stdout(io.StringIO()):
+                model, x, objective_expr = ModelBuilder().build_model(candidate_data, constraints)
+                finder = SolutionFinder()
+                best = finder.find_optimal_solution(model, x, candidate_data, 'BASIC')
+                if best is None:
+                    continue
+                cp_sat_top = finder.find_top_k_solutions(
+                    model, x, candidate_data, preference_bonus, 'BASIC', best, objective_expr
+                )
+                backend = BitsetSearchBackend()
+                instance = backend.compile(candidate_data, constraints)
+                bitset_top = backend.find_top_k_solutions(instance, preference_bonus, 'BASIC', best)
+
+                signatures = [frozenset(groups[cid] for cid in t.course_ids) for t in cp_sat_top]
+                self.assertEqual(len(signatures), len(set(signatures)))
+                self.assertEqual(
+                    self._combined_scores(cp_sat_top, preference_bonus),
+                    self._combined_scores(bitset_top, preference_bonus)
+                )
+
+    def test_conflicting_pre_added_courses_are_infeasible(self):
+        candidate_data, constraints, _ = make_random_case(0)
+        for data in candidate_data[:2]:
+            data['pre_added'] = True
+            data['schedule'] = [{'day': '월', 'times': '01,02', 'location': 'N14-101'}]
+        with contextlib.redirect_stdout(io.StringIO()):
+            backend = BitsetSearchBackend()
+            self.assertIsNone(backend.find_optimal_solution(backend.compile(candidate_data, constraints), 'BASIC'))
+
+
+class ConflictSkeletonTest(TestCase):
+    """학기 충돌 골격을 후보 ID로 잘라 만든 제약이 후보 과목에서 직접 계산한 제약과 같은지 확인"""
+
+    def setUp(self):
+        use_test_building_distances()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.settings_override = override_settings(BASE_DIR=self.cache_dir.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.service = ConflictSkeletonService()
+        self.service.clear_cache()
+        self.addCleanup(self.service.clear_cache)
+
+        self.semester = Semester.objects.create(
+            year=2025, term='1학기',
+            start_date=datetime.date(2025, 3, 1), end_date=datetime.date(2025, 6, 30),
+            course_registration_start=datetime.date(2025, 2, 1),
+            course_registration_end=datetime.date(2025, 2, 28)
+        )
+        self.category = Category.objects.create(category_name='전공선택', version_year=2025)
+
+    def _import_catalog(self, seed, size=60):
+        """무작위 후보 과목을 개설 강좌로 저장하고 DB ID 기준 후보 데이터 반환"""
+        candidate_data, _, _ = make_random_case(seed, size)
+        for data in candidate_data:
+            course = Courses.objects.create(
+                category=self.category, semester=self.semester,
+                course_name=data['course_name'], course_code=f"C{data['id']:04d}", section='01',
+                credits=data['credit'], target_year=data['year'],
+                lecture_hours=3, lecture_times=3, lab_hours=0, lab_times=0
+            )
+            for sched in data['schedule']:
+                CourseSchedule.objects.create(
+                    course=course, day=sched['day'], times=sched['times'], location=sched['location']
+                )
+            data['id'] = course.course_id
+        return candidate_data
+
+    def test_sliced_skeleton_matches_direct_constraints(self):
+        candidate_data = self._import_catalog(seed=3)
+        model_builder = ModelBuilder()
+        with contextlib.redirect_stdout(io.StringIO()):
+            skeleton = self.service.get_skeleton(2025, '1학기')
+
+        rng = random.Random(7)
+        for _ in range(5):
+            subset = rng.sample(candidate_data, 25)
+            direct_slots, direct_names = model_builder._conflict_groups(subset)
+            sliced_slots, sliced_names = model_builder._slice_conflict_groups(skeleton, subset)
+            self.assertEqual(direct_slots, sliced_slots)
+            self.assertEqual(direct_names, sliced_names)
+
+            for max_walking_time in (0, 3, 5, 20):
+                constraints = ConstraintData(
+                    target_total=12, target_major=6, target_elective=6, max_walking_time=max_walking_time
+                )
+                self.assertEqual(
+                    sorted(model_builder.far_course_pairs(subset, constraints)),
+                    sorted(model_builder.far_course_pairs(subset, constraints, skeleton))
+                )
+
+    def test_disk_cache_is_reused_until_catalog_changes(self):
+        self._import_catalog(seed=5, size=20)
+        with contextlib.redirect_stdout(io.StringIO()):
+            built = self.service.get_skeleton(2025, '1학기')
+            self.service.clear_cache()
+            loaded = self.service.get_skeleton(2025, '1학기')
+        self.assertEqual(built, loaded)
+
+        course = Courses.objects.create(
+            category=self.category, semester=self.semester,
+            course_name='신규과목', course_code='NEW001', section='01', credits=3, target_year='전학년',
+            lecture_hours=3, lecture_times=3, lab_hours=0, lab_times=0
+        )
+        CourseSchedule.objects.create(course=course, day='월', times='01,02', location='N14-101')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.service.clear_cache()
+            rebuilt = self.service.get_skeleton(2025, '1학기')
+        self.assertIn(course.course_id, rebuilt.course_slots)
+        self.assertNotEqual(built.fingerprint, rebuilt.fingerprint)
+
+    def test_schedule_time_edit_rebuilds(self):
+        self._import_catalog(seed=5, size=20)
+        with contextlib.redirect_stdout(io.StringIO()):
+            built = self.service.get_skeleton(2025, '1학기')
+
+        # 강좌/시간표 수와 최대 ID는 그대로 두고 한 시간표의 교시만 변경
+        schedule = CourseSchedule.objects.order_by('schedule_id').first()
+        schedule.times = '08,09' if schedule.times != '08,09' else '01,02'
+        schedule.save()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.service.clear_cache()
+            rebuilt = self.service.get_skeleton(2025, '1학기')
+
+        self.assertNotEqual(built.fingerprint, rebuilt.fingerprint)
+        self.assertEqual(
+            rebuilt.course_slots[schedule.course_id],
+            ModelBuilder().course_slots({'schedule': [
+                {'day': s.day, 'times': s.times}
+                for s in CourseSchedule.objects.filter(course_id=schedule.course_id).order_by('schedule_id')
+            ]})
+        )
+
+
+class GenerationQueryCountTest(TestCase):
+    """시간표 생성의 SQL 쿼리 수가 후보 과목 수와 무관하게 고정 상한 이내인지 확인 (N+1 조회 방지)"""
+
+    # 카테고리 클로저 조회와 사용자/학기/평점 조회 포함
+    MAX_QUERIES = 20
+
+    def setUp(self):
+        use_test_building_distances()
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.cache_dir.cleanup)
+        self.settings_override = override_settings(BASE_DIR=self.cache_dir.name)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        ConflictSkeletonService().clear_cache()
+        self.addCleanup(ConflictSkeletonService().clear_cache)
+        ModelCache().clear()
+
+        semester = Semester.objects.create(
+            year=2025, term='1학기',
+            start_date=datetime.date(2025, 3, 1), end_date=datetime.date(2025, 6, 30),
+            course_registration_start=datetime.date(2025, 2, 1),
+            course_registration_end=datetime.date(2025, 2, 28)
+        )
+        dept = Department.objects.create(
+            university=University.objects.create(university_name='테스트대학교'), dept_name='소프트웨어학부'
+        )
+        major_root = Category.objects.create(category_name='전공', version_year=2025)
+        general_root = Category.objects.create(category_name='교양', version_year=2025)
+        categories = {
+            '전공선택': Category.objects.create(
+                category_name='전공선택', parent_category=major_root, category_level=1, version_year=2025
+            ),
+            '일반교양': Category.objects.create(
+                category_name='인간과문화', category_level=2, version_year=2025,
+                parent_category=Category.objects.create(
+                    category_name='일반교양', parent_category=general_root, category_level=1, version_year=2025
+                )
+            ),
+        }
+        CategoryClosureService().rebuild()
+
+        candidate_data, _, _ = make_random_case(4, size=80)
+        for data in candidate_data:
+            course = Courses.objects.create(
+                category=categories['전공선택' if data['category'] in ('전공필수', '전공선택') else '일반교양'],
+                semester=semester, dept=dept,
+                course_name=data['course_name'], course_code=f"C{data['id']:04d}", section='01',
+                credits=data['credit'], target_year='전학년', instructor_name='김교수',
+                lecture_hours=3, lecture_times=3, lab_hours=0, lab_times=0
+            )
+            for sched in data['schedule']:
+                CourseSchedule.objects.create(
+                    course=course, day=sched['day'], times=sched['times'], location=sched['location']
+                )
+
+    def test_generation_query_count_is_bounded(self):
+        request = TimetableRequest(target_total=12, target_major=6, target_elective=6, optimization_level='BASIC')
+        with contextlib.redirect_stdout(io.StringIO()), CaptureQueriesContext(connection) as queries:
+            result = TimetableGenerationService().generate(AnonymousUser(), request)
+
+        self.assertGreater(result['found'], 0)
+        self.assertLessEqual(len(queries), self.MAX_QUERIES, [query['sql'] for query in queries])
+
+
+class GenerationStreamTest(TestCase):
+    """Phase 2 스트리밍이 찾은 해를 모두 보내지 않고 상위 시간표에 새로 든 해만 보내는지 확인"""
+
+    setUp = GenerationQueryCountTest.setUp
+
+    def test_stream_sends_only_top_entries(self):
+        request = TimetableRequest(target_total=12, target_major=6, target_elective=6, optimization_level='BASIC')
+        service = TimetableGenerationService()
+        events = []
+        with contextlib.redirect_stdout(io.StringIO()), \
+                mock.patch.object(SolverParameters, 'PHASE2_ENUMERATION_MODE', 'callback'), \
+                mock.patch.object(SolverParameters, 'ENABLE_SMALL_INSTANCE_BACKEND', False):
+            result = service.generate(AnonymousUser(), request, progress_callback=events.append)
+
+        streamed = [event for event in events if event.get('stage') == 'timetable']
+        found = service.solution_finder.last_phase2_stats['solutions']
+        self.assertGreater(result['found'], 0)
+        self.assertGreater(len(streamed), 0)
+        self.assertLess(len(streamed), found)
+        self.assertEqual([event['index'] for event in streamed], list(range(1, len(streamed) + 1)))
+
+
+class SolveJobManagerTest(TestCase):
+    """
+    작업 취소가 해당 작업에만 전달되고 작업 소유자만 취소·조회할 수 있는지,
+    워커 종료 시 그 워커가 실행하던 작업만 오류로 끝나는지 확인 (워커 프로세스 없이 관리자 상태만 사용)
+    """
+
+    def setUp(self):
+        # 싱글톤과 상태를 공유하지 않도록 별도 인스턴스 생성
+        self.manager = object.__new__(SolveJobManager)
+        self.manager._initialized = False
+        self.manager.__init__()
+        self.cancelled_job_id = multiprocessing.get_context('fork').Array('c', JOB_ID_LENGTH, lock=False)
+        self.manager._cancelled_job_ids = [self.cancelled_job_id]
+        self.manager._workers = [{'index': 0, 'pid': 100, 'alive': True}]
+
+    def _add_job(self, job_id, **fields):
+        job = SolveJob(job_id=job_id * JOB_ID_LENGTH, **fields)
+        self.manager._jobs[job.job_id] = job
+        return job
+
+    def test_cancel_after_next_job_started_on_same_worker(self):
+        # 워커가 A를 끝내고 B를 시작했지만, 관리자는 아직 A의 done 이벤트를 처리하지 않은 상태
+        job_a = self._add_job('a', user_id=1, status='running', worker_index=0)
+        job_b = self._add_job('b', user_id=2, status='running', worker_index=0)
+        token_a = CancellationToken(_JobCancelSignal(self.cancelled_job_id, job_a.job_id))
+        token_b = CancellationToken(_JobCancelSignal(self.cancelled_job_id, job_b.job_id))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(self.manager.cancel(job_a.job_id, 1))
+        self.assertTrue(token_a.cancelled)
+        self.assertFalse(token_b.cancelled)
+        self.assertEqual(job_b.status, 'running')
+
+    def test_worker_exit_fails_only_its_job(self):
+        # 워커 0(pid 100)에 넘겨진 작업 A만 실패, 재시작된 워커(pid 200)가 이어서 받은 작업 B는 그대로
+        job_a = self._add_job('a', user_id=1, status='running', worker_index=0)
+        job_b = self._add_job('b', user_id=2, status='queued')
+
+        with self.manager._condition:
+            self.manager._handle_worker_event({
+                'stage': 'worker_exited', 'worker': 0, 'pid': 100, 'exitcode': -9, 'job_id': job_a.job_id
+            })
+            self.manager._handle_worker_event({'stage': 'worker_started', 'worker': 0, 'pid': 200})
+
+        self.assertEqual(job_a.status, 'error')
+        self.assertEqual(job_b.status, 'queued')
+        self.assertEqual(self.manager._workers[0], {'index': 0, 'pid': 200, 'alive': True})
+
+    def test_only_owner_can_cancel(self):
+        user_job = self._add_job('u', user_id=1)
+        anonymous_job = self._add_job('s', session_key='session-1')
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(self.manager.cancel(user_job.job_id, None, 'session-1'))
+            self.assertFalse(self.manager.cancel(user_job.job_id, 2))
+            self.assertFalse(self.manager.cancel(anonymous_job.job_id, 1))
+            self.assertFalse(self.manager.cancel(anonymous_job.job_id, None, 'session-2'))
+            self.assertFalse(self.manager.cancel(anonymous_job.job_id, None))
+            self.assertTrue(self.manager.cancel(anonymous_job.job_id, None, 'session-1'))
+            self.assertTrue(self.manager.cancel(user_job.job_id, 1))
+
+    def test_done_drops_streamed_timetables(self):
+        job = self._add_job('d', user_id=1, status='running', events=[
+            {'stage': 'phase2'}, {'stage': 'timetable', 'index': 1, 'timetable': {'courses': []}}
+        ])
+        with self.manager._condition:
+            self.manager._finish(job, {'stage': 'done', 'timetables': []})
+
+        self.assertEqual(
+            job.events, [{'stage': 'phase2'}, {'stage': 'timetable', 'index': 1}, {'stage': 'done', 'timetables': []}]
+        )
+        self.assertEqual(self.manager.poll(job.job_id, 1, cursor=2)['events'], [{'stage': 'done', 'timetables': []}])
+
+    def test_only_owner_can_poll(self):
+        user_job = self._add_job('u', user_id=1, events=[{'stage': 'started'}])
+        anonymous_job = self._add_job('s', session_key='session-1')
+
+        self.assertIsNone(self.manager.poll(user_job.job_id, None))
+        self.assertIsNone(self.manager.poll(user_job.job_id, 2))
+        self.assertIsNone(self.manager.poll(anonymous_job.job_id, 1))
+        self.assertIsNone(self.manager.poll(anonymous_job.job_id, None, 'session-2'))
+        self.assertEqual(self.manager.poll(user_job.job_id, 1)['events'], [{'stage': 'started'}])
+        self.assertEqual(self.manager.poll(anonymous_job.job_id, None, 'session-1')['status'], 'queued')
+
+
+class SolverThreadAllocatorTest(TestCase):
+    """
+    워커 1개만 요청한 풀이(enumerate_all_solutions)에 최소 워커 수보다 많은 워커가 배정되지 않는지,
+    공유 잠금을 잡은 채 종료된 프로세스가 있어도 예산을 회수해 계속 배정하는지 확인
+    """
+
+    def setUp(self):
+        patcher = mock.patch.multiple(
+            SolverParameters, SOLVER_THREAD_BUDGET=4, SOLVER_MIN_THREADS_PER_SOLVE=2, SOLVER_THREAD_WAIT_TIMEOUT=0
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # 싱글톤과 상태를 공유하지 않도록 별도 인스턴스 생성
+        self.allocator = object.__new__(SolverThreadAllocator)
+        self.allocator._initialized = False
+        self.allocator.__init__()
+
+    def test_single_worker_request_on_wait_timeout(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.allocator.acquire(4), 4)
+            self.assertEqual(self.allocator.acquire(1), 1)
+        self.assertEqual(self.allocator.get_state()['wait_timeouts'], 1)
+
+    def test_single_worker_request_with_one_free_core(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(self.allocator.acquire(3), 3)
+            self.assertEqual(self.allocator.acquire(1), 1)
+            self.assertEqual(self.allocator.acquire(2), 2)  # 대기 시간 초과 → 최소 워커 수
+        self.assertEqual(self.allocator.get_state()['wait_timeouts'], 1)
+
+
+    def test_lock_held_by_dead_process_is_recovered(self):
+        allocator = self.allocator
+
+        def die_holding_lock():
+            allocator.acquire(2)
+            allocator._lock.acquire()
+            allocator._lock_holder.value = os.getpid()
+            os._exit(1)
+
+        process = multiprocessing.get_context('fork').Process(target=die_holding_lock)
+        process.start()
+        process.join()
+
+        with mock.patch.object(SolverThreadAllocator, 'LOCK_TIMEOUT', 0.1), \
+                contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(allocator.acquire(4), 4)
+        state = allocator.get_state()
+        self.assertEqual(state['in_use'], 4)
+        self.assertEqual([slot['pid'] for slot in state['processes']], [os.getpid()])
+
+class FarCoursePairsTest(TestCase):
+    """연속 교시 과목 쌍의 이동시간 제약 검출"""
+
+    def setUp(self):
+        use_test_building_distances()
+
+    def _course(self, cid, day, times, building):
+        return {
+            'id': cid, 'course_name': f'과목{cid}',
+            'schedule': [{'day': day, 'times': times, 'location': f'{building}-101'}],
+            'buildings': [building],
+        }
+
+    def test_pair_is_found_regardless_of_course_id_order(self):
+        constraints = ConstraintData(target_total=6, target_major=3, target_elective=3, max_walking_time=5)
+        candidate_data = [
+            self._course(1, '월', '03', 'S1'),    # 뒤 교시 과목의 ID가 더 작은 경우
+            self._course(2, '월', '02', 'N14'),
+            self._course(3, '월', '04', 'S21'),   # 같은 구역 (3분) → 제한 이내
+            self._course(4, '화', '03', 'E8'),    # 다른 요일 → 인접하지 않음
+        ]
+        self.assertEqual(sorted(ModelBuilder().far_course_pairs(candidate_data, constraints)), [(1, 2)])
+
+
+class TimeConstraintMaskTest(TestCase):
+    """요일별 허용 마스크 시간 제약 필터가 기존 방식과 같은 후보를 남기는지 확인"""
+
+    def _filter_both(self, candidate_data, *constraints):
+        with contextlib.redirect_stdout(io.StringIO()):
+            masked = [data['id'] for data in apply_time_constraints(candidate_data, *constraints)]
+            legacy = [data['id'] for data in apply_time_constraints_legacy(candidate_data, *constraints)]
+        self.assertEqual(masked, legacy)
+        return masked
+
+    def test_only_ranges_are_checked_per_range(self):
+        # 03~04교시(11~12시)는 두 허용 범위에 걸쳐 있으므로 어느 범위에도 속하지 않음
+        candidate_data = [
+            {'id': 1, 'schedule': [{'day': '월', 'times': '02,03', 'location': ''}]},
+            {'id': 2, 'schedule': [{'day': '월', 'times': '03,04', 'location': ''}]},
+            {'id': 3, 'schedule': [{'day': '토', 'times': '02', 'location': ''}]},
+            {'id': 4, 'schedule': [{'day': '월', 'times': '03,04', 'location': ''}], 'pre_added': True},
+        ]
+        only_ranges = [
+            {'days': DAYS, 'start_hour': 9, 'end_hour': 12},
+            {'days': DAYS, 'start_hour': 12, 'end_hour': 18},
+        ]
+        self.assertEqual(self._filter_both(candidate_data, only_ranges, [], [], [], []), [1, 4])
+
+    def test_random_constraints_match_legacy(self):
+        rng = random.Random(11)
+        candidate_data, _, _ = make_random_case(5, size=120)
+        for _ in range(30):
+            only_ranges = [
+                {'days': rng.sample(DAYS, 3), 'start_hour': rng.randint(8, 12), 'end_hour': rng.randint(12, 19)}
+            ] if rng.random() < 0.5 else []
+            avoid_times = [{'day': rng.choice(DAYS), 'hour': rng.randint(8, 18)}]
+            avoid_ranges = [{'days': rng.sample(DAYS, 2), 'start_hour': rng.randint(9, 17)}]
+            specific_ranges = [{'day': rng.choice(DAYS), 'start_hour': 13, 'end_hour': 15}]
+            self._filter_both(candidate_data, only_ranges, avoid_times, avoid_ranges, avoid_times, specific_ranges)
+
+
+class CandidatePrunerTest(TestCase):
+    """후보 축소가 미리 추가된 과목과 요일·교시별 대체 후보를 유지하는지 확인"""
+
+    def test_pruned_set_keeps_pre_added_and_slot_alternates(self):
+        candidate_data, constraints, _ = make_random_case(2, size=150)
+        scores = {data['id']: -data['id'] for data in candidate_data}
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = CandidatePruner().prune(candidate_data, constraints, scores)
+
+        kept_ids = {data['id'] for data in result.kept}
+        self.assertLess(len(result.kept), len(candidate_data))
+        self.assertTrue({data['id'] for data in candidate_data if data['pre_added']} <= kept_ids)
+
+        model_builder = ModelBuilder()
+        full_slots, _ = model_builder._conflict_groups(candidate_data)
+        for slot, members in full_slots.items():
+            kept_members = [cid for cid in members if cid in kept_ids]
+            self.assertGreaterEqual(
+                len(kept_members), min(len(members), SolverParameters.CANDIDATE_PRUNE_ALTERNATES_PER_SLOT)
+            )
+
+
+class SolutionPreferenceScoreTest(TestCase):
+    """구간 합으로 계산한 시간표 선호도 점수가 시간표별 계산과 같은지 확인"""
+
+    def test_segment_scores_match_per_timetable_scores(self):
+        candidate_data, _, _ = make_random_case(5, size=40)
+        rng = random.Random(5)
+        for data in candidate_data:
+            data['instructor_name'] = rng.choice(['김교수', '이교수', '박교수'])
+        criteria = ScoreCriteria(
+            preferred_instructors=['김'], avoid_instructors=['박'],
+            preferred_courses=['과목1'], avoid_courses=['과목2'], prefer_morning=True
+        )
+        solutions = [tuple(sorted(rng.sample(range(1, 41), rng.randint(0, 7)))) for _ in range(30)]
+        # 빈 시간표가 처음/중간/끝에 있어도 구간 합이 맞는지 확인
+        solutions = [()] + solutions + [(), (), (1, 2), ()]
+        by_id = {data['id']: data for data in candidate_data}
+
+        scorer = CourseScorer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            contributions = scorer.calculate_candidate_preference_contributions(candidate_data, criteria)
+            scores, matched = scorer.calculate_solution_preference_scores(solutions, contributions)
+            for row, course_ids in enumerate(solutions):
+                timetable = [
+                    {
+                        'instructor_name': by_id[cid]['instructor_name'],
+                        'course_name': by_id[cid]['course_name'],
+                        'category_name': by_id[cid]['category'],
+                        'schedules': by_id[cid]['schedule'],
+                    }
+                    for cid in course_ids
+                ]
+                expected_score, expected_matched = scorer.calculate_timetable_preference_score(timetable, criteria)
+                self.assertEqual(scores[row], expected_score)
+                self.assertEqual(
+                    list(matched[row]),
+                    [expected_matched['instructors'], expected_matched['courses'], expected_matched['avoided']]
+                )
+
+
+class CourseScoreArraysTest(TestCase):
+    """배열로 계산한 후보 과목 점수가 과목별 점수 계산과 같은지 확인"""
+
+    def setUp(self):
+        semester = Semester.objects.create(
+            year=2025, term='1학기',
+            start_date=datetime.date(2025, 3, 1), end_date=datetime.date(2025, 6, 30),
+            course_registration_start=datetime.date(2025, 2, 1),
+            course_registration_end=datetime.date(2025, 2, 28)
+        )
+        general_root = Category.objects.create(category_name='교양', version_year=2025)
+        general = Category.objects.create(
+            category_name='일반교양', parent_category=general_root, category_level=1, version_year=2025
+        )
+        self.major_required = Category.objects.create(category_name='전공필수', version_year=2025)
+        rows = [
+            (self.major_required, '자료구조', '김철수', 3, ['02,03', '04']),
+            (self.major_required, '운영체제실습', None, 3, ['06,07,08']),
+            (general, '철학개론', '이영희', 3, ['03,04']),
+            (general, '팀프로젝트와토론', '박민수', 2, ['05,06', '02']),
+            (general, '온라인 글쓰기', '김철수', 1, []),
+        ]
+        for index, (category, name, instructor, credits, times_list) in enumerate(rows):
+            course = Courses.objects.create(
+                category=category, semester=semester, course_name=name, course_code=f'C{index:03d}',
+                section='01', credits=credits, target_year='전학년', instructor_name=instructor,
+                lecture_hours=3, lecture_times=3, lab_hours=0, lab_times=0
+            )
+            for times in times_list:
+                CourseSchedule.objects.create(course=course, day='월', times=times, location='S4-1-101')
+        self.courses = list(
+            Courses.objects.select_related('category__parent_category').prefetch_related('courseschedule_set')
+            .order_by('course_id')
+        )
+
+    def test_batch_scores_match_per_course_scores(self):
+        scorer = CourseScorer()
+        review = mock.Mock(avg_rating=4.2)
+        for prefer_morning, prefer_afternoon in ((True, False), (False, True), (False, False)):
+            criteria = ScoreCriteria(
+                priority_map={self.major_required.category_id: 25.0},
+                preferred_instructors=['김'], avoid_instructors=['박민수'],
+                preferred_courses=['자료'], preference_tags=['#토론이 많은', '#이론 중심'],
+                prefer_morning=prefer_morning, prefer_afternoon=prefer_afternoon,
+                missing_gen_sub={'일반교양': 2},
+                review_summaries={('철학개론', '이영희'): review}
+            )
+            with contextlib.redirect_stdout(io.StringIO()):
+                scores = scorer.calculate_scores(self.courses, criteria)
+                expected = [
+                    (
+                        scorer._calculate_graduation_priority(course, criteria),
+                        scorer._calculate_preference_score(course, criteria),
+                        scorer._calculate_rating_score(course, criteria)
+                    )
+                    for course in self.courses
+                ]
+            self.assertEqual(scores.course_ids.tolist(), [course.course_id for course in self.courses])
+            self.assertEqual(
+                list(zip(
+                    scores.graduation_priority.tolist(), scores.preference_score.tolist(), scores.rating_score.tolist()
+                )),
+                expected
+            )
+
+
+class Phase2PlateauTest(TestCase):
+    """상위 K개가 채워진 뒤 연속 window개의 해가 상위권에 들지 못하면 정체로 판단하는지 확인"""
+
+    def test_plateau_after_window_without_top_k_entry(self):
+        scale = ScoringWeights.COMBINED_OBJECTIVE_SCALE
+        tracker = Phase2PlateauTracker(k=2, window=3, preference_bonus={1: 10})
+
+        self.assertFalse(tracker.add([2], 5 * scale))
+        self.assertFalse(tracker.add([3], 4 * scale))
+        # 선호도 보너스로 종합 점수가 커트라인(4)을 넘으면 진입
+        self.assertFalse(tracker.add([1], 0))
+        self.assertFalse(tracker.add([3], 3 * scale))
+        self.assertFalse(tracker.add([3], 5 * scale))
+        self.assertTrue(tracker.add([3], 4 * scale))
+
+        summary = tracker.summary()
+        self.assertEqual(summary['threshold'], 5)
+        self.assertEqual(summary['entries'], 3)
+
+    def test_callback_enumeration_records_plateau_stop(self):
+        use_test_building_distances()
+        candidate_data, constraints, preference_bonus = make_random_case(3, size=40)
+        constraints.prefer_compact = False
+        finder = SolutionFinder()
+        with contextlib.redirect_stdout(io.StringIO()), \
+                mock.patch.object(SolverParameters, 'PHASE2_PLATEAU_WINDOW', 2), \
+                mock.patch.dict(OptimizationLevel.BASIC, {'return_count': 1, 'min_quality': 0.5}):
+            model, x, objective_expr = ModelBuilder().build_model(candidate_data, constraints)
+            best = finder.find_optimal_solution(model, x, candidate_data, 'BASIC')
+            if best is None:
+                self.skipTest('해 없음')
+            timetables = finder.find_multiple_solutions(
+                model, x, candidate_data, 'BASIC', best, objective_expr,
+                enumeration_mode='callback', preference_bonus=preference_bonus
+            )
+
+        stats = finder.last_phase2_stats
+        self.assertEqual(stats['solutions'], len(timetables))
+        self.assertEqual(stats['stop_reason'], 'plateau')
+        self.assertEqual(stats['since_entry'], 2)
+
+
+class ObjectiveCompilerTest(TestCase):
+    """목적함수 계수를 축소해도 최적값이 원래 단위로 보고되는지 확인"""
+
+    def setUp(self):
+        use_test_building_distances()
+
+    def test_reduced_objective_reports_original_units(self):
+        for seed in range(5):
+            candidate_data, constraints, _ = make_random_case(seed)
+            with self.subTest(seed=seed), contextlib.redirect_stdout(io.StringIO()):
+                model_builder = ModelBuilder()
+                model, x, objective_expr = model_builder.build_model(candidate_data, constraints)
+                self.assertGreater(model_builder.last_objective_stats['divisor'], 1)
+
+                solver = cp_model.CpSolver()
+                if solver.Solve(model) == cp_model.INFEASIBLE:
+                    continue
+                self.assertEqual(round(solver.ObjectiveValue()), solver.Value(objective_expr))
+
+
+class ModelReuseTest(TestCase):
+    """Phase 1/2가 구성된 모델을 변경하지 않아 다른 최적화 수준과 캐시에서 재사용할 수 있는지 확인"""
+
+    def setUp(self):
+        use_test_building_distances()
+        ModelCache().clear()
+        self.addCleanup(ModelCache().clear)
+
+    def test_phases_leave_built_model_unchanged(self):
+        candidate_data, constraints, preference_bonus = make_random_case(1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model, x, objective_expr = ModelCache().get_or_build(ModelBuilder(), candidate_data, constraints)
+            built = model.Proto().SerializeToString()
+
+            finder = SolutionFinder()
+            best = finder.find_optimal_solution(model, x, candidate_data, 'BASIC', hint_ids=[1, 2, 3])
+            self.assertIsNotNone(best)
+            for mode in ('iterative', 'callback'):
+                finder.find_multiple_solutions(
+                    model, x, candidate_data, 'BASIC', best, objective_expr,
+                    enumeration_mode=mode, hint_ids=finder.last_selected_ids
+                )
+            finder.find_top_k_solutions(
+                model, x, candidate_data, preference_bonus, 'BASIC', best, objective_expr,
+                hint_ids=finder.last_selected_ids
+            )
+            self.assertEqual(built, model.Proto().SerializeToString())
+
+            cached, _, _ = ModelCache().get_or_build(ModelBuilder(), candidate_data, constraints)
+            self.assertIs(cached, model)
+            self.assertEqual(round(best), round(finder.find_optimal_solution(cached, x, candidate_data, 'ADVANCED')))
+
+    def test_distance_reload_invalidates_cached_model(self):
+        candidate_data, constraints, _ = make_random_case(2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            model, _, _ = ModelCache().get_or_build(ModelBuilder(), candidate_data, constraints)
+            self.assertIs(ModelCache().get_or_build(ModelBuilder(), candidate_data, constraints)[0], model)
+
+            # 거리 캐시가 교체되면 cache_token이 달라져 모델을 다시 구성
+            token = BuildingDistanceService().cache_token
+            use_test_building_distances()
+            self.assertIsNot(BuildingDistanceService().cache_token, token)
+            self.assertIsNot(ModelCache().get_or_build(ModelBuilder(), candidate_data, constraints)[0], model)
+
+
+class SolutionHintProviderTest(TestCase):
+    """직전 생성 결과 힌트가 프로세스 메모리가 아닌 DB에 저장되어 다른 인스턴스(워커)에서도 보이는지 확인"""
+
+    def test_last_result_is_shared_through_db(self):
+        candidate_data, constraints, _ = make_random_case(2)
+        with contextlib.redirect_stdout(io.StringIO()):
+            SolutionHintProvider().remember_result(7, [5, 6])
+            SolutionHintProvider().remember_result(7, [3, 1, 99])
+            source, hint_ids = SolutionHintProvider().get_hint(7, candidate_data, constraints)
+        self.assertEqual(source, 'last_result')
+        self.assertEqual(hint_ids, [3, 1])
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            source, _ = SolutionHintProvider().get_hint(8, candidate_data, constraints)
+        self.assertNotEqual(source, 'last_result')
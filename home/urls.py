@@ -17,6 +17,9 @@ urlpatterns = [
 
     path('timetable/', timetable_view, name='timetable'),  # 시간표 페이지
     path('generate_timetable_stream/', generate_timetable_stream, name='generate_timetable_stream'),
+    path('api/timetable-jobs/<str:job_id>/', timetable_job_status, name='timetable-job-status'),
+    path('api/timetable-jobs/<str:job_id>/cancel/', cancel_timetable_job, name='timetable-job-cancel'),
+    path('api/solver-status/', solver_status, name='solver-status'),
     path("parse_constraints/", parse_constraints, name="parse_constraints"),
 
     # 자연어 기반 시간표 생성 API
@@ -5,10 +5,16 @@
 
 import json
 import re
-from typing import List, Set
+from typing import List, Set, Dict, Tuple
 from collections import defaultdict
+from functools import lru_cache
+import numpy as np
 from data_manager.services.course_filter_service import CourseFilterService
-from data_manager.models import Department
+from data_manager.models import Department, CourseSchedule
+
+# 교시 비트마스크 (n교시 → 1 << n)
+TIME_SLOT_BASE_HOUR = 8  # CLASS_START_HOUR (0교시 시작 시각)
+TIME_SLOT_BITS = 64      # 마스크 판정은 uint64 배열로 수행
 
 
 def parse_time_slots(times_str: str, add_base_hour: bool = False) -> List[int]:
@@ -62,6 +68,42 @@ def parse_time_slots_to_set(times_str: str) -> Set[str]:
         return set()
 
 
+def parse_course_schedule(course) -> Tuple[List[Dict[str, str]], List[str]]:
+    """
+    강의의 CourseSchedule을 후보 과목 스케줄 형식으로 변환
+
+    Args:
+        course: Courses 객체 (courseschedule_set prefetch 권장)
+
+    Returns:
+        (스케줄 리스트 [{'day', 'times', 'location'}], 강의실 위치 리스트)
+        times에 "시간@강의실" 형식이 들어 있으면 강의실을 분리하고, 시간이 비어 있는 스케줄은 제외
+    """
+    schedule_list = []
+    locations = []
+
+    for sch in course.courseschedule_set.all():
+        raw = sch.times.strip()
+        if "@" in raw:
+            parts = raw.split("@", 1)
+            raw_time = parts[0].strip()
+            loc = parts[1].strip()
+        else:
+            raw_time = raw
+            loc = sch.location
+        if not raw_time:
+            continue
+
+        schedule_list.append({
+            'day': sch.day,
+            'times': raw_time,
+            'location': loc
+        })
+        locations.append(loc)
+
+    return schedule_list, locations
+
+
 class DummyObj:
     """CP-SAT 조건 처리용 더미 객체"""
     def __init__(self, data):
@@ -130,10 +172,140 @@ def extract_missing_required_major_courses(user_dept_id, completed_courses):
     return missing_courses
 
 
+def _hour_slot_mask(start_hour: int, end_hour=None) -> int:
+    """[start_hour, end_hour) 시각(8 + 교시)에 해당하는 교시 비트마스크 (end_hour가 없으면 끝까지)"""
+    first = max(0, int(start_hour) - TIME_SLOT_BASE_HOUR)
+    last = TIME_SLOT_BITS if end_hour is None else min(TIME_SLOT_BITS, int(end_hour) - TIME_SLOT_BASE_HOUR)
+    if last <= first:
+        return 0
+    return ((1 << (last - first)) - 1) << first
+
+
+@lru_cache(maxsize=4096)
+def schedule_slot_mask(times_str: str) -> int:
+    """시간 문자열의 교시 비트마스크 (CourseSchedule.parse_periods 기준, n교시 → 1 << n)"""
+    mask = 0
+    for period in CourseSchedule.parse_periods(times_str):
+        mask |= 1 << period
+    return mask
+
+
+def compile_time_constraint_masks(
+    only_ranges, avoid_times, avoid_ranges, specific_avoid_times=None, specific_avoid_time_ranges=None
+) -> Tuple[Dict[str, List[int]], List[int]]:
+    """
+    시간 제약조건을 요일별 허용 교시 마스크로 변환
+
+    Returns:
+        (요일별 허용 마스크 목록, 목록에 없는 요일의 허용 마스크 목록)
+        스케줄은 해당 요일의 허용 마스크 중 하나에 모든 교시가 포함되어야 통과
+        (only_ranges는 범위마다 따로 판단하므로 요일별로 범위 수만큼 마스크가 생김)
+    """
+    forbidden = defaultdict(int)
+    for obj in list(avoid_times or []) + list(specific_avoid_times or []):
+        forbidden[obj['day']] |= _hour_slot_mask(obj['hour'], int(obj['hour']) + 1)
+    for r in avoid_ranges or []:
+        for day in r['days']:
+            forbidden[day] |= _hour_slot_mask(r['start_hour'], r.get('end_hour'))
+    for obj in specific_avoid_time_ranges or []:
+        forbidden[obj['day']] |= _hour_slot_mask(obj['start_hour'], obj.get('end_hour'))
+
+    full_mask = (1 << TIME_SLOT_BITS) - 1
+    if only_ranges:
+        # 허용 범위가 없는 요일의 스케줄은 통과하지 못함
+        allowed = defaultdict(list)
+        for r in only_ranges:
+            for day in r['days']:
+                allowed[day].append(_hour_slot_mask(r['start_hour'], r.get('end_hour')))
+        default = []
+    else:
+        allowed = {}
+        default = [full_mask]
+
+    day_masks = {
+        day: [mask & ~forbidden[day] for mask in allowed.get(day, default)]
+        for day in set(allowed) | set(forbidden)
+    }
+    return day_masks, default
+
+
 def apply_time_constraints(candidate_data, only_ranges, avoid_times, avoid_ranges, specific_avoid_times=None, specific_avoid_time_ranges=None):
     """
     시간 제약조건을 적용하여 후보 강좌 목록을 필터링합니다.
 
+    Args:
+        candidate_data: 후보 강좌 데이터 리스트
+        only_ranges: 허용할 시간대 목록
+        avoid_times: 피해야 할 특정 시간 목록
+        avoid_ranges: 피해야 할 시간대 목록
+        specific_avoid_times: 특정 요일+시간 회피 목록
+        specific_avoid_time_ranges: 특정 요일+시간범위 회피 목록
+
+    Returns:
+        필터링된 후보 강좌 데이터 리스트
+
+    Note:
+        필수 과목(pre_added=True)은 시간 제약 조건을 무시하고 항상 포함됩니다.
+
+        제약조건을 요일별 허용 교시 마스크로 한 번 변환한 뒤, 모든 후보 스케줄을 NumPy 비트 연산 한 번으로 판정합니다.
+        결과는 apply_time_constraints_legacy와 같습니다.
+    """
+    if not (only_ranges or avoid_times or avoid_ranges or specific_avoid_times or specific_avoid_time_ranges):
+        return candidate_data
+
+    day_masks, default_masks = compile_time_constraint_masks(
+        only_ranges, avoid_times, avoid_ranges, specific_avoid_times, specific_avoid_time_ranges
+    )
+
+    # 스케줄 단위 배열: 소속 후보 인덱스, 교시 마스크, 요일 인덱스
+    days = {}
+    owners, slot_masks, day_index = [], [], []
+    for index, data in enumerate(candidate_data):
+        for sched in data['schedule']:
+            owners.append(index)
+            slot_masks.append(schedule_slot_mask(sched['times']))
+            day_index.append(days.setdefault(sched['day'], len(days)))
+
+    if any(mask >> TIME_SLOT_BITS for mask in slot_masks):
+        return apply_time_constraints_legacy(
+            candidate_data, only_ranges, avoid_times, avoid_ranges, specific_avoid_times, specific_avoid_time_ranges
+        )
+
+    # 요일 × 허용 마스크 행렬 (요일마다 마스크 수가 다르므로 valid로 빈 칸 표시)
+    per_day = [day_masks.get(day, default_masks) for day in days]
+    width = max([len(masks) for masks in per_day] + [1])
+    allowed = np.zeros((len(days), width), dtype=np.uint64)
+    valid = np.zeros((len(days), width), dtype=bool)
+    for row, masks in enumerate(per_day):
+        allowed[row, :len(masks)] = masks
+        valid[row, :len(masks)] = True
+
+    owners = np.asarray(owners, dtype=np.int64)
+    slot_masks = np.asarray(slot_masks, dtype=np.uint64)
+    day_index = np.asarray(day_index, dtype=np.int64)
+    schedule_ok = (
+        ((slot_masks[:, None] & ~allowed[day_index]) == 0) & valid[day_index]
+    ).any(axis=1)
+
+    # 스케줄 하나라도 걸리면 제외, 필수 과목(pre_added)은 항상 포함
+    violations = np.bincount(owners[~schedule_ok], minlength=len(candidate_data))
+    pre_added = np.fromiter(
+        (bool(data.get('pre_added', False)) for data in candidate_data), dtype=bool, count=len(candidate_data)
+    )
+    keep = (violations == 0) | pre_added
+
+    for index in np.flatnonzero(pre_added & (violations > 0)):
+        print(f"DEBUG: 필수 과목 시간 제약 무시 - {candidate_data[index].get('course_name', 'Unknown')}")
+    print(f"DEBUG: 시간 제약으로 {int((~keep).sum())}개 과목 제외")
+
+    return [data for data, ok in zip(candidate_data, keep) if ok]
+
+
+def apply_time_constraints_legacy(candidate_data, only_ranges, avoid_times, avoid_ranges, specific_avoid_times=None, specific_avoid_time_ranges=None):
+    """
+    시간 제약조건을 적용하여 후보 강좌 목록을 필터링합니다. (기존 방식, 벤치마크/검증용)
+    제약 종류마다 후보 전체를 다시 순회하며 스케줄 × 시간 × 제약 조합을 하나씩 비교합니다.
+
     Args:
         candidate_data: 후보 강좌 데이터 리스트
         only_ranges: 허용할 시간대 목록
@@ -10,6 +10,8 @@ from django.views.decorators.http import require_http_methods
 
 from home.services.nl_timetable_service import NaturalLanguageTimetableService
 from home.services.timetable_generation_service import TimetableGenerationService
+from home.services.solve_jobs import SolveJobManager, SolveQueueFullError
+from home.views.timetable_config import SolverParameters, ValidationMessages
 
 
 @csrf_exempt
@@ -101,11 +103,13 @@ def nl_generate_timetable(request):
     Request Body:
         {
             "constraints": {...},
-            "session_id": "user_1234567890"
+            "session_id": "user_1234567890",
+            "wait": true    # false면 작업 ID만 즉시 반환 (202)
         }
 
     Response:
         {
+            "job_id": "...",
             "timetables": [...],
             "message": "생성 완료 메시지"
         }
@@ -114,6 +118,7 @@ def nl_generate_timetable(request):
         data = json.loads(request.body)
         constraints = data.get('constraints', {})
         session_id = data.get('session_id', 'default')
+        wait = data.get('wait', True)
 
         user = request.user
         if not user.is_authenticated:
@@ -130,11 +135,33 @@ def nl_generate_timetable(request):
                 constraints, user
             )
 
-            # 시간표 생성
-            generation_service = TimetableGenerationService()
-            result = generation_service.generate(user, timetable_request)
+            # 시간표 생성 (작업 큐 사용 시 워커 프로세스에서 실행 후 결과 대기)
+            job_id = None
+            if SolverParameters.USE_SOLVE_JOB_POOL:
+                manager = SolveJobManager()
+                try:
+                    job_id = manager.submit(user.id, timetable_request)
+                except SolveQueueFullError:
+                    return JsonResponse({
+                        'error': ValidationMessages.SOLVE_QUEUE_FULL,
+                        'message': f"😔 {ValidationMessages.SOLVE_QUEUE_FULL}"
+                    }, status=503)
+
+                if not wait:
+                    # 진행 상황은 /api/timetable-jobs/<job_id>/ 로 조회, 취소는 .../cancel/
+                    return JsonResponse({'job_id': job_id, 'status': 'queued'}, status=202)
+
+                result = manager.wait(job_id) or {}
+            else:
+                generation_service = TimetableGenerationService()
+                result = generation_service.generate(user, timetable_request)
+
+            response_data = {'job_id': job_id}
 
-            response_data = {}
+            if result.get('stage') == 'cancelled':
+                response_data['cancelled'] = True
+                response_data['message'] = "시간표 생성이 취소되었습니다."
+                return JsonResponse(response_data)
 
             # 생성 결과 추가
             if result.get('error'):
@@ -43,6 +43,9 @@ class ScoringWeights:
     ELECTIVE_COURSE_WEIGHT = 600       # 전공선택 우선순위
     GENERAL_CATEGORY_BONUS_WEIGHT = 500  # 교양 카테고리 충족 보너스 (신규)
 
+    # 종합 점수 = 목적함수 값 / COMBINED_OBJECTIVE_SCALE + 시간표 선호도 점수
+    COMBINED_OBJECTIVE_SCALE = 1000
+
     # 선호도 점수 (개별 항목)
     PREFERRED_INSTRUCTOR_BONUS = 100   # 선호 교수 보너스
     AVOIDED_INSTRUCTOR_PENALTY = -200  # 기피 교수 패널티
@@ -108,6 +111,76 @@ class SolverParameters:
     PHASE2_NUM_WORKERS = 4          # 병렬 처리 워커 수
     PHASE2_MAX_SOLUTIONS = 100      # 최대 해 개수 (1500 -> 100, 성능 향상)
 
+    # Phase 2 탐색 방식
+    # - 'topk': 선호도 점수를 목적함수에 포함해 반환할 상위 K개만 순서대로 증명 (기본값)
+    # - 'callback': 솔루션 콜백으로 한 번의 탐색에서 여러 해 수집
+    # - 'iterative': 해마다 Solve()를 다시 호출하고 no-good 제약 추가 (기존 방식, 벤치마크용)
+    PHASE2_ENUMERATION_MODE = 'topk'
+    PHASE2_MIN_DIFFERENT_COURSES = 1  # 다양성: 이미 찾은 시간표의 과목 중 최소 몇 개가 빠져야 하는지
+    # 다양성 비교 단위
+    # - 'slot': 요일·교시·건물이 같은 분반은 같은 과목으로 봄 (분반만 바뀐 시간표 제외, 기본값)
+    # - 'course_code': 과목 코드가 같으면 같은 과목 (시간이 다른 분반으로 바꾼 시간표도 제외)
+    # - 'section': 분반마다 다른 과목 (기존 방식)
+    PHASE2_DIVERSITY_KEY = 'slot'
+    # 정체 조기 종료 (callback/iterative): 종합 점수 상위 return_count개가 채워진 뒤
+    # 연속 PHASE2_PLATEAU_WINDOW개의 해가 상위권에 들지 못하면 탐색 종료 (0이면 사용 안 함)
+    PHASE2_PLATEAU_WINDOW = 200
+    REPORT_PHASE2_MEMORY = False    # Phase 2 ~ 정렬 구간 최대 메모리 출력 (tracemalloc, 디버그용)
+
+    # 밀집도(prefer_compact) 인코딩 방식
+    # 'span': 요일별 첫/마지막 교시 정수 변수로 공강 시간 계산 (요일당 변수 4개)
+    # 'pairwise': 요일별 인접 후보 쌍마다 곱 변수 (기존 방식, 후보 수에 비례해 모델이 커짐)
+    # 2025-1 실제 개설 강좌 기준 span은 공강 0시간으로 최적 증명(1~3초), pairwise는 공강 6~19시간
+    # (python manage.py benchmark_solver compactness)
+    COMPACTNESS_ENCODING = 'span'
+
+    # 시간 충돌 제약 인코딩 방식
+    # 'clique': 충돌 그래프의 극대 클리크마다 AddAtMostOne 하나 (겹치는 슬롯별 제약을 합쳐 더 강한 제약으로 표현)
+    # 'slot': (요일, 교시) 슬롯과 강의명마다 sum(x) <= 1 (기존 방식, 벤치마크용)
+    CONFLICT_ENCODING = 'clique'
+
+    # 목적함수 계수를 최대공약수로 축소 (ObjectiveValue()는 scaling_factor로 원래 단위 유지)
+    ENABLE_OBJECTIVE_COMPILER = True
+
+    # 구성된 CP-SAT 모델 재사용 (같은 후보·제약으로 다시 생성할 때 모델 구성 생략)
+    ENABLE_MODEL_CACHE = True
+    MODEL_CACHE_SIZE = 8            # 프로세스당 보관할 모델 수 (LRU)
+
+    # 모델 구성 전 동등 분반 병합 및 지배 후보 제거
+    ENABLE_CANDIDATE_PRESOLVE = True
+
+    # 요건 버킷별 후보 축소 (축소한 모델에 해가 없으면 전체 후보로 재시도)
+    ENABLE_CANDIDATE_PRUNING = True
+    CANDIDATE_PRUNE_MIN_CANDIDATES = 60     # 후보가 이 개수 이하이면 축소하지 않음
+    CANDIDATE_PRUNE_BUCKET_FACTOR = 6       # 버킷별 남길 수 = 최대 선택 가능 과목 수 x 배수
+    CANDIDATE_PRUNE_MIN_PER_BUCKET = 8      # 버킷별 최소로 남길 후보 수
+    CANDIDATE_PRUNE_ALTERNATES_PER_SLOT = 3  # 요일·교시마다 최소로 남길 후보 수
+    CANDIDATE_PRUNE_REPORT_GAP = False      # 전체 후보 모델도 풀어 최적값 차이 출력 (디버그용, 풀이 2회)
+
+    # Phase 1 웜 스타트 힌트 (직전 생성 결과 → 저장된 시간표 → 탐욕적 휴리스틱 순)
+    ENABLE_SOLUTION_HINTS = True
+
+    # 학기별 충돌 골격 (슬롯 클리크/동일 강의명/연속 교시 이동시간 쌍을 학기 단위로 미리 계산해 재사용)
+    ENABLE_CONFLICT_SKELETON = True
+    CONFLICT_SKELETON_CACHE_DIR = 'cache/conflict_skeleton'  # BASE_DIR 기준 디스크 캐시 경로
+
+    # 소규모 인스턴스 백엔드: 후보가 이 개수 이하이면 CP-SAT 대신 비트셋 분기 한정 탐색 사용
+    ENABLE_SMALL_INSTANCE_BACKEND = True
+    SMALL_INSTANCE_MAX_CANDIDATES = 30
+
+    # 시간표 생성 작업 큐 (미리 fork한 워커 프로세스 풀에서 실행)
+    USE_SOLVE_JOB_POOL = True
+    JOB_WORKER_PROCESSES = 2        # 워커 프로세스 수
+    JOB_MAX_QUEUE_DEPTH = 8         # 대기 + 실행 중 작업 수 상한
+    JOB_RESULT_TTL = 600            # 완료된 작업 결과 보관 시간 (초)
+    JOB_CANCEL_PREVIOUS_ON_SUBMIT = True  # 같은 사용자가 다시 요청하면 이전 작업 취소
+    JOB_SUPERVISOR_CHECK_INTERVAL = 1.0   # 워커 감독 프로세스의 종료 요청/웹 프로세스 확인 간격 (초)
+
+    # 솔버 스레드 예산 (동시에 실행되는 모든 Solve()가 나눠 씀)
+    SOLVER_THREAD_BUDGET = None     # 전체 워커 스레드 수 (None이면 CPU 코어 수)
+    SOLVER_MIN_THREADS_PER_SOLVE = 2  # 이보다 적게 남으면 대기
+    SOLVER_THREAD_WAIT_TIMEOUT = 30   # 최대 대기 시간 (초), 지나면 최소 워커 수로 실행
+
 # ============================================================================
 # 필터링 관련 상수
 # ============================================================================
@@ -182,6 +255,8 @@ class ValidationMessages:
     NO_SOLUTION_FOUND = "해결책을 찾지 못했습니다."
     NO_TIMETABLE_FOUND = "조건에 맞는 시간표를 찾지 못했습니다. 조건을 변경해보세요."
     SUCCESS_MESSAGE_TEMPLATE = "선호도 순으로 정렬된 {count}개의 시간표를 찾았습니다."
+    SOLVE_QUEUE_FULL = "현재 시간표 생성 요청이 많습니다. 잠시 후 다시 시도해주세요."
+    SOLVE_JOB_NOT_FOUND = "시간표 생성 작업을 찾을 수 없습니다."
 
     # 학점 범위 경고
     ABNORMAL_TOTAL_CREDITS = "비정상적인 총 학점 요청"
@@ -4,7 +4,9 @@
 """
 
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Set, Any
+from typing import List, Dict, Optional, Set, Any, Tuple
+
+import numpy as np
 
 
 # ============================================================================
@@ -177,6 +179,21 @@ class ScoreCriteria:
     review_summaries: Dict[tuple, Any] = field(default_factory=dict)
 
 
+@dataclass
+class CourseScoreArrays:
+    """후보 과목 점수 배열 (CourseScorer.calculate_scores 결과, 입력 과목 순서와 같은 순서)"""
+
+    course_ids: np.ndarray
+    graduation_priority: np.ndarray
+    preference_score: np.ndarray
+    rating_score: np.ndarray
+
+    @property
+    def total(self) -> np.ndarray:
+        """과목별 점수 합계"""
+        return self.graduation_priority + self.preference_score + self.rating_score
+
+
 # ============================================================================
 # 모델 구성 관련 데이터 클래스
 # ============================================================================
@@ -200,6 +217,62 @@ class ConstraintData:
     prefer_compact: bool = False
 
 
+@dataclass
+class PresolveResult:
+    """후보 과목 전처리(동등 분반 병합, 지배 후보 제거) 결과"""
+
+    # 솔버에 전달할 대표 후보 과목 리스트
+    representatives: List[Dict[str, Any]] = field(default_factory=list)
+
+    # 대표 과목 ID -> 동등한 다른 분반 후보 리스트
+    equivalents: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    # 지배되어 제거된 후보 과목 ID
+    dominated_ids: List[int] = field(default_factory=list)
+
+    # 전처리 전 후보 수
+    original_count: int = 0
+
+
+@dataclass
+class PruneResult:
+    """요건 버킷별 후보 축소 결과"""
+
+    # 솔버에 전달할 후보 과목 리스트
+    kept: List[Dict[str, Any]] = field(default_factory=list)
+
+    # 버킷(이수구분/교양 세부 카테고리) -> 남긴 상위 후보 수
+    bucket_sizes: Dict[str, int] = field(default_factory=dict)
+
+    # 시간대별 대체 후보로 추가된 과목 수
+    alternate_count: int = 0
+
+    # 축소 전 후보 수
+    original_count: int = 0
+
+
+@dataclass
+class ConflictSkeleton:
+    """
+    학기별 충돌 골격
+    개설 강좌와 건물 거리만으로 정해지는 제약 구조를 미리 계산해 두고 요청마다 후보 ID로 잘라 사용
+    """
+
+    # 학기 및 생성 당시 카탈로그 지문 (디스크 캐시 유효성 확인용)
+    semester: str
+    fingerprint: Tuple
+
+    # 과목 ID -> 수업 슬롯 목록 [(요일, 시각)] (같은 슬롯의 과목들이 충돌 클리크)
+    course_slots: Dict[int, List[Tuple[str, int]]] = field(default_factory=dict)
+
+    # 과목 ID -> 강의명 (같은 강의명 그룹)
+    course_names: Dict[int, str] = field(default_factory=dict)
+
+    # 과목 ID -> 연속 교시로 이어지는 과목 [(상대 과목 ID, 최대 이동시간)]
+    # 이동시간 내림차순 정렬: 제한 시간별 버킷은 앞에서부터 제한을 넘는 구간까지 자르면 됨
+    adjacent_pairs: Dict[int, List[Tuple[int, int]]] = field(default_factory=dict)
+
+
 # ============================================================================
 # 해 관련 데이터 클래스
 # ============================================================================
@@ -214,6 +287,47 @@ class TimetableSolution:
     recommendation_level: str = "★★★"
 
 
+@dataclass
+class CompactSolution:
+    """
+    Phase 2 해의 압축 표현 (정렬된 과목 ID 튜플)
+    과목 딕셔너리는 최종 반환할 시간표만 SolutionFinder.hydrate_solution()로 구성
+    """
+
+    course_ids: Tuple[int, ...]
+    objective_value: float
+    objective_percentage: float
+
+
+# ============================================================================
+# 작업 큐 관련 데이터 클래스
+# ============================================================================
+
+@dataclass
+class SolveJob:
+    """시간표 생성 작업 (워커 프로세스 풀에서 실행)"""
+
+    job_id: str
+    user_id: Optional[int] = None
+
+    # 비로그인 사용자의 세션 키 (작업 소유자 확인용, 로그인 사용자는 None)
+    session_key: Optional[str] = None
+
+    # 상태: queued, running, done, error, cancelled
+    status: str = 'queued'
+
+    # 워커가 보낸 진행 이벤트 (stream/poll 대상)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+
+    # 실행 중인 워커 프로세스 번호
+    worker_index: Optional[int] = None
+
+    # 시각 (time.time())
+    created_at: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
 # ============================================================================
 # 유틸리티 함수
 # ============================================================================
@@ -5,12 +5,13 @@
 
 import os
 import json
+import itertools
 import traceback
 from collections import defaultdict
 from django.db.models.functions import Upper
 from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
-from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from ortools.sat.python import cp_model
 
 from data_manager.services.course_filter_service import CourseFilterService
@@ -19,6 +20,9 @@ from ..utils import (
     get_effective_general_category, get_simplified_category_name,
     extract_missing_required_major_courses, apply_time_constraints, DummyObj
 )
+from .timetable_config import SolverParameters, ValidationMessages
+from ..services.solve_jobs import SolveJobManager, SolveQueueFullError
+from ..services.solver_threads import SolverThreadAllocator
 import re
 
 
@@ -91,6 +95,18 @@ def get_building_distance(from_building, to_building):
     return cache.get((from_building, to_building), 5)
 
 
+def _job_owner(request):
+    """
+    시간표 생성 작업 소유자 정보 (사용자 ID, 세션 키)
+    비로그인 사용자는 세션 키로 작업을 구분하므로 세션이 없으면 새로 생성
+    """
+    if request.user.is_authenticated:
+        return request.user.id, None
+    if not request.session.session_key:
+        request.session.save()
+    return None, request.session.session_key
+
+
 def generate_timetable_stream(request):
     """
     시간표 생성 메인 함수 (리팩토링 버전)
@@ -106,21 +122,76 @@ def generate_timetable_stream(request):
         parser = ParameterParser()
         timetable_request = parser.parse_request(request)
 
-        # 2. 시간표 생성 서비스 실행
-        service = TimetableGenerationService()
-        result = service.generate(request.user, timetable_request)
+        # 2. 시간표 생성 실행 (단계별 진행 → 탐색 중 시간표 → 최종 결과 순으로 전송)
+        if SolverParameters.USE_SOLVE_JOB_POOL:
+            # 워커 프로세스 풀에 작업을 등록하고 진행 이벤트만 중계
+            manager = SolveJobManager()
+            user_id, session_key = _job_owner(request)
+            try:
+                job_id = manager.submit(user_id, timetable_request, session_key=session_key)
+            except SolveQueueFullError:
+                return JsonResponse({"error": ValidationMessages.SOLVE_QUEUE_FULL}, status=503)
+
+            queued_event = {'progress': '대기중', 'stage': 'queued', 'job_id': job_id, 'message': "시간표 생성 대기 중"}
+            events = itertools.chain([queued_event], manager.stream(job_id, cancel_on_close=True))
+        else:
+            events = TimetableGenerationService().generate_stream(request.user, timetable_request)
 
         # 3. 응답 반환
         def event_stream():
-            yield f"data: {json.dumps(result, ensure_ascii=False)}\n\n"
+            for event in events:
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
 
-        return StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+        response = StreamingHttpResponse(event_stream(), content_type="text/event-stream")
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # 프록시 버퍼링 방지
+        return response
 
     except Exception as e:
         traceback.print_exc()
         return JsonResponse({"error": str(e)}, status=500)
 
 
+def timetable_job_status(request, job_id):
+    """
+    시간표 생성 작업 상태 조회 (폴링용, 작업을 등록한 사용자/세션만 가능)
+    cursor 쿼리 파라미터 이후의 새 이벤트만 반환
+    """
+    try:
+        cursor = int(request.GET.get('cursor', 0))
+    except ValueError:
+        cursor = 0
+
+    user_id, session_key = _job_owner(request)
+    snapshot = SolveJobManager().poll(job_id, user_id, session_key, cursor=cursor)
+    if snapshot is None:
+        return JsonResponse({"error": ValidationMessages.SOLVE_JOB_NOT_FOUND}, status=404)
+    return JsonResponse(snapshot)
+
+
+@csrf_protect
+def cancel_timetable_job(request, job_id):
+    """시간표 생성 작업 취소 API (진행 중인 CP-SAT 탐색 중단, 작업을 등록한 사용자/세션만 가능)"""
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST 요청만 허용됩니다.'}, status=405)
+
+    user_id, session_key = _job_owner(request)
+    manager = SolveJobManager()
+    cancelled = manager.cancel(job_id, user_id, session_key)
+    snapshot = manager.poll(job_id, user_id, session_key)
+    if snapshot is None:
+        return JsonResponse({"error": ValidationMessages.SOLVE_JOB_NOT_FOUND}, status=404)
+    return JsonResponse({'job_id': job_id, 'cancelled': cancelled, 'status': snapshot['status']})
+
+
+def solver_status(request):
+    """솔버 스레드 예산과 작업 큐 상태 조회 (모니터링용)"""
+    return JsonResponse({
+        'solver_threads': SolverThreadAllocator().get_state(),
+        'jobs': SolveJobManager().get_state()
+    })
+
+
 def manage_view(request):
     """시간표 관리 페이지 - 저장된 시간표 목록 조회"""
     user_id = request.user.id if request.user.is_authenticated else 8